@@ -24,3 +24,9 @@ class CustomUser(AbstractUser):
         ('business', 'Business'),
     )
     user_type = models.CharField(max_length=10, choices=USER_TYPE_CHOICES)
+
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Business and customer profile lists
+            models.Index(fields=['user_type'], name='user_type_idx'),
+        ]
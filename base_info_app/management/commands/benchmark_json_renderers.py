@@ -0,0 +1,117 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core.renderers import FastJSONRenderer, orjson
+from orders_app.api.views import OrderListCreateView
+from orders_app.models import Order
+from profiles_app.api.views import BusinessProfileListView
+from profiles_app.models import Profile
+from reviews_app.api.views import ReviewListCreateAPIView
+from reviews_app.models import Review
+
+
+class Command(BaseCommand):
+    """
+    Measure how long JSONRenderer and FastJSONRenderer take to encode
+    the responses of the unpaginated list endpoints. All seeded rows are
+    rolled back afterwards.
+    """
+    help = 'Compare the JSON renderers on the unpaginated list endpoints.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=2000)
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            self.stdout.write('orjson is not installed, using the fallback.')
+        with transaction.atomic():
+            customer = self.seed(options['rows'])
+            for name, view, user in (
+                ('/api/orders/', OrderListCreateView.as_view(), customer),
+                ('/api/reviews/', ReviewListCreateAPIView.as_view(
+                    {'get': 'list'}
+                ), customer),
+                ('/api/profiles/business/',
+                 BusinessProfileListView.as_view(), customer),
+            ):
+                data = self.get_data(name, view, user)
+                timings = [
+                    self.time_render(renderer, data, options['repeat'])
+                    for renderer in (JSONRenderer(), FastJSONRenderer())
+                ]
+                self.stdout.write(
+                    f'{name} ({len(data)} rows): '
+                    f'JSONRenderer {timings[0]:.2f} ms, '
+                    f'FastJSONRenderer {timings[1]:.2f} ms, '
+                    f'{timings[0] / timings[1]:.1f}x'
+                )
+            transaction.set_rollback(True)
+
+    def get_data(self, path, view, user):
+        host = next(
+            (host for host in settings.ALLOWED_HOSTS
+             if host and host != '*' and not host.startswith('.')),
+            'localhost'
+        )
+        request = APIRequestFactory().get(path, HTTP_HOST=host)
+        force_authenticate(request, user=user)
+        return view(request).data
+
+    # Average milliseconds per render
+    def time_render(self, renderer, data, repeat):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            renderer.render(data)
+        return (time.perf_counter() - start) / repeat * 1000
+
+    # bulk_create skips the signals keeping BusinessOrderStats, which is
+    # fine for rows that are rolled back
+    def seed(self, rows):
+        User = get_user_model()
+        customer = User.objects.create_user(
+            username='benchmark-customer', password=None,
+            user_type='customer'
+        )
+        businesses = User.objects.bulk_create([
+            User(
+                username=f'benchmark-business-{index}',
+                password='!', user_type='business'
+            )
+            for index in range(rows)
+        ])
+        Profile.objects.bulk_create([
+            Profile(
+                user=user, username=user.username,
+                first_name='Max', last_name='Mustermann',
+                location='Berlin', tel='0123456789',
+                description='Benchmark profile', working_hours='9-17',
+                type='business', email=f'{user.username}@example.com'
+            )
+            for user in businesses
+        ])
+        Order.objects.bulk_create([
+            Order(
+                customer_user=customer, business_user=business,
+                title='Logo Design', revisions=3,
+                delivery_time_in_days=5, price=150,
+                features=['Logo Design', 'Visitenkarte'],
+                offer_type='basic'
+            )
+            for business in businesses
+        ])
+        Review.objects.bulk_create([
+            Review(
+                business_user=business, reviewer=customer, rating=5,
+                description='Sehr gute Zusammenarbeit.'
+            )
+            for business in businesses
+        ])
+        return customer
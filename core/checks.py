@@ -0,0 +1,20 @@
+from django.conf import settings
+
+
+# Backends that keep entries in the memory of each worker process
+PROCESS_LOCAL_CACHE_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+def needs_shared_cache(alias):
+    """
+    Check whether the cache alias is process local while several
+    production workers would each see their own copy of it.
+    """
+    return (
+        not settings.DEBUG
+        and settings.WEB_CONCURRENCY > 1
+        and settings.CACHES[alias]['BACKEND'] in PROCESS_LOCAL_CACHE_BACKENDS
+    )
@@ -0,0 +1,227 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+
+from django.conf import settings
+from django.core import exceptions
+from django.db.models import F, Q
+
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination that seeks past the last row of the previous page
+    instead of counting and offsetting. Works with any ordering on concrete
+    columns, using the primary key as tiebreak. Orderings on annotations,
+    like the rank of search results, are refused.
+    """
+    page_size = 6
+    page_size_query_param = 'page_size'
+    cursor_query_param = 'cursor'
+    mode_query_param = 'pagination'
+    invalid_cursor_message = 'Invalid cursor.'
+
+    def __init__(self, max_page_size=None):
+        self.max_page_size = (
+            max_page_size or settings.CURSOR_PAGINATION_MAX_PAGE_SIZE
+        )
+
+    # Check whether the client asked for keyset pagination, with
+    # ?pagination=cursor or by following a cursor link
+    @classmethod
+    def is_requested(cls, request):
+        return (
+            request.query_params.get(cls.mode_query_param) == 'cursor'
+            or cls.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.keys = self.get_keys(queryset)
+        position, reverse = self.decode_cursor(request)
+
+        keys = self.keys
+        if reverse:
+            keys = [(field, not desc) for field, desc in keys]
+        results = self.get_rows(
+            queryset, keys, position, reverse, self.page_size + 1
+        )
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if reverse:
+            results.reverse()
+
+        self.next_position = self.previous_position = None
+        if results:
+            if has_more or reverse:
+                self.next_position = self.get_position(results[-1])
+            if position is not None and (has_more or not reverse):
+                self.previous_position = self.get_position(results[0])
+        return results
+
+    # Read up to limit rows after the position, in the order of the keys
+    def get_rows(self, queryset, keys, position, reverse, limit):
+        queryset = queryset.order_by(*[
+            self.order_expression(field, desc, reverse)
+            for field, desc in keys
+        ])
+        if position is not None:
+            queryset = queryset.filter(
+                self.seek_filter(keys, position, reverse)
+            )
+        return list(queryset[:limit])
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return min(self.page_size, self.max_page_size)
+        if page_size <= 0:
+            return min(self.page_size, self.max_page_size)
+        return min(page_size, self.max_page_size)
+
+    # Resolve the queryset ordering to concrete fields plus an id tiebreak
+    def get_keys(self, queryset):
+        model = queryset.model
+        ordering = queryset.query.order_by or model._meta.ordering
+        keys = []
+        # Model fields of the keys, to check cursor values against
+        self.key_fields = {'pk': model._meta.pk}
+        # Keys that may be NULL need NULL aware ordering and seeking
+        self.nullable_keys = set()
+        for term in ordering:
+            if not isinstance(term, str):
+                continue
+            name = term.lstrip('-')
+            if name in queryset.query.annotations:
+                raise ValidationError({
+                    self.mode_query_param:
+                        f'Cursor pagination cannot follow the {name} order.'
+                })
+            try:
+                field = model._meta.get_field(name)
+            except exceptions.FieldDoesNotExist:
+                continue
+            if not field.concrete or field.is_relation:
+                continue
+            if field.primary_key or name == 'pk':
+                keys.append(('pk', term.startswith('-')))
+                break
+            keys.append((field.attname, term.startswith('-')))
+            self.key_fields[field.attname] = field
+            if field.null:
+                self.nullable_keys.add(field.attname)
+        if not keys or keys[-1][0] != 'pk':
+            keys.append(('pk', False))
+        return keys
+
+    # Order with NULLs after all values, reversed pages flip both. Keys
+    # without NULLs keep a plain order an index can serve.
+    def order_expression(self, field, desc, reverse):
+        if field not in self.nullable_keys:
+            return F(field).desc() if desc else F(field).asc()
+        nulls = {'nulls_first': True} if reverse else {'nulls_last': True}
+        if desc:
+            return F(field).desc(**nulls)
+        return F(field).asc(**nulls)
+
+    # Build the lexicographic "comes after position" condition
+    def seek_filter(self, keys, position, reverse):
+        condition = None
+        equal = Q()
+        for (field, desc), value in zip(keys, position):
+            if value is None:
+                after = Q(**{f'{field}__isnull': False}) if reverse else None
+                same = Q(**{f'{field}__isnull': True})
+            else:
+                lookup = 'lt' if desc else 'gt'
+                after = Q(**{f'{field}__{lookup}': value})
+                if not reverse and field in self.nullable_keys:
+                    after |= Q(**{f'{field}__isnull': True})
+                same = Q(**{field: value})
+            if after is not None:
+                after = equal & after
+                condition = after if condition is None else condition | after
+            equal &= same
+        # Repeat the first key as a plain range an index can seek to
+        field, desc = keys[0]
+        if position[0] is not None and field not in self.nullable_keys:
+            lookup = 'lte' if desc else 'gte'
+            condition &= Q(**{f'{field}__{lookup}': position[0]})
+        return condition
+
+    # Read the key values from model instances or .values() rows
+    def get_position(self, obj):
+        if isinstance(obj, dict):
+            return [
+                obj['id' if field == 'pk' else field]
+                for field, desc in self.keys
+            ]
+        return [getattr(obj, field) for field, desc in self.keys]
+
+    def encode_cursor(self, position, reverse):
+        values = [
+            value.isoformat() if isinstance(value, datetime) else value
+            for value in position
+        ]
+        payload = json.dumps({'p': values, 'r': reverse}).encode()
+        token = urlsafe_b64encode(payload).decode()
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, 'page')
+        return replace_query_param(url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None, False
+        try:
+            payload = json.loads(urlsafe_b64decode(token.encode()))
+            position = payload['p']
+            reverse = bool(payload['r'])
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or len(position) != len(self.keys):
+            raise NotFound(self.invalid_cursor_message)
+        try:
+            position = [
+                self.parse_cursor_value(field, value)
+                for (field, desc), value in zip(self.keys, position)
+            ]
+        except (TypeError, ValueError, exceptions.ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    # Convert a cursor value to the type of its key field, refusing
+    # values of another type before they reach the seek filter
+    def parse_cursor_value(self, field, value):
+        if value is None:
+            if field not in self.nullable_keys:
+                raise ValueError('The key cannot be NULL.')
+            return None
+        if isinstance(value, bool) or not isinstance(
+            value, (str, int, float)
+        ):
+            raise TypeError('Cursor values are strings or numbers.')
+        return self.key_fields[field].to_python(value)
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        return self.encode_cursor(self.next_position, False)
+
+    def get_previous_link(self):
+        if self.previous_position is None:
+            return None
+        return self.encode_cursor(self.previous_position, True)
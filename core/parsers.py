@@ -0,0 +1,41 @@
+import re
+
+from django.conf import settings
+
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.utils import json
+
+from core.renderers import FastJSONRenderer, orjson
+
+
+# orjson turns integers beyond 64 bit into floats
+LONG_NUMBER = re.compile(rb'\d{19}')
+
+
+class FastJSONParser(JSONParser):
+    """
+    JSON parser that decodes with orjson when it is installed and the
+    body is UTF-8, falling back to the stdlib based JSONParser otherwise.
+    """
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or encoding.lower().replace('-', '') != 'utf8':
+            return super().parse(stream, media_type, parser_context)
+        body = stream.read()
+        if not LONG_NUMBER.search(body):
+            try:
+                return orjson.loads(body)
+            except orjson.JSONDecodeError:
+                pass
+        # Retry with the stdlib for its error messages and big integers
+        try:
+            parse_constant = json.strict_constant if self.strict else None
+            return json.loads(
+                body.decode(encoding), parse_constant=parse_constant
+            )
+        except ValueError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
@@ -0,0 +1,86 @@
+from itertools import chain, compress
+
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+CONTAINERS = (dict, list, tuple)
+
+
+# Items of a dict, list or tuple, where floats may hide
+def get_items(value):
+    return value.values() if isinstance(value, dict) else value
+
+
+def contains_float(data):
+    """
+    Check whether data holds a float. Nested values are checked one
+    level at a time, with the passes over each level running in C.
+    """
+    level = [data]
+    while level:
+        kinds = set(map(type, level))
+        if any(issubclass(kind, float) for kind in kinds):
+            return True
+        containers = {kind for kind in kinds if issubclass(kind, CONTAINERS)}
+        if not containers:
+            return False
+        if containers != kinds:
+            level = compress(
+                level, map(containers.__contains__, map(type, level))
+            )
+        level = list(chain.from_iterable(map(get_items, level)))
+    return False
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSON renderer that encodes with orjson when it is installed and
+    falls back to the stdlib based JSONRenderer otherwise.
+    Datetimes and unknown types go through DRF's JSONEncoder, so the
+    output matches JSONRenderer. orjson formats floats differently
+    (1e16 for 1e+16, null for NaN where JSONRenderer raises), so data
+    holding floats, indented output and data orjson rejects (e.g.
+    integers beyond 64 bit or keys that are no strings) use the
+    fallback.
+    """
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None or data is None or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {})
+            is not None
+            or contains_float(data)
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(
+                data,
+                default=self.get_default(),
+                option=(
+                    orjson.OPT_PASSTHROUGH_DATETIME
+                    | orjson.OPT_PASSTHROUGH_DATACLASS
+                )
+            )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Escape like JSONRenderer to stay a strict javascript subset
+        return ret.replace(
+            '\u2028'.encode(), b'\\u2028'
+        ).replace('\u2029'.encode(), b'\\u2029')
+
+    # JSONEncoder.default, refusing floats (e.g. from Decimals) so the
+    # render falls back to JSONRenderer
+    def get_default(self):
+        encode = self.encoder_class().default
+
+        def default(value):
+            value = encode(value)
+            if contains_float(value):
+                raise TypeError('Floats are rendered by JSONRenderer.')
+            return value
+        return default
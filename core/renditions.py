@@ -0,0 +1,211 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import connections, transaction
+from django.dispatch import Signal
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from core.uploads import get_image_size_error
+
+
+logger = logging.getLogger(__name__)
+
+RENDITIONS_DIR = 'renditions'
+# Formats renditions are written in next to WebP, by Pillow format name
+SOURCE_FORMATS = ('jpeg', 'png', 'gif')
+# Sent with the model as sender and the row pk once its stored
+# renditions changed
+renditions_updated = Signal()
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_rendition_name(name, width, image_format):
+    """
+    Return the storage name of one rendition of a stored file. Names are
+    derived from the file name, so they can be found without a lookup.
+    """
+    return f'{RENDITIONS_DIR}/{name}/{width}.{image_format}'
+
+
+def get_srcset(name, renditions, build_url):
+    """
+    Return {mime type: 'url 160w, url 480w'} for the renditions of a
+    file, or an empty map while they do not match the current file.
+    """
+    if not name or not renditions or renditions.get('source') != name:
+        return {}
+    return {
+        Image.MIME[image_format.upper()]: ', '.join(
+            f'{build_url(get_rendition_name(name, width, image_format))} '
+            f'{width}w'
+            for width in renditions['widths']
+        )
+        for image_format in renditions['formats']
+    }
+
+
+def render_renditions(storage, name):
+    """
+    Write the renditions of a stored image and return the map kept on
+    the row. Files that are no image get a map without renditions, so
+    they are not tried again.
+    """
+    renditions = {'source': name, 'widths': [], 'formats': []}
+    try:
+        with storage.open(name, 'rb') as file:
+            image = Image.open(file)
+            source_format = (image.format or '').lower()
+            # Files stored before the upload limits are not decoded
+            if get_image_size_error(image.width, image.height):
+                logger.warning('Image %s is too large to render', name)
+                return renditions
+            # Let JPEG decode at a reduced scale, still at least as
+            # large as the largest rendition
+            largest = max(settings.IMAGE_RENDITION_WIDTHS)
+            image.draft(None, (largest, largest))
+            image = ImageOps.exif_transpose(image)
+    except (UnidentifiedImageError, OSError, Image.DecompressionBombError):
+        logger.warning('Cannot render renditions of %s', name)
+        return renditions
+    # Images are never scaled up
+    widths = sorted(
+        width for width in settings.IMAGE_RENDITION_WIDTHS
+        if width <= image.width
+    )
+    if not widths:
+        return renditions
+    if image.mode not in ('RGB', 'RGBA', 'L', 'LA'):
+        image = image.convert('RGBA')
+    formats = ['webp']
+    if source_format in SOURCE_FORMATS:
+        formats.append(source_format)
+    # Scale down step by step, each rendition from the next larger one
+    for width in reversed(widths):
+        height = max(1, round(image.height * width / image.width))
+        image = image.resize((width, height), Image.Resampling.LANCZOS)
+        for image_format in formats:
+            output = image
+            if image_format == 'jpeg' and image.mode not in ('RGB', 'L'):
+                output = image.convert('RGB')
+            buffer = BytesIO()
+            output.save(
+                buffer, image_format.upper(),
+                quality=settings.IMAGE_RENDITION_QUALITY
+            )
+            rendition_name = get_rendition_name(name, width, image_format)
+            if storage.exists(rendition_name):
+                storage.delete(rendition_name)
+            storage.save(rendition_name, ContentFile(buffer.getvalue()))
+    renditions['widths'] = widths
+    renditions['formats'] = formats
+    return renditions
+
+
+def delete_renditions(storage, name):
+    """
+    Delete all renditions of a stored file.
+    """
+    directory = f'{RENDITIONS_DIR}/{name}'
+    try:
+        _, files = storage.listdir(directory)
+    except (FileNotFoundError, NotImplementedError):
+        return
+    for file_name in files:
+        storage.delete(f'{directory}/{file_name}')
+
+
+def update_renditions(model, pk, file_field, renditions_field, force=False):
+    """
+    Bring the renditions of a row in line with its current file: delete
+    those of a replaced file and render the current one. The map is only
+    stored while the row still holds the rendered file. Returns whether
+    the row was updated.
+    """
+    row = model.objects.filter(pk=pk).values(
+        file_field, renditions_field
+    ).first()
+    if row is None:
+        return False
+    name = row[file_field] or ''
+    renditions = row[renditions_field] or {}
+    source = renditions.get('source', '')
+    if source == name and not force:
+        return False
+    storage = model._meta.get_field(file_field).storage
+    if source:
+        delete_renditions(storage, source)
+    renditions = render_renditions(storage, name) if name else {}
+    updated = model.objects.filter(pk=pk, **{file_field: name}).update(
+        **{renditions_field: renditions}
+    )
+    if updated:
+        renditions_updated.send(sender=model, pk=pk)
+    return bool(updated)
+
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.IMAGE_RENDITION_WORKERS,
+                thread_name_prefix='renditions'
+            )
+        return _executor
+
+
+# Run a task in a worker thread, closing its database connections
+def run_task(func, *args):
+    try:
+        func(*args)
+    except Exception:
+        logger.exception('Rendition task %s failed', func.__name__)
+    finally:
+        connections.close_all()
+
+
+def submit(func, *args):
+    """
+    Run a task off the request thread, or inline when
+    IMAGE_RENDITION_WORKERS is 0.
+    """
+    if not settings.IMAGE_RENDITION_WORKERS:
+        func(*args)
+        return
+    get_executor().submit(run_task, func, *args)
+
+
+def schedule_renditions(instance, file_field, renditions_field):
+    """
+    Render the renditions of a saved row once its transaction commits,
+    unless they already match its file.
+    """
+    name = getattr(instance, file_field).name or ''
+    renditions = getattr(instance, renditions_field) or {}
+    if renditions.get('source', '') == name:
+        return
+    model, pk = type(instance), instance.pk
+    transaction.on_commit(lambda: submit(
+        update_renditions, model, pk, file_field, renditions_field
+    ))
+
+
+def schedule_renditions_cleanup(instance, file_field, renditions_field):
+    """
+    Delete the renditions of a deleted row once its transaction commits.
+    """
+    storage = instance._meta.get_field(file_field).storage
+    names = {
+        getattr(instance, file_field).name,
+        (getattr(instance, renditions_field) or {}).get('source'),
+    }
+    for name in filter(None, names):
+        transaction.on_commit(
+            lambda name=name: submit(delete_renditions, storage, name)
+        )
@@ -0,0 +1,145 @@
+from rest_framework.exceptions import ValidationError
+from rest_framework.fields import Field, FileField, ImageField
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.serializers import ListSerializer
+
+from core.renditions import get_srcset
+from core.uploads import check_image_header, run_decode
+
+
+FIELDS_PARAM = 'fields'
+OMIT_PARAM = 'omit'
+
+
+def split_field_names(value):
+    return [name.strip() for name in value.split(',') if name.strip()]
+
+
+def get_sparse_fields(request, available):
+    """
+    Return the names out of available that a read request selects with
+    ?fields= and ?omit=, in their original order, or None when the
+    request does not narrow the fields. Unknown names are rejected.
+    """
+    if request is None or request.method not in SAFE_METHODS:
+        return None
+    fields = split_field_names(request.GET.get(FIELDS_PARAM, ''))
+    omit = split_field_names(request.GET.get(OMIT_PARAM, ''))
+    if not fields and not omit:
+        return None
+    for param, names in ((FIELDS_PARAM, fields), (OMIT_PARAM, omit)):
+        unknown = [name for name in names if name not in available]
+        if unknown:
+            raise ValidationError({
+                param: f"Unknown field(s): {', '.join(unknown)}."
+            })
+    return [
+        name for name in available
+        if (not fields or name in fields) and name not in omit
+    ]
+
+
+def get_concrete_fields(model, names):
+    """
+    Return the names that are concrete fields of the model, to be passed
+    to only() when narrowing a queryset to the selected fields.
+    """
+    concrete = {field.name for field in model._meta.concrete_fields}
+    return [name for name in names if name in concrete]
+
+
+def get_ordering_fields(queryset):
+    """
+    Return the field names a queryset is ordered by, so narrowed
+    querysets keep the columns pagination reads from the rows.
+    """
+    ordering = queryset.query.order_by or queryset.model._meta.ordering
+    return [item.lstrip('-') for item in ordering if isinstance(item, str)]
+
+
+class SparseFieldsetMixin:
+    """
+    Serializer mixin that lets clients pick fields with ?fields=a,b or
+    drop them with ?omit=c. Unselected fields are removed before
+    serialization, so their values are never computed. Only applies to
+    the top level serializer of a read request.
+    """
+    @classmethod
+    def get_sparse_field_names(cls):
+        return list(cls.Meta.fields)
+
+    def is_response_root(self):
+        parent = self.parent
+        if isinstance(parent, ListSerializer):
+            parent = parent.parent
+        return parent is None
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if not self.is_response_root():
+            return fields
+        selected = get_sparse_fields(self.context.get('request'), list(fields))
+        if selected is None:
+            return fields
+        return {name: fields[name] for name in selected}
+
+
+def get_media_url_builder(context, storage):
+    """
+    Return a function building absolute URLs of stored files. The host
+    is resolved once per request and kept in the serializer context.
+    """
+    def build_url(name):
+        url = storage.url(name)
+        if not url.startswith('/'):
+            return url
+        prefix = context.get('media_url_prefix')
+        if prefix is None:
+            request = context.get('request')
+            prefix = request.build_absolute_uri('/')[:-1] if request else ''
+            context['media_url_prefix'] = prefix
+        return prefix + url
+    return build_url
+
+
+class SrcsetField(Field):
+    """
+    Read only field with the srcset map of the renditions of a file,
+    empty until they are rendered.
+    """
+    def __init__(self, file_field, renditions_field, **kwargs):
+        kwargs['source'] = '*'
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+        self.file_field = file_field
+        self.renditions_field = renditions_field
+
+    def to_representation(self, instance):
+        file = getattr(instance, self.file_field)
+        return get_srcset(
+            file.name, getattr(instance, self.renditions_field),
+            get_media_url_builder(self.context, file.storage)
+        )
+
+
+class CheckedFileField(FileField):
+    """
+    File field that rejects images above the size limits from their
+    header, without decoding them. Other files pass unchecked.
+    """
+    def to_internal_value(self, data):
+        file = super().to_internal_value(data)
+        check_image_header(file)
+        return file
+
+
+class CheckedImageField(ImageField):
+    """
+    Image field that checks the size limits from the header first and
+    leaves Pillow's full validation to the bounded decode pool.
+    """
+    def to_internal_value(self, data):
+        file = FileField.to_internal_value(self, data)
+        if not check_image_header(file):
+            self.fail('invalid_image')
+        return run_decode(super().to_internal_value, data)
@@ -164,7 +164,16 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'core.authentication.ProfileTokenAuthentication',
+    ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'core.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
     ],
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
@@ -173,6 +182,87 @@ REST_FRAMEWORK = {
     'PAGE_SIZE': 6,
 }
 
+# Dotted path of the offer search backend, chosen by database if empty
+OFFER_SEARCH_BACKEND = os.getenv('OFFER_SEARCH_BACKEND', '')
+
+# Seconds between checks of the autocomplete index for changed offers
+OFFER_SUGGEST_REFRESH_SECONDS = int(
+    os.getenv('OFFER_SUGGEST_REFRESH_SECONDS', '30')
+)
+
+# Largest page size clients may request in cursor pagination mode
+CURSOR_PAGINATION_MAX_PAGE_SIZE = int(
+    os.getenv('CURSOR_PAGINATION_MAX_PAGE_SIZE', '100')
+)
+
+
+# Gunicorn worker processes, gunicorn reads the same variable
+WEB_CONCURRENCY = int(os.getenv('WEB_CONCURRENCY', '1'))
+
+# Cache, local memory by default. Use a shared backend (file based,
+# Redis or Memcached) when running several worker processes, the
+# system checks refuse a local one when WEB_CONCURRENCY is above 1.
+
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND',
+            'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.getenv('CACHE_LOCATION', ''),
+    }
+}
+
+# Cache alias and timeouts in seconds of the offer list and facets
+# responses, a timeout of 0 disables the response cache
+OFFER_CACHE_ALIAS = 'default'
+OFFER_LIST_CACHE_TIMEOUT = int(os.getenv('OFFER_LIST_CACHE_TIMEOUT', '300'))
+OFFER_FACETS_CACHE_TIMEOUT = int(
+    os.getenv('OFFER_FACETS_CACHE_TIMEOUT', '300')
+)
+
+# Uploads stream to temporary files and are refused above
+# MAX_UPLOAD_SIZE bytes while they arrive
+FILE_UPLOAD_HANDLERS = ['core.uploads.LimitedUploadHandler']
+MAX_UPLOAD_SIZE = int(os.getenv('MAX_UPLOAD_SIZE', str(10 * 1024 * 1024)))
+# Images above these sizes are refused from their header, before decoding
+MAX_IMAGE_DIMENSION = int(os.getenv('MAX_IMAGE_DIMENSION', '8000'))
+MAX_IMAGE_PIXELS = int(os.getenv('MAX_IMAGE_PIXELS', '40000000'))
+# Threads validating uploaded images, uploads wait at most
+# IMAGE_DECODE_TIMEOUT seconds and are refused while all are busy
+IMAGE_DECODE_WORKERS = int(os.getenv('IMAGE_DECODE_WORKERS', '2'))
+IMAGE_DECODE_TIMEOUT = float(os.getenv('IMAGE_DECODE_TIMEOUT', '5'))
+
+# Widths in pixels of the renditions rendered for uploaded images
+IMAGE_RENDITION_WIDTHS = tuple(
+    int(width) for width in
+    os.getenv('IMAGE_RENDITION_WIDTHS', '160,480,1024').split(',')
+)
+# Encoder quality of the renditions
+IMAGE_RENDITION_QUALITY = int(os.getenv('IMAGE_RENDITION_QUALITY', '80'))
+# Background threads rendering renditions, 0 renders them inline
+IMAGE_RENDITION_WORKERS = int(os.getenv('IMAGE_RENDITION_WORKERS', '2'))
+
+# Cache alias and seconds order creations are remembered under their
+# Idempotency-Key header, retries within it return the original order.
+# The alias has to be shared by all worker processes.
+ORDER_IDEMPOTENCY_CACHE_ALIAS = 'default'
+ORDER_IDEMPOTENCY_TTL = int(os.getenv('ORDER_IDEMPOTENCY_TTL', '86400'))
+# Seconds a key stays locked by a running request, a few request
+# timeouts, so a key of a killed worker is free again soon after
+ORDER_IDEMPOTENCY_LOCK_TTL = int(
+    os.getenv('ORDER_IDEMPOTENCY_LOCK_TTL', '90')
+)
+
+# Maximum number of ids per batch lookup (?ids=1,2,3)
+BATCH_LOOKUP_MAX_IDS = int(os.getenv('BATCH_LOOKUP_MAX_IDS', '100'))
+
+# Emit absolute offer detail URLs, clients may ask for relative ones
+# with ?urls=relative (or absolute ones with ?urls=absolute)
+OFFER_DETAIL_ABSOLUTE_URLS = (
+    os.getenv('OFFER_DETAIL_ABSOLUTE_URLS', 'True') == 'True'
+)
+
 
 # Custom user model
 
@@ -0,0 +1,136 @@
+import uuid
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from io import BytesIO
+from unittest import mock
+from zoneinfo import ZoneInfo
+
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy
+
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from core import parsers, renderers
+from core.parsers import FastJSONParser
+from core.renderers import FastJSONRenderer
+
+
+class FastJSONRendererTest(SimpleTestCase):
+    """
+    Test cases comparing FastJSONRenderer with JSONRenderer.
+    """
+    data = {
+        'id': 1,
+        'price': Decimal('12.50'),
+        'created_at': datetime(
+            2024, 1, 1, 10, 0, 0, 123456, tzinfo=timezone.utc
+        ),
+        'updated_at': datetime(
+            2024, 7, 1, 10, 0, tzinfo=ZoneInfo('Europe/Berlin')
+        ),
+        'naive': datetime(2024, 1, 1, 10, 0),
+        'day': date(2024, 1, 1),
+        'time': time(10, 30),
+        'duration': timedelta(hours=1),
+        'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+        'features': ['Logo Design', {'nested': [1, None, True]}],
+        'text': 'Grüße     "quoted" </script>',
+        'lazy': gettext_lazy('Invalid status.'),
+        'tuple': (1, 2),
+    }
+
+    def assertSameOutput(self, data, media_type=None):
+        self.assertEqual(
+            FastJSONRenderer().render(data, media_type),
+            JSONRenderer().render(data, media_type)
+        )
+
+    # Test cases for identical output, encoded by orjson
+    def test_matches_json_renderer(self):
+        with mock.patch.object(
+            renderers.orjson, 'dumps', wraps=renderers.orjson.dumps
+        ) as dumps:
+            self.assertSameOutput(self.data)
+            self.assertSameOutput([self.data, self.data])
+        self.assertEqual(dumps.call_count, 2)
+        self.assertSameOutput(None)
+        self.assertSameOutput({'big': 2 ** 70})
+        self.assertSameOutput({'int_keys': {1: 'one', 2: 'two'}})
+
+    # Test cases for floats, rendered by JSONRenderer wherever they are
+    def test_floats(self):
+        for value in (
+            1e16, -1.5e22, 1e-05, 1.5e-07, 0.0001, Decimal('1E+20'),
+            [1, {'nested': (2.5,)}], {'value': {'score': 0.5}},
+        ):
+            with self.subTest(value=value):
+                self.assertSameOutput([value])
+        self.assertEqual(FastJSONRenderer().render([1e16]), b'[1e+16]')
+
+    # Test cases for NaN and Infinity raising like JSONRenderer
+    def test_non_finite_floats(self):
+        for value in (float('nan'), float('inf'), Decimal('-Infinity')):
+            with self.subTest(value=value):
+                with self.assertRaises(ValueError):
+                    JSONRenderer().render({'value': value})
+                with self.assertRaises(ValueError):
+                    FastJSONRenderer().render({'value': value})
+
+    # Test cases for indented output
+    def test_indent(self):
+        self.assertSameOutput(self.data, 'application/json; indent=4')
+
+    # Test cases for unsupported values raising like before
+    def test_unsupported_values(self):
+        with self.assertRaises(TypeError):
+            FastJSONRenderer().render({'value': object()})
+
+    # Test cases for the fallback without orjson
+    def test_without_orjson(self):
+        with mock.patch.object(renderers, 'orjson', None):
+            self.assertSameOutput(self.data)
+
+
+class FastJSONParserTest(SimpleTestCase):
+    """
+    Test cases comparing FastJSONParser with JSONParser.
+    """
+    def parse_both(self, body):
+        return (
+            FastJSONParser().parse(BytesIO(body)),
+            JSONParser().parse(BytesIO(body)),
+        )
+
+    # Test cases for identical results
+    def test_matches_json_parser(self):
+        for body in (
+            b'{"offer_detail_id": 1, "features": ["a", {"b": 2.5}]}',
+            '{"title": "Grüße"}'.encode(),
+            b'[1, null, true]',
+            b'{"big": 123456789012345678901234567890}',
+        ):
+            with self.subTest(body=body):
+                fast, full = self.parse_both(body)
+                self.assertEqual(fast, full)
+
+    # Test cases for invalid bodies
+    def test_invalid(self):
+        for body in (b'{"a":', b'{"a": NaN}'):
+            with self.subTest(body=body):
+                with self.assertRaises(ParseError):
+                    FastJSONParser().parse(BytesIO(body))
+
+    # Test cases for other encodings and the fallback without orjson
+    def test_fallbacks(self):
+        body = '{"title": "Grüße"}'.encode('utf-16')
+        self.assertEqual(
+            FastJSONParser().parse(
+                BytesIO(body), parser_context={'encoding': 'utf-16'}
+            ),
+            {'title': 'Grüße'}
+        )
+        with mock.patch.object(parsers, 'orjson', None):
+            fast, full = self.parse_both(b'{"a": 1}')
+            self.assertEqual(fast, full)
@@ -0,0 +1,180 @@
+import re
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from rest_framework.test import APITestCase
+
+from offers_app.models import Offer, OfferDetail
+from orders_app.models import Order
+from profiles_app.models import Profile
+from reviews_app.models import Review
+
+
+class QueryPlanTest(APITestCase):
+    """
+    Test cases running EXPLAIN on the queries of the hot endpoints and
+    failing on full table scans.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.businesses = []
+        cls.customers = []
+        for index in range(5):
+            for user_type, users in (
+                ('business', cls.businesses), ('customer', cls.customers)
+            ):
+                user = User.objects.create_user(
+                    username=f'{user_type}{index}',
+                    password='testpass',
+                    user_type=user_type
+                )
+                Profile.objects.create(
+                    user=user,
+                    username=user.username,
+                    email=f'{user.username}@example.com',
+                    type=user_type
+                )
+                users.append(user)
+        for business in cls.businesses:
+            offer = Offer.objects.create(
+                user=business, title='Logo Design', description='Logo'
+            )
+            for price, offer_type in (
+                (100, 'basic'), (200, 'standard'), (300, 'premium')
+            ):
+                OfferDetail.objects.create(
+                    offer=offer, title=offer_type, revisions=1,
+                    delivery_time_in_days=price // 100, price=price,
+                    features=[], offer_type=offer_type
+                )
+            for customer in cls.customers:
+                for status in ('in_progress', 'completed', 'cancelled'):
+                    Order.objects.create(
+                        customer_user=customer, business_user=business,
+                        title='Logo Design', revisions=1,
+                        delivery_time_in_days=3, price=100, features=[],
+                        offer_type='basic', status=status
+                    )
+                Review.objects.create(
+                    business_user=business, reviewer=customer,
+                    rating=5, description='Great'
+                )
+        cls.business = cls.businesses[0]
+        cls.customer = cls.customers[0]
+        cls.offer = Offer.objects.filter(user=cls.business).first()
+        if connection.vendor == 'sqlite':
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+
+    def explain(self, sql):
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                cursor.execute('SET LOCAL enable_seqscan = off')
+                cursor.execute(f'EXPLAIN {sql}')
+                plan = [row[0] for row in cursor.fetchall()]
+                cursor.execute('SET LOCAL enable_seqscan = on')
+                return [
+                    match.group(1) for line in plan
+                    for match in [re.search(r'Seq Scan on (\w+)', line)]
+                    if match
+                ]
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            return [
+                match.group(1) for row in cursor.fetchall()
+                for match in [re.match(r'SCAN (\w+)', row[-1])]
+                if match
+            ]
+
+    # Return the tables read in full by the queries of a request
+    def full_scans(self, user, path, params=None):
+        self.client.force_authenticate(user=user)
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(path, params)
+        self.assertEqual(response.status_code, 200, path)
+        scans = set()
+        for query in context.captured_queries:
+            if query['sql'].lstrip().upper().startswith('SELECT'):
+                scans.update(self.explain(query['sql']))
+        return scans
+
+    def assertNoFullScans(self, user, path, params=None):
+        scans = self.full_scans(user, path, params)
+        self.assertFalse(scans, f'{path} scans {sorted(scans)}')
+
+    # Test cases for the order endpoints
+    def test_order_endpoints(self):
+        self.assertNoFullScans(self.customer, '/api/orders/')
+        self.assertNoFullScans(self.business, '/api/orders/')
+        self.assertNoFullScans(
+            self.business, '/api/orders/',
+            {'role': 'business', 'status': 'completed'}
+        )
+        self.assertNoFullScans(
+            self.customer, f'/api/order-count/{self.business.pk}/'
+        )
+        self.assertNoFullScans(
+            self.customer, f'/api/completed-order-count/{self.business.pk}/'
+        )
+
+    # Test cases for the reviews of a business user
+    def test_review_endpoints(self):
+        self.assertNoFullScans(
+            self.customer, '/api/reviews/',
+            {'business_user': self.business.pk}
+        )
+
+    # Test cases for the offer endpoints and the summary aggregate
+    def test_offer_endpoints(self):
+        self.assertNoFullScans(
+            self.customer, '/api/offers/', {'creator_id': self.business.pk}
+        )
+        self.assertNoFullScans(self.customer, f'/api/offers/{self.offer.pk}/')
+        detail = self.offer.details.first()
+        self.assertNoFullScans(self.customer, f'/api/offerdetails/{detail.pk}/')
+        with CaptureQueriesContext(connection) as context:
+            self.offer.refresh_summary()
+        for query in context.captured_queries:
+            if query['sql'].startswith('SELECT'):
+                self.assertFalse(self.explain(query['sql']))
+
+    # Test cases for the profile endpoints
+    def test_profile_endpoints(self):
+        self.assertNoFullScans(
+            self.customer, f'/api/profile/{self.business.pk}/'
+        )
+        self.assertNoFullScans(self.customer, '/api/profiles/business/')
+        self.assertNoFullScans(self.customer, '/api/profiles/customer/')
+
+    # Test cases for the platform counts, which only aggregate whole
+    # tables where no filter applies
+    def test_base_info(self):
+        scans = self.full_scans(self.customer, '/api/base-info/')
+        self.assertFalse(scans - {
+            Review._meta.db_table, Offer._meta.db_table
+        })
+
+    # Test cases for indexes covered by a longer index with the same
+    # leading columns
+    def test_no_redundant_indexes(self):
+        for model in (Order, Review, Offer, OfferDetail, Profile):
+            with connection.cursor() as cursor:
+                constraints = connection.introspection.get_constraints(
+                    cursor, model._meta.db_table
+                )
+            indexes = [
+                (name, constraint['columns'])
+                for name, constraint in constraints.items()
+                if constraint['index'] and constraint['columns']
+            ]
+            for name, columns in indexes:
+                if constraints[name]['unique']:
+                    continue
+                for other, other_columns in indexes:
+                    if other != name:
+                        self.assertNotEqual(
+                            other_columns[:len(columns)], columns,
+                            f'{name} is covered by {other}'
+                        )
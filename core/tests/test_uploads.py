@@ -0,0 +1,145 @@
+import os
+import shutil
+import tempfile
+import threading
+from io import BytesIO
+from unittest import mock
+
+from django import forms
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+
+from PIL import Image, ImageFile
+from rest_framework.test import APITestCase
+
+from core import uploads
+from offers_app.models import Offer
+from profiles_app.models import Profile
+
+
+def make_image(name, size=(40, 30)):
+    buffer = BytesIO()
+    Image.new('RGB', size, 'green').save(buffer, 'PNG')
+    return SimpleUploadedFile(name, buffer.getvalue(), 'image/png')
+
+
+@override_settings(IMAGE_RENDITION_WORKERS=0)
+class UploadLimitsTest(APITestCase):
+    """
+    Test cases for the upload size cap, the header checks and the
+    bounded decode pool.
+    """
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.addCleanup(shutil.rmtree, self.media_root)
+        self.user = get_user_model().objects.create_user(
+            username='business',
+            password='testpass',
+            user_type='business'
+        )
+        self.profile = Profile.objects.create(
+            user=self.user, username='business',
+            email='business@example.com', type='business'
+        )
+        self.offer = Offer.objects.create(
+            user=self.user, title='Logo', description='Text'
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def patch_offer(self, file):
+        return self.client.patch(
+            f'/api/offers/{self.offer.pk}/', {'image': file},
+            format='multipart'
+        )
+
+    # Test cases for a valid image validated in the decode pool
+    def test_valid_image(self):
+        threads = []
+        to_python = forms.ImageField.to_python
+
+        def record_to_python(field, data):
+            threads.append(threading.current_thread().name)
+            return to_python(field, data)
+        with mock.patch.object(
+            forms.ImageField, 'to_python', record_to_python
+        ):
+            response = self.patch_offer(make_image('logo.png'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(threads), 1)
+        self.assertTrue(threads[0].startswith('image-decode'))
+
+    # Test cases for uploads above the size cap
+    @override_settings(MAX_UPLOAD_SIZE=100, DATA_UPLOAD_MAX_MEMORY_SIZE=10)
+    def test_upload_too_large(self):
+        response = self.patch_offer(make_image('logo.png'))
+        self.assertEqual(response.status_code, 413)
+        self.assertEqual(
+            response.json(), {'detail': 'The uploaded file is too large.'}
+        )
+
+    # Test cases for the cap while the file arrives without a length
+    @override_settings(MAX_UPLOAD_SIZE=100)
+    def test_handler_stops_streaming(self):
+        handler = uploads.LimitedUploadHandler()
+        handler.new_file('image', 'logo.png', 'image/png', None)
+        handler.receive_data_chunk(b'x' * 60, 0)
+        path = handler.file.temporary_file_path()
+        with self.assertRaises(uploads.UploadTooLarge):
+            handler.receive_data_chunk(b'x' * 60, 60)
+        self.assertFalse(os.path.exists(path))
+
+    # Test cases for images refused from their header, never decoded
+    @override_settings(MAX_IMAGE_DIMENSION=100, MAX_IMAGE_PIXELS=2000)
+    def test_header_limits(self):
+        cases = (
+            ((200, 10), 'Images may be at most 100 pixels wide and high.'),
+            ((50, 50), 'Images may have at most 2000 pixels.'),
+        )
+        for size, message in cases:
+            image = make_image('big.png', size)
+            with mock.patch.object(forms.ImageField, 'to_python') as decode, \
+                    mock.patch.object(ImageFile.ImageFile, 'load') as load:
+                response = self.patch_offer(image)
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.json(), {'image': [message]})
+            decode.assert_not_called()
+            load.assert_not_called()
+
+    # Test cases for non images on offers and profiles
+    def test_non_images(self):
+        response = self.patch_offer(SimpleUploadedFile('a.png', b'text'))
+        self.assertEqual(response.status_code, 400)
+        response = self.client.patch(
+            f'/api/profile/{self.profile.pk}/',
+            {'file': SimpleUploadedFile('cv.txt', b'text')},
+            format='multipart'
+        )
+        self.assertEqual(response.status_code, 200)
+
+    # Test cases for profile pictures above the header limits
+    @override_settings(MAX_IMAGE_DIMENSION=100)
+    def test_profile_header_limits(self):
+        response = self.client.patch(
+            f'/api/profile/{self.profile.pk}/',
+            {'file': make_image('avatar.png', (300, 300))},
+            format='multipart'
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('file', response.json())
+
+    # Test cases for refusing uploads while the decode pool is busy
+    def test_decode_pool_busy(self):
+        _, slots = uploads.get_decode_pool()
+        acquired = 0
+        while slots.acquire(blocking=False):
+            acquired += 1
+        try:
+            response = self.patch_offer(make_image('logo.png'))
+        finally:
+            for _ in range(acquired):
+                slots.release()
+        self.assertEqual(response.status_code, 503)
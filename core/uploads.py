@@ -0,0 +1,121 @@
+import threading
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from django.conf import settings
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from PIL import Image, UnidentifiedImageError
+
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+
+
+_decode_executor = None
+_decode_slots = None
+_decode_lock = threading.Lock()
+
+
+class UploadTooLarge(APIException):
+    status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    default_detail = 'The uploaded file is too large.'
+    default_code = 'upload_too_large'
+
+
+class DecodeBusy(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'Too many images are being processed, try again later.'
+    default_code = 'decode_busy'
+
+
+class LimitedUploadHandler(TemporaryFileUploadHandler):
+    """
+    Stream uploaded files to temporary files and reject uploads above
+    MAX_UPLOAD_SIZE, from the Content-Length up front or while they
+    arrive, so files are never held in memory as a whole.
+    """
+    def handle_raw_input(
+        self, input_data, META, content_length, boundary, encoding=None
+    ):
+        # Leave room for the form fields sent next to the file
+        limit = settings.MAX_UPLOAD_SIZE + settings.DATA_UPLOAD_MAX_MEMORY_SIZE
+        if content_length and content_length > limit:
+            raise UploadTooLarge()
+
+    def receive_data_chunk(self, raw_data, start):
+        if start + len(raw_data) > settings.MAX_UPLOAD_SIZE:
+            self.upload_interrupted()
+            raise UploadTooLarge()
+        return super().receive_data_chunk(raw_data, start)
+
+
+def get_image_size_error(width, height):
+    """
+    Return why an image of this size is refused, or None when it is
+    within MAX_IMAGE_DIMENSION and MAX_IMAGE_PIXELS.
+    """
+    if max(width, height) > settings.MAX_IMAGE_DIMENSION:
+        return (
+            f'Images may be at most {settings.MAX_IMAGE_DIMENSION} pixels '
+            'wide and high.'
+        )
+    if width * height > settings.MAX_IMAGE_PIXELS:
+        return f'Images may have at most {settings.MAX_IMAGE_PIXELS} pixels.'
+    return None
+
+
+def check_image_header(file):
+    """
+    Read the size of an uploaded image from its header, without decoding
+    it, and reject it when it is too large. Returns whether the file is
+    an image Pillow can open.
+    """
+    file.seek(0)
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', Image.DecompressionBombWarning)
+            with Image.open(file) as image:
+                width, height = image.size
+    except UnidentifiedImageError:
+        return False
+    except (Image.DecompressionBombWarning, Image.DecompressionBombError):
+        raise ValidationError(
+            f'Images may have at most {settings.MAX_IMAGE_PIXELS} pixels.'
+        )
+    finally:
+        file.seek(0)
+    error = get_image_size_error(width, height)
+    if error:
+        raise ValidationError(error)
+    return True
+
+
+def get_decode_pool():
+    global _decode_executor, _decode_slots
+    with _decode_lock:
+        if _decode_executor is None:
+            _decode_executor = ThreadPoolExecutor(
+                max_workers=settings.IMAGE_DECODE_WORKERS,
+                thread_name_prefix='image-decode'
+            )
+            _decode_slots = threading.BoundedSemaphore(
+                settings.IMAGE_DECODE_WORKERS
+            )
+        return _decode_executor, _decode_slots
+
+
+def run_decode(func, *args):
+    """
+    Run image decoding in the bounded decode pool. Requests are refused
+    while all workers are busy and wait at most IMAGE_DECODE_TIMEOUT
+    seconds for the result.
+    """
+    executor, slots = get_decode_pool()
+    if not slots.acquire(blocking=False):
+        raise DecodeBusy()
+    future = executor.submit(func, *args)
+    future.add_done_callback(lambda future: slots.release())
+    try:
+        return future.result(timeout=settings.IMAGE_DECODE_TIMEOUT)
+    except FutureTimeoutError:
+        raise ValidationError('The image took too long to process.')
@@ -0,0 +1,17 @@
+from rest_framework import filters
+
+from offers_app.search import get_search_backend, split_search_terms
+
+
+class OfferSearchFilter(filters.SearchFilter):
+    """
+    Search filter that hands the ?search= terms to the configured
+    full-text search backend instead of LIKE queries.
+    """
+    def filter_queryset(self, request, queryset, view):
+        terms = split_search_terms(
+            request.query_params.get(self.search_param, '')
+        )
+        if not terms:
+            return queryset
+        return get_search_backend().search(queryset, terms)
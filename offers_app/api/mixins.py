@@ -0,0 +1,151 @@
+import hashlib
+
+from django.conf import settings
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from core.serializers import FIELDS_PARAM, OMIT_PARAM
+from offers_app.api.serializers import EXPAND_PARAM
+
+
+class ConditionalGetMixin:
+    """
+    Answer GET requests with 304 Not Modified when the client already
+    holds the current representation. Views provide get_validators(),
+    which has to be cheap since it runs before any serialization.
+    """
+    # Whether If-Modified-Since may answer the request on its own
+    use_last_modified = True
+
+    def get_validators(self, request, *args, **kwargs):
+        """
+        Return the validator parts identifying the representation and
+        its last modification time, or (None, None) to skip validation.
+        Views validate nothing unless they override it.
+        """
+        return None, None
+
+    def get(self, request, *args, **kwargs):
+        parts, last_modified = self.get_validators(request, *args, **kwargs)
+        if parts is None:
+            return super().get(request, *args, **kwargs)
+        etag = self.build_etag(request, parts)
+        timestamp = last_modified.timestamp() if last_modified else None
+        response = get_conditional_response(
+            request,
+            etag=etag,
+            last_modified=(
+                int(timestamp) if self.use_last_modified and timestamp
+                else None
+            )
+        )
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+        response['ETag'] = etag
+        if timestamp:
+            response['Last-Modified'] = http_date(timestamp)
+        return response
+
+    # Build a strong ETag that also covers host, format and fieldset
+    def build_etag(self, request, parts):
+        parts = [
+            type(self).__name__,
+            request.build_absolute_uri('/'),
+            request.accepted_renderer.format,
+            request.query_params.get(FIELDS_PARAM, ''),
+            request.query_params.get(OMIT_PARAM, ''),
+            request.query_params.get(EXPAND_PARAM, ''),
+            *[str(part) for part in parts],
+        ]
+        digest = hashlib.sha1('|'.join(parts).encode()).hexdigest()
+        return quote_etag(digest)
+
+
+class OfferFilterMixin:
+    """
+    Apply the creator_id, min_price and max_delivery_time filters
+    shared by the offer list and its facets.
+    """
+    # Apply filtering based on query parameters
+    def get_queryset(self):
+        queryset = super().get_queryset()
+
+        creator_id = self.request.query_params.get('creator_id')
+        min_price_filter = self.request.query_params.get('min_price')
+        max_delivery_time = self.request.query_params.get('max_delivery_time')
+
+        if creator_id:
+            try:
+                creator_id = int(creator_id)
+            except (TypeError, ValueError):
+                raise ValidationError({'creator_id': 'Must be an integer.'})
+            queryset = queryset.filter(user_id=creator_id)
+        if min_price_filter:
+            try:
+                min_price_filter = float(min_price_filter)
+            except (TypeError, ValueError):
+                raise ValidationError({'min_price': 'Must be a number.'})
+            # Filter by the stored min_price instead of individual details
+            queryset = queryset.filter(min_price__gte=min_price_filter)
+        if max_delivery_time:
+            try:
+                max_delivery_time = int(max_delivery_time)
+            except (TypeError, ValueError):
+                raise ValidationError(
+                    {'max_delivery_time': 'Must be an integer.'}
+                )
+            # Filter by the stored min_delivery_time
+            queryset = queryset.filter(
+                min_delivery_time__lte=max_delivery_time
+            )
+        return queryset
+
+
+class BatchLookupMixin:
+    """
+    Answer ?ids=1,2,3 with the objects of those ids from one
+    WHERE id IN (...) query, in the requested order, and list the ids
+    that were not found under missing.
+    """
+    ids_param = 'ids'
+
+    # Parse the requested ids, or return None when none were requested
+    def get_batch_ids(self, request):
+        value = request.query_params.get(self.ids_param)
+        if value is None:
+            return None
+        try:
+            ids = [int(part) for part in value.split(',') if part.strip()]
+        except ValueError:
+            raise ValidationError(
+                {self.ids_param: 'Must be a comma separated list of integers.'}
+            )
+        # Keep the first position of repeated ids
+        ids = list(dict.fromkeys(ids))
+        if not ids:
+            raise ValidationError(
+                {self.ids_param: 'At least one id is required.'}
+            )
+        max_ids = settings.BATCH_LOOKUP_MAX_IDS
+        if len(ids) > max_ids:
+            raise ValidationError(
+                {self.ids_param: f'At most {max_ids} ids are allowed.'}
+            )
+        return ids
+
+    def get_batch_response(self, queryset, ids):
+        found = {}
+        for obj in queryset.filter(pk__in=ids).order_by():
+            found[obj['id'] if isinstance(obj, dict) else obj.pk] = obj
+        serializer = self.get_serializer(
+            [found[pk] for pk in ids if pk in found], many=True
+        )
+        return Response({
+            'results': serializer.data,
+            'missing': [pk for pk in ids if pk not in found],
+        })
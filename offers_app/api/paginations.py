@@ -1,10 +1,34 @@
 from rest_framework.pagination import PageNumberPagination
 
+from core.paginations import KeysetPagination
+
 
 class DynamicPageSizePagination(PageNumberPagination):
     """
     Pagination class that allows clients
     to set the page size via a query parameter.
+    Clients can opt into keyset pagination with ?pagination=cursor,
+    the returned links then carry the cursor.
     """
     page_size = 6  # should orientate on frontend needs
     page_size_query_param = 'page_size'
+    cursor_pagination_class = KeysetPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_paginator = None
+        if self.use_cursor(request):
+            self.cursor_paginator = self.cursor_pagination_class()
+            self.cursor_paginator.page_size = self.page_size
+            return self.cursor_paginator.paginate_queryset(
+                queryset, request, view
+            )
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    # Check whether the client asked for keyset pagination
+    def use_cursor(self, request):
+        return self.cursor_pagination_class.is_requested(request)
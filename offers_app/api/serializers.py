@@ -1,7 +1,108 @@
+from django.conf import settings
+from django.db import transaction
+from django.urls import reverse
+
 from rest_framework import serializers
+
+from core.renditions import get_srcset
+from core.serializers import (
+    CheckedImageField,
+    SparseFieldsetMixin,
+    SrcsetField,
+    get_concrete_fields,
+    get_media_url_builder,
+    get_ordering_fields,
+    get_sparse_fields,
+    split_field_names
+)
 from offers_app.models import Offer, OfferDetail
 
 
+# Query parameter choosing between absolute and relative detail URLs
+URLS_PARAM = 'urls'
+# Query parameter inlining related objects, only details can be expanded
+EXPAND_PARAM = 'expand'
+EXPANDABLE_FIELDS = ('details',)
+
+
+def expands_details(request):
+    """
+    Return whether the request asks for the full details with
+    ?expand=details instead of detail links.
+    """
+    if request is None:
+        return False
+    names = split_field_names(request.GET.get(EXPAND_PARAM, ''))
+    unknown = [name for name in names if name not in EXPANDABLE_FIELDS]
+    if unknown:
+        raise serializers.ValidationError({
+            EXPAND_PARAM: f"Cannot expand: {', '.join(unknown)}."
+        })
+    return 'details' in names
+
+
+def use_relative_urls(request):
+    value = request.GET.get(URLS_PARAM) if request else None
+    if value in ('absolute', 'relative'):
+        return value == 'relative'
+    return not settings.OFFER_DETAIL_ABSOLUTE_URLS
+
+
+# Pk the detail route is reversed with, replaced by the real pks
+DETAIL_URL_PLACEHOLDER = 2 ** 63 - 1
+
+
+def get_detail_url_format(context):
+    """
+    Return the format string of offer detail URLs. It is resolved from
+    the offer-detail-full route once and kept in the serializer context,
+    which all serializers of a response share.
+    """
+    url_format = context.get('detail_url_format')
+    if url_format is None:
+        request = context.get('request')
+        prefix = ''
+        if request is not None and not use_relative_urls(request):
+            prefix = request.build_absolute_uri('/')[:-1]
+        url = prefix + reverse(
+            'offer-detail-full', kwargs={'pk': DETAIL_URL_PLACEHOLDER}
+        )
+        url_format = '{}'.join(
+            part.replace('{', '{{').replace('}', '}}')
+            for part in url.split(str(DETAIL_URL_PLACEHOLDER))
+        )
+        context['detail_url_format'] = url_format
+    return url_format
+
+
+# Related columns read for user_details
+USER_DETAILS_FIELDS = (
+    'user__username', 'user__first_name', 'user__last_name',
+    'user__profile__first_name', 'user__profile__last_name',
+)
+
+
+def select_offer_fields(queryset, fields):
+    """
+    Narrow an offer queryset to the columns and relations the selected
+    fields need, keeping the columns it is ordered by.
+    """
+    if fields is None:
+        return queryset
+    columns = get_concrete_fields(
+        Offer, [*fields, *get_ordering_fields(queryset)]
+    )
+    if 'image_srcset' in fields:
+        columns.extend(('image', 'image_renditions'))
+    if 'user_details' in fields:
+        columns.extend(USER_DETAILS_FIELDS)
+    else:
+        queryset = queryset.select_related(None)
+    if 'details' not in fields:
+        queryset = queryset.prefetch_related(None)
+    return queryset.only(*columns)
+
+
 class OfferDetailLinkSerializer(serializers.ModelSerializer):
     """
     Serializer for offer detail representation in the offer list.
@@ -14,13 +115,12 @@ class OfferDetailLinkSerializer(serializers.ModelSerializer):
 
     # Get the URL for the offer detail
     def get_url(self, obj):
-        request = self.context.get('request')
-        if request:
-            return request.build_absolute_uri(f'/api/offerdetails/{obj.id}/')
-        return f'/api/offerdetails/{obj.id}/'
+        return get_detail_url_format(self.context).format(obj.id)
 
 
-class OfferDetailFullSerializer(serializers.ModelSerializer):
+class OfferDetailFullSerializer(
+    SparseFieldsetMixin, serializers.ModelSerializer
+):
     """
     Serializer for creating and representing offer details.
     """
@@ -34,33 +134,42 @@ class OfferDetailFullSerializer(serializers.ModelSerializer):
         ]
 
 
-class OfferRetrieveSerializer(serializers.ModelSerializer):
+class ExpandDetailsMixin:
+    """
+    Serialize the full details instead of detail links when the
+    request asks for ?expand=details.
+    """
+    def get_fields(self):
+        fields = super().get_fields()
+        if 'details' in fields and expands_details(
+            self.context.get('request')
+        ):
+            fields['details'] = OfferDetailFullSerializer(
+                many=True, read_only=True
+            )
+        return fields
+
+
+class OfferRetrieveSerializer(
+    ExpandDetailsMixin, SparseFieldsetMixin, serializers.ModelSerializer
+):
     """
     Serializer for representing offers with summary information.
     """
     user = serializers.PrimaryKeyRelatedField(read_only=True)
+    image_srcset = SrcsetField('image', 'image_renditions')
     details = OfferDetailLinkSerializer(many=True, read_only=True)
-    min_price = serializers.SerializerMethodField()
-    min_delivery_time = serializers.SerializerMethodField()
+    min_price = serializers.IntegerField(read_only=True)
+    min_delivery_time = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Offer
         fields = [
-            'id', 'user', 'title', 'image',
+            'id', 'user', 'title', 'image', 'image_srcset',
             'description', 'created_at', 'updated_at',
             'details', 'min_price', 'min_delivery_time',
         ]
 
-    # Get the minimum price from the offer details
-    def get_min_price(self, obj):
-        prices = [detail.price for detail in obj.details.all()]
-        return min(prices) if prices else None
-
-    # Get the minimum delivery time from the offer details
-    def get_min_delivery_time(self, obj):
-        times = [detail.delivery_time_in_days for detail in obj.details.all()]
-        return min(times) if times else None
-
     # Get user details associated with the offer
     def get_user_details(self, obj):
         user = obj.user
@@ -78,33 +187,30 @@ class OfferRetrieveSerializer(serializers.ModelSerializer):
         }
 
 
-class OfferListSerializer(serializers.ModelSerializer):
+class OfferListSerializer(
+    ExpandDetailsMixin, SparseFieldsetMixin, serializers.ModelSerializer
+):
     """
     Serializer for representing offers with summary information.
     """
     user = serializers.PrimaryKeyRelatedField(read_only=True)
+    image_srcset = SrcsetField('image', 'image_renditions')
     details = OfferDetailLinkSerializer(many=True, read_only=True)
-    min_price = serializers.SerializerMethodField()
-    min_delivery_time = serializers.SerializerMethodField()
+    min_price = serializers.IntegerField(read_only=True)
+    min_delivery_time = serializers.IntegerField(read_only=True)
     user_details = serializers.SerializerMethodField()
 
     class Meta:
         model = Offer
         fields = [
-            'id', 'user', 'title', 'image', 'description',
+            'id', 'user', 'title', 'image', 'image_srcset', 'description',
             'created_at', 'updated_at', 'details',
             'min_price', 'min_delivery_time', 'user_details'
         ]
 
-    # Get the minimum price from the offer details
-    def get_min_price(self, obj):
-        prices = [detail.price for detail in obj.details.all()]
-        return min(prices) if prices else None
-
-    # Get the minimum delivery time from the offer details
-    def get_min_delivery_time(self, obj):
-        times = [detail.delivery_time_in_days for detail in obj.details.all()]
-        return min(times) if times else None
+    @classmethod
+    def prepare_queryset(cls, queryset, fields=None):
+        return select_offer_fields(queryset, fields)
 
     # Get user details associated with the offer
     def get_user_details(self, obj):
@@ -124,6 +230,7 @@ class OfferListSerializer(serializers.ModelSerializer):
 
 
 class OfferCreateSerializer(serializers.ModelSerializer):
+    image = CheckedImageField(max_length=100, required=False, allow_null=True)
     details = OfferDetailFullSerializer(many=True)
 
     class Meta:
@@ -139,13 +246,22 @@ class OfferCreateSerializer(serializers.ModelSerializer):
                 "An offer must have at least three details.")
         return value
 
-    # Create an offer along with its details
+    # Create an offer along with its details in one transaction
     def create(self, validated_data):
         details_data = validated_data.pop('details')
         user = self.context['request'].user
-        offer = Offer.objects.create(user=user, **validated_data)
-        for detail_data in details_data:
-            OfferDetail.objects.create(offer=offer, **detail_data)
+        details = [OfferDetail(**detail_data) for detail_data in details_data]
+        offer = Offer(user=user, **validated_data)
+        # bulk_create skips the detail signals, so the summary is set
+        # here and the offer signals update the indexes and the cache
+        offer.apply_summary(details)
+        with transaction.atomic():
+            offer.save()
+            for detail in details:
+                detail.offer = offer
+            OfferDetail.objects.bulk_create(details)
+        # Serve the details from memory in the response
+        offer._prefetched_objects_cache = {'details': details}
         return offer
 
     # Return the created offer with full detail fields
@@ -158,7 +274,11 @@ class OfferCreateSerializer(serializers.ModelSerializer):
 
 
 class OfferUpdateSerializer(serializers.ModelSerializer):
-    details = OfferDetailFullSerializer(many=True, required=False)
+    image = CheckedImageField(max_length=100, required=False, allow_null=True)
+    # Written by update() and added by to_representation()
+    details = OfferDetailFullSerializer(
+        many=True, required=False, write_only=True
+    )
 
     class Meta:
         model = Offer
@@ -166,41 +286,221 @@ class OfferUpdateSerializer(serializers.ModelSerializer):
             'id', 'title', 'image', 'description', 'details'
         ]
 
-    # Update an offer and its details
+    # Load the details of the offer once, ordered like the responses
+    def get_current_details(self):
+        if not hasattr(self, 'current_details'):
+            self.current_details = list(
+                self.instance.details.order_by('id')
+            )
+        return self.current_details
+
+    # Check every offer_type before anything is written
+    def validate_details(self, value):
+        details = {
+            detail.offer_type: detail
+            for detail in self.get_current_details()
+        }
+        for detail_data in value:
+            offer_type = detail_data.get('offer_type')
+            if not offer_type:
+                raise serializers.ValidationError(
+                    "Each detail must contain 'offer_type'."
+                )
+            if offer_type not in details:
+                raise serializers.ValidationError(
+                    f"Detail with offer_type {offer_type} does not exist."
+                )
+        return value
+
+    # Update an offer and its changed details in one transaction
     def update(self, instance, validated_data):
-        # Update offer fields
+        details_data = validated_data.pop('details', None) or []
+        details = {
+            detail.offer_type: detail
+            for detail in self.get_current_details()
+        }
+        changed_details = []
+        changed_fields = set()
+        for detail_data in details_data:
+            detail = details[detail_data['offer_type']]
+            # Only update fields provided in the request
+            for key, value in detail_data.items():
+                if key in ('id', 'offer_type'):
+                    continue
+                if getattr(detail, key) != value:
+                    setattr(detail, key, value)
+                    changed_fields.add(key)
+                    if detail not in changed_details:
+                        changed_details.append(detail)
         for attr, value in validated_data.items():
-            if attr != 'details':
-                setattr(instance, attr, value)
-        instance.save()
-        # Update offer details
-        details_data = validated_data.get('details')
-        if details_data:
-            for detail_data in details_data:
-                offer_type = detail_data.get('offer_type')
-                if not offer_type:
-                    raise serializers.ValidationError(
-                        "Each detail must contain 'offer_type'."
-                    )
-                try:
-                    detail_instance = instance.details.get(
-                        offer_type=offer_type
-                    )
-                except OfferDetail.DoesNotExist:
-                    raise serializers.ValidationError(
-                        f"Detail with offer_type {offer_type} does not exist."
-                    )
-                # Only update fields provided in the request
-                for key, value in detail_data.items():
-                    if key != 'offer_type':
-                        setattr(detail_instance, key, value)
-                detail_instance.save()
+            setattr(instance, attr, value)
+        with transaction.atomic():
+            if changed_details:
+                OfferDetail.objects.bulk_update(
+                    changed_details, sorted(changed_fields)
+                )
+                # bulk_update skips the detail signals, the summary is
+                # saved with the offer, whose signals update the cache
+                instance.apply_summary(self.current_details)
+            instance.save()
         return instance
 
+    # Return the offer with the full details held in memory
     def to_representation(self, instance):
         data = super().to_representation(instance)
         data['details'] = OfferDetailFullSerializer(
-            instance.details.all(),
-            many=True
+            self.get_current_details(), many=True
         ).data
         return data
+
+
+class FastOfferListSerializer:
+    """
+    Fast serializer for the offer list that builds the same output as
+    OfferListSerializer from .values() rows and one details query,
+    without per-field serializer dispatch. The view passes the queryset
+    through prepare_queryset() before paginating it.
+    """
+    # Columns read for each output field
+    field_values = {
+        'id': ('id',),
+        'user': ('user_id',),
+        'title': ('title',),
+        'image': ('image',),
+        'image_srcset': ('image', 'image_renditions'),
+        'description': ('description',),
+        'created_at': ('created_at',),
+        'updated_at': ('updated_at',),
+        'details': (),
+        'min_price': ('min_price',),
+        'min_delivery_time': ('min_delivery_time',),
+        'user_details': (
+            'user__username', 'user__first_name', 'user__last_name',
+            'user__profile__pk', 'user__profile__first_name',
+            'user__profile__last_name',
+        ),
+    }
+    value_fields = tuple(dict.fromkeys(
+        value for values in field_values.values() for value in values
+    ))
+    datetime_field = serializers.DateTimeField()
+
+    def __init__(self, instance=None, many=False, context=None, **kwargs):
+        self.instance = instance
+        self.many = many
+        self.context = context or {}
+
+    @classmethod
+    def get_sparse_field_names(cls):
+        return list(cls.field_values)
+
+    @classmethod
+    def prepare_queryset(cls, queryset, fields=None):
+        value_fields = cls.value_fields
+        if fields is not None:
+            value_fields = ['id'] + get_concrete_fields(
+                Offer, get_ordering_fields(queryset)
+            )
+            for name in fields:
+                value_fields.extend(cls.field_values[name])
+            value_fields = list(dict.fromkeys(value_fields))
+        return queryset.select_related(None).prefetch_related(None).values(
+            *value_fields
+        )
+
+    # Load the detail ids of all offers in one query
+    def get_detail_ids(self, offer_ids):
+        detail_ids = {offer_id: [] for offer_id in offer_ids}
+        rows = OfferDetail.objects.filter(
+            offer_id__in=offer_ids
+        ).order_by('id').values_list('offer_id', 'id')
+        for offer_id, detail_id in rows:
+            detail_ids[offer_id].append(detail_id)
+        return detail_ids
+
+    # Load the full details of all offers in one query
+    def get_full_details(self, offer_ids):
+        details = {offer_id: [] for offer_id in offer_ids}
+        rows = OfferDetail.objects.filter(
+            offer_id__in=offer_ids
+        ).order_by('id').values(
+            'offer_id', *OfferDetailFullSerializer.Meta.fields
+        )
+        for row in rows:
+            details[row.pop('offer_id')].append(row)
+        return details
+
+    # Map each output field to a function building it from a row
+    def get_builders(self, rows, fields):
+        request = self.context.get('request')
+        builders = {
+            'id': lambda row: row['id'],
+            'user': lambda row: row['user_id'],
+            'title': lambda row: row['title'],
+            'description': lambda row: row['description'],
+            'min_price': lambda row: row['min_price'],
+            'min_delivery_time': lambda row: row['min_delivery_time'],
+        }
+        if 'image' in fields:
+            prefix = request.build_absolute_uri('/')[:-1] if request else ''
+            storage = Offer._meta.get_field('image').storage
+
+            def build_image(row):
+                image = row['image'] and storage.url(row['image'])
+                if image and request:
+                    image = (
+                        prefix + image if image.startswith('/')
+                        else request.build_absolute_uri(image)
+                    )
+                return image or None
+            builders['image'] = build_image
+        if 'image_srcset' in fields:
+            build_url = get_media_url_builder(
+                self.context, Offer._meta.get_field('image').storage
+            )
+            builders['image_srcset'] = lambda row: get_srcset(
+                row['image'], row['image_renditions'], build_url
+            )
+        to_datetime = self.datetime_field.to_representation
+        builders['created_at'] = lambda row: to_datetime(row['created_at'])
+        builders['updated_at'] = lambda row: to_datetime(row['updated_at'])
+        if 'details' in fields and expands_details(request):
+            details = self.get_full_details([row['id'] for row in rows])
+            builders['details'] = lambda row: details[row['id']]
+        elif 'details' in fields:
+            detail_ids = self.get_detail_ids([row['id'] for row in rows])
+            detail_url = get_detail_url_format(self.context)
+            builders['details'] = lambda row: [
+                {'id': detail_id, 'url': detail_url.format(detail_id)}
+                for detail_id in detail_ids[row['id']]
+            ]
+
+        def build_user_details(row):
+            if row['user__profile__pk'] is not None:
+                first_name = row['user__profile__first_name']
+                last_name = row['user__profile__last_name']
+            else:
+                first_name = row['user__first_name']
+                last_name = row['user__last_name']
+            return {
+                'first_name': first_name,
+                'last_name': last_name,
+                'username': row['user__username'],
+            }
+        builders['user_details'] = build_user_details
+        return builders
+
+    @property
+    def data(self):
+        rows = list(self.instance) if self.many else [self.instance]
+        fields = get_sparse_fields(
+            self.context.get('request'), self.get_sparse_field_names()
+        )
+        if fields is None:
+            fields = self.get_sparse_field_names()
+        builders = self.get_builders(rows, fields)
+        results = [
+            {name: builders[name](row) for name in fields}
+            for row in rows
+        ]
+        return results if self.many else results[0]
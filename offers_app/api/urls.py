@@ -3,12 +3,18 @@ from django.urls import path
 from offers_app.api.views import (
     OfferListView,
     OfferDetailView,
-    OfferDetailFullRetrieveView
+    OfferDetailBatchView,
+    OfferDetailFullRetrieveView,
+    OfferFacetView,
+    OfferSuggestView
 )
 
 
 urlpatterns = [
     path('offers/', OfferListView.as_view(), name='offer-list'),
+    path('offers/facets/', OfferFacetView.as_view(), name='offer-facets'),
+    path('offers/suggest/', OfferSuggestView.as_view(), name='offer-suggest'),
     path('offers/<int:pk>/', OfferDetailView.as_view(), name='offer-detail'),
+    path('offerdetails/', OfferDetailBatchView.as_view(), name='offer-detail-batch'),
     path('offerdetails/<int:pk>/', OfferDetailFullRetrieveView.as_view(), name='offer-detail-full'),
 ]
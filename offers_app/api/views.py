@@ -1,38 +1,98 @@
+from django.conf import settings
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Min
+from django.db.models import Count, Max, Prefetch
 
 from rest_framework.generics import (
+    GenericAPIView,
     ListCreateAPIView,
     RetrieveUpdateDestroyAPIView,
     RetrieveAPIView
 )
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.permissions import (
+    AllowAny,
+    IsAuthenticated,
+    SAFE_METHODS
+)
 from rest_framework import filters
+from rest_framework.response import Response
+from rest_framework.views import APIView
 from rest_framework.exceptions import ValidationError, PermissionDenied
 
+from core.serializers import get_concrete_fields, get_sparse_fields
+from offers_app.cache import (
+    build_facet_cache_key,
+    build_list_cache_key,
+    get_cache,
+    get_catalogue_version,
+    normalize_list_request,
+    record_cache_access
+)
+from offers_app.api.filters import OfferSearchFilter
+from offers_app.api.mixins import (
+    BatchLookupMixin,
+    ConditionalGetMixin,
+    OfferFilterMixin
+)
 from offers_app.api.permissions import IsBusinessUser
+from offers_app.facets import compute_facets
 from offers_app.models import Offer, OfferDetail
 from offers_app.api.serializers import (
+    FastOfferListSerializer,
     OfferCreateSerializer,
     OfferDetailFullSerializer,
     OfferListSerializer,
     OfferRetrieveSerializer,
-    OfferUpdateSerializer
+    OfferUpdateSerializer,
+    expands_details,
+    select_offer_fields,
+    use_relative_urls
 )
 from offers_app.api.paginations import DynamicPageSizePagination
+from offers_app.suggest import suggest_index
+
+
+# Detail links only need the id, the summary values live on the offer
+DETAIL_LINKS_PREFETCH = Prefetch(
+    'details',
+    queryset=OfferDetail.objects.only('id', 'offer').order_by('id')
+)
+# Expanded details load all columns in the same single query
+DETAILS_PREFETCH = Prefetch(
+    'details', queryset=OfferDetail.objects.order_by('id')
+)
 
 
-class OfferListView(ListCreateAPIView):
+def get_details_prefetch(request):
+    if expands_details(request):
+        return DETAILS_PREFETCH
+    return DETAIL_LINKS_PREFETCH
+
+
+# Load only the detail columns of the selected fields
+def select_detail_fields(request, queryset):
+    fields = get_sparse_fields(
+        request, OfferDetailFullSerializer.get_sparse_field_names()
+    )
+    if fields is None:
+        return queryset
+    return queryset.only(*get_concrete_fields(OfferDetail, fields))
+
+
+class OfferListView(
+    ConditionalGetMixin, OfferFilterMixin, BatchLookupMixin,
+    ListCreateAPIView
+):
     """
     API view to list and create offers.
+    Lists the offers of ?ids=1,2,3 in that order instead of a page.
     """
-    queryset = Offer.objects.all()
+    queryset = Offer.objects.select_related('user', 'user__profile')
     serializer_class = OfferListSerializer
     permission_classes = [AllowAny, IsBusinessUser]
     pagination_class = DynamicPageSizePagination
     filter_backends = [
         DjangoFilterBackend,
-        filters.SearchFilter,
+        OfferSearchFilter,
         filters.OrderingFilter
     ]
     search_fields = ['title', 'description']
@@ -40,62 +100,148 @@ class OfferListView(ListCreateAPIView):
         'id', 'price',
         'delivery_time', 'created_at',
         'updated_at', 'min_price']
+    # Deleting an offer does not move the newest updated_at
+    use_last_modified = False
+    # Serializer for listing, OfferListSerializer or FastOfferListSerializer
+    list_serializer_class = FastOfferListSerializer
+    # Cache key and cached page of the request, read once
+    cached_page = None
+    # Newest change of a page computed on a cache miss
+    page_last_modified = None
 
     # Determine the serializer class based on the request method
     def get_serializer_class(self):
         if self.request.method == 'POST':
             return OfferCreateSerializer
-        return OfferListSerializer
+        return self.list_serializer_class
 
-    # Apply filtering based on query parameters
+    # Prefetch the detail links, or the full details when expanded
     def get_queryset(self):
-        queryset = super().get_queryset()
-
-        # Annotate queryset with min_price and min_delivery_time
-        queryset = queryset.annotate(
-            min_price=Min('details__price'),
-            min_delivery_time=Min('details__delivery_time_in_days')
+        return super().get_queryset().prefetch_related(
+            get_details_prefetch(self.request)
         )
 
-        creator_id = self.request.query_params.get('creator_id')
-        min_price_filter = self.request.query_params.get('min_price')
-        max_delivery_time = self.request.query_params.get('max_delivery_time')
-
-        if creator_id:
-            try:
-                creator_id = int(creator_id)
-            except (TypeError, ValueError):
-                raise ValidationError({'creator_id': 'Must be an integer.'})
-            queryset = queryset.filter(user_id=creator_id)
-        if min_price_filter:
-            try:
-                min_price_filter = float(min_price_filter)
-            except (TypeError, ValueError):
-                raise ValidationError({'min_price': 'Must be a number.'})
-            # Filter by annotated min_price instead of individual details
-            queryset = queryset.filter(min_price__gte=min_price_filter)
-        if max_delivery_time:
-            try:
-                max_delivery_time = int(max_delivery_time)
-            except (TypeError, ValueError):
-                raise ValidationError(
-                    {'max_delivery_time': 'Must be an integer.'}
-                )
-            # Filter by annotated min_delivery_time
-            queryset = queryset.filter(
-                min_delivery_time__lte=max_delivery_time
+    # Let the list serializer shape the queryset to the selected fields
+    def prepare_list_queryset(self, queryset):
+        serializer_class = self.get_serializer_class()
+        prepare_queryset = getattr(serializer_class, 'prepare_queryset', None)
+        if prepare_queryset is not None:
+            fields = get_sparse_fields(
+                self.request, serializer_class.get_sparse_field_names()
             )
+            queryset = prepare_queryset(queryset, fields)
         return queryset
 
+    def paginate_queryset(self, queryset):
+        return super().paginate_queryset(
+            self.prepare_list_queryset(queryset)
+        )
+
+    # Newest change and size of the filtered set
+    def get_summary(self, request):
+        queryset = self.filter_queryset(self.get_queryset())
+        ids = self.get_batch_ids(request)
+        if ids is not None:
+            queryset = queryset.filter(pk__in=ids)
+        return queryset.order_by().aggregate(
+            last_modified=Max('updated_at'),
+            count=Count('id')
+        )
+
+    def get_validators(self, request, *args, **kwargs):
+        """
+        Validate cached pages against their cache key, which changes
+        with the catalogue version, so cache hits make no query. The
+        newest change is stored next to the cached page. Without the
+        cache, validate against the newest change and size of the
+        filtered set.
+        """
+        if settings.OFFER_LIST_CACHE_TIMEOUT:
+            key, page = self.get_cached_page(request)
+            if page is not None:
+                return [key], page[1]
+            self.page_last_modified = (
+                self.get_summary(request)['last_modified']
+            )
+            return [key], self.page_last_modified
+        summary = self.get_summary(request)
+        parts = [
+            normalize_list_request(request),
+            summary['last_modified'],
+            summary['count'],
+            get_catalogue_version(),
+        ]
+        return parts, summary['last_modified']
+
+    # Read the cache key and the cached (data, last modified) pair of
+    # the request once, the pair is None on a miss
+    def get_cached_page(self, request):
+        if self.cached_page is None:
+            key = build_list_cache_key(request)
+            page = get_cache().get(key)
+            record_cache_access(hit=page is not None)
+            self.cached_page = key, page
+        return self.cached_page
 
-class OfferDetailView(RetrieveUpdateDestroyAPIView):
+    # Answer batch lookups in the requested order, the list filters
+    # still apply but the page is replaced by the requested ids
+    def list_offers(self, request, *args, **kwargs):
+        ids = self.get_batch_ids(request)
+        if ids is None:
+            return super().list(request, *args, **kwargs)
+        queryset = self.prepare_list_queryset(
+            self.filter_queryset(self.get_queryset())
+        )
+        return self.get_batch_response(queryset, ids)
+
+    # Serve list pages from the versioned response cache
+    def list(self, request, *args, **kwargs):
+        timeout = settings.OFFER_LIST_CACHE_TIMEOUT
+        if not timeout:
+            return self.list_offers(request, *args, **kwargs)
+        key, page = self.get_cached_page(request)
+        if page is not None:
+            response = Response(page[0])
+            response['X-Cache'] = 'HIT'
+            return response
+        response = self.list_offers(request, *args, **kwargs)
+        get_cache().set(key, (response.data, self.page_last_modified), timeout)
+        response['X-Cache'] = 'MISS'
+        return response
+
+
+class OfferDetailView(ConditionalGetMixin, RetrieveUpdateDestroyAPIView):
     """
     API view to retrieve and update an offer.
     """
-    queryset = Offer.objects.all()
+    queryset = Offer.objects.select_related('user')
     serializer_class = OfferUpdateSerializer
     permission_classes = [IsAuthenticated]
 
+    # Load the selected fields and detail links for read requests
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.request.method in SAFE_METHODS:
+            fields = get_sparse_fields(
+                self.request,
+                OfferRetrieveSerializer.get_sparse_field_names()
+            )
+            queryset = select_offer_fields(
+                queryset.prefetch_related(get_details_prefetch(self.request)),
+                fields
+            )
+        return queryset
+
+    # Validate against the update time of the offer
+    def get_validators(self, request, *args, **kwargs):
+        updated_at = Offer.objects.filter(
+            pk=kwargs['pk']
+        ).values_list('updated_at', flat=True).first()
+        if updated_at is None:
+            return None, None
+        parts = [kwargs['pk'], updated_at, use_relative_urls(request)]
+        return parts, updated_at
+
     # Determine the serializer class based on the request method
     def get_serializer_class(self):
         if self.request.method in ['PATCH', 'PUT']:
@@ -121,10 +267,86 @@ class OfferDetailView(RetrieveUpdateDestroyAPIView):
         return super().destroy(request, *args, **kwargs)
 
 
-class OfferDetailFullRetrieveView(RetrieveAPIView):
+class OfferDetailFullRetrieveView(ConditionalGetMixin, RetrieveAPIView):
     """
     API view to retrieve a specific offer detail.
     """
     queryset = OfferDetail.objects.all()
     serializer_class = OfferDetailFullSerializer
     permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return select_detail_fields(self.request, super().get_queryset())
+
+    # Validate against the offer, which is touched by every detail write
+    def get_validators(self, request, *args, **kwargs):
+        updated_at = OfferDetail.objects.filter(
+            pk=kwargs['pk']
+        ).values_list('offer__updated_at', flat=True).first()
+        if updated_at is None:
+            return None, None
+        return [kwargs['pk'], updated_at], updated_at
+
+
+class OfferDetailBatchView(BatchLookupMixin, GenericAPIView):
+    """
+    API view to retrieve several offer details by id with ?ids=1,2,3.
+    """
+    queryset = OfferDetail.objects.all()
+    serializer_class = OfferDetailFullSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        ids = self.get_batch_ids(request)
+        if ids is None:
+            raise ValidationError(
+                {self.ids_param: 'This parameter is required.'}
+            )
+        queryset = select_detail_fields(request, self.get_queryset())
+        return self.get_batch_response(queryset, ids)
+
+
+class OfferSuggestView(APIView):
+    """
+    API view to suggest offer titles while typing.
+    Answers from the in-memory title index and tolerates typos.
+    """
+    permission_classes = [AllowAny]
+    default_limit = 10
+    max_limit = 20
+
+    def get(self, request):
+        query = request.query_params.get('q', '')
+        limit = request.query_params.get('limit', self.default_limit)
+        try:
+            limit = int(limit)
+        except (TypeError, ValueError):
+            raise ValidationError({'limit': 'Must be an integer.'})
+        limit = max(1, min(limit, self.max_limit))
+        suggestions = suggest_index.suggest(query, limit)
+        return Response([
+            {'id': offer_id, 'title': title}
+            for offer_id, title in suggestions
+        ])
+
+
+class OfferFacetView(OfferFilterMixin, GenericAPIView):
+    """
+    API view to count the offers matching the list filters per price,
+    delivery time, offer type and creator.
+    """
+    queryset = Offer.objects.all()
+    permission_classes = [AllowAny]
+    filter_backends = [DjangoFilterBackend, OfferSearchFilter]
+
+    def get(self, request):
+        timeout = settings.OFFER_FACETS_CACHE_TIMEOUT
+        cache = get_cache()
+        key = build_facet_cache_key(request)
+        data = cache.get(key) if timeout else None
+        if data is None:
+            queryset = self.filter_queryset(self.get_queryset())
+            data = compute_facets(queryset)
+            if timeout:
+                cache.set(key, data, timeout)
+        return Response(data)
@@ -0,0 +1,120 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+
+CATALOGUE_VERSION_KEY = 'offers:catalogue-version'
+HITS_KEY = 'offers:list-cache:hits'
+MISSES_KEY = 'offers:list-cache:misses'
+
+# Query parameters that change the offer list response
+LIST_CACHE_PARAMS = (
+    'page', 'page_size', 'search', 'ordering', 'creator_id',
+    'min_price', 'max_delivery_time', 'pagination', 'cursor', 'format',
+    'urls', 'fields', 'omit', 'expand', 'ids',
+)
+# Query parameters that change the offer facets response
+FACET_CACHE_PARAMS = (
+    'search', 'creator_id', 'min_price', 'max_delivery_time', 'format',
+)
+
+
+def get_cache():
+    return caches[settings.OFFER_CACHE_ALIAS]
+
+
+def get_catalogue_version():
+    """
+    Return the current catalogue version, starting from the clock so
+    a lost counter never brings back entries of an earlier version.
+    """
+    cache = get_cache()
+    version = cache.get(CATALOGUE_VERSION_KEY)
+    if version is None:
+        cache.add(CATALOGUE_VERSION_KEY, time.time_ns(), None)
+        version = cache.get(CATALOGUE_VERSION_KEY)
+    return version
+
+
+def increment_catalogue_version():
+    cache = get_cache()
+    try:
+        cache.incr(CATALOGUE_VERSION_KEY)
+    except ValueError:
+        cache.set(CATALOGUE_VERSION_KEY, time.time_ns(), None)
+
+
+def bump_catalogue_version():
+    """
+    Invalidate all cached catalogue responses. The version is bumped
+    right away and again on commit, so pages cached from a concurrent
+    read before the commit are not served afterwards.
+    """
+    increment_catalogue_version()
+    transaction.on_commit(increment_catalogue_version)
+
+
+def normalize_list_request(request, names=LIST_CACHE_PARAMS):
+    """
+    Return the host and the normalized list query parameters, which
+    together determine the offer list response.
+    """
+    params = []
+    for name in names:
+        value = request.query_params.get(name, '').strip()
+        if not value or (name == 'page' and value == '1'):
+            continue
+        params.append(f'{name}={value}')
+    return '&'.join([request.build_absolute_uri('/')] + params)
+
+
+def build_list_cache_key(request):
+    """
+    Build the cache key of an offer list request from the catalogue
+    version, the host and the normalized list query parameters.
+    """
+    raw = normalize_list_request(request)
+    digest = hashlib.md5(raw.encode()).hexdigest()
+    return f'offers:list:{get_catalogue_version()}:{digest}'
+
+
+def build_facet_cache_key(request):
+    """
+    Build the cache key of an offer facets request, which only depends
+    on the filters and not on paging or ordering.
+    """
+    raw = normalize_list_request(request, FACET_CACHE_PARAMS)
+    digest = hashlib.md5(raw.encode()).hexdigest()
+    return f'offers:facets:{get_catalogue_version()}:{digest}'
+
+
+def record_cache_access(hit):
+    cache = get_cache()
+    key = HITS_KEY if hit else MISSES_KEY
+    if not cache.add(key, 1, None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, None)
+
+
+def get_cache_stats():
+    """
+    Return the hits, misses and hit rate of the offer list cache.
+    """
+    cache = get_cache()
+    hits = cache.get(HITS_KEY) or 0
+    misses = cache.get(MISSES_KEY) or 0
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_rate': hits / total if total else 0.0,
+    }
+
+
+def reset_cache_stats():
+    get_cache().delete_many([HITS_KEY, MISSES_KEY])
@@ -0,0 +1,28 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+from core.checks import needs_shared_cache
+
+
+@register(Tags.caches)
+def check_catalogue_cache(app_configs, **kwargs):
+    """
+    Refuse a process local offer response cache with several workers,
+    a catalogue version bump would only reach the worker that wrote.
+    """
+    alias = settings.OFFER_CACHE_ALIAS
+    enabled = (
+        settings.OFFER_LIST_CACHE_TIMEOUT
+        or settings.OFFER_FACETS_CACHE_TIMEOUT
+    )
+    if not enabled or not needs_shared_cache(alias):
+        return []
+    return [Error(
+        f"The '{alias}' cache holding the offer responses and their "
+        'catalogue version is local to each worker process.',
+        hint='Set CACHE_BACKEND to a shared backend (Redis, Memcached or '
+        'file based), run a single worker (WEB_CONCURRENCY=1) or disable '
+        'the response cache (OFFER_LIST_CACHE_TIMEOUT=0 and '
+        'OFFER_FACETS_CACHE_TIMEOUT=0).',
+        id='offers_app.E001',
+    )]
@@ -0,0 +1,92 @@
+from django.db.models import (
+    Case, Count, Exists, IntegerField, OuterRef, Value, When
+)
+
+from offers_app.models import OfferDetail
+
+
+OFFER_TYPES = ('basic', 'standard', 'premium')
+# Lower bounds of the price buckets, the last bucket is open ended
+PRICE_BUCKETS = (0, 50, 100, 250, 500, 1000)
+# Lower bounds of the delivery time buckets in days
+DELIVERY_BUCKETS = (1, 2, 4, 8, 15)
+# Number of creators listed in the creator facet
+MAX_CREATORS = 20
+
+
+def bucket_expression(field, bounds):
+    """
+    Map a summary column to the index of the bucket it falls into,
+    or None when the offer has no details yet.
+    """
+    whens = [
+        When(**{f'{field}__gte': bound}, then=Value(index))
+        for index, bound in reversed(list(enumerate(bounds)))
+    ]
+    whens.append(When(**{f'{field}__isnull': False}, then=Value(0)))
+    return Case(*whens, default=None, output_field=IntegerField())
+
+
+def bucket_ranges(bounds, counts):
+    return [
+        {
+            'min': bound,
+            'max': bounds[index + 1] - 1 if index + 1 < len(bounds) else None,
+            'count': counts[index],
+        }
+        for index, bound in enumerate(bounds)
+    ]
+
+
+def compute_facets(queryset):
+    """
+    Count the filtered offers per price range, delivery time range,
+    offer type and creator. The database groups the offers by creator
+    and bucket in a single query, the small result is folded here.
+    Offer types are probed with EXISTS on the (offer, offer_type) index,
+    so no join multiplies the offer rows.
+    """
+    type_counts = {
+        offer_type: Count('id', filter=Exists(OfferDetail.objects.filter(
+            offer_id=OuterRef('pk'), offer_type=offer_type
+        )))
+        for offer_type in OFFER_TYPES
+    }
+    rows = queryset.order_by().values(
+        'user_id',
+        price_bucket=bucket_expression('min_price', PRICE_BUCKETS),
+        delivery_bucket=bucket_expression(
+            'min_delivery_time', DELIVERY_BUCKETS
+        ),
+    ).annotate(offers=Count('id'), **type_counts)
+
+    total = 0
+    prices = [0] * len(PRICE_BUCKETS)
+    delivery_times = [0] * len(DELIVERY_BUCKETS)
+    offer_types = dict.fromkeys(OFFER_TYPES, 0)
+    creators = {}
+    for row in rows:
+        total += row['offers']
+        if row['price_bucket'] is not None:
+            prices[row['price_bucket']] += row['offers']
+        if row['delivery_bucket'] is not None:
+            delivery_times[row['delivery_bucket']] += row['offers']
+        for offer_type in OFFER_TYPES:
+            offer_types[offer_type] += row[offer_type]
+        creators[row['user_id']] = (
+            creators.get(row['user_id'], 0) + row['offers']
+        )
+
+    top_creators = sorted(
+        creators.items(), key=lambda item: (-item[1], item[0])
+    )[:MAX_CREATORS]
+    return {
+        'count': total,
+        'price': bucket_ranges(PRICE_BUCKETS, prices),
+        'delivery_time': bucket_ranges(DELIVERY_BUCKETS, delivery_times),
+        'offer_type': offer_types,
+        'creators': [
+            {'creator_id': creator_id, 'count': count}
+            for creator_id, count in top_creators
+        ],
+    }
@@ -0,0 +1,95 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from rest_framework.test import APIRequestFactory
+
+from offers_app.api.serializers import (
+    FastOfferListSerializer,
+    OfferListSerializer
+)
+from offers_app.api.views import DETAIL_LINKS_PREFETCH
+from offers_app.models import Offer, OfferDetail
+
+
+class Command(BaseCommand):
+    """
+    Measure rows per second of OfferListSerializer and
+    FastOfferListSerializer on seeded offers. All seeded rows are
+    rolled back afterwards.
+    """
+    help = 'Compare the throughput of the offer list serializers.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--offers', type=int, default=1000)
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.seed(options['offers'])
+            request = APIRequestFactory().get(
+                '/api/offers/', HTTP_HOST=self.get_host()
+            )
+            queryset = Offer.objects.select_related(
+                'user', 'user__profile'
+            ).prefetch_related(DETAIL_LINKS_PREFETCH)
+            for name, serializer in (
+                ('OfferListSerializer', self.run_full),
+                ('FastOfferListSerializer', self.run_fast),
+            ):
+                rows, seconds = 0, 0.0
+                for _ in range(options['repeat']):
+                    start = time.perf_counter()
+                    rows += serializer(queryset, request)
+                    seconds += time.perf_counter() - start
+                self.stdout.write(
+                    f'{name}: {rows / seconds:,.0f} rows/s'
+                )
+            transaction.set_rollback(True)
+
+    # Use a configured host so building absolute URLs passes validation
+    def get_host(self):
+        for host in settings.ALLOWED_HOSTS:
+            if host and host != '*' and not host.startswith('.'):
+                return host
+        return 'localhost'
+
+    def run_full(self, queryset, request):
+        data = OfferListSerializer(
+            queryset.all(), many=True, context={'request': request}
+        ).data
+        return len(data)
+
+    def run_fast(self, queryset, request):
+        data = FastOfferListSerializer(
+            FastOfferListSerializer.prepare_queryset(queryset.all()),
+            many=True, context={'request': request}
+        ).data
+        return len(data)
+
+    def seed(self, count):
+        user = get_user_model().objects.create_user(
+            username='benchmark-user', password=None, user_type='business'
+        )
+        offers = Offer.objects.bulk_create([
+            Offer(
+                user=user,
+                title=f'Benchmark {index}',
+                description='Benchmark offer',
+                min_price=100,
+                min_delivery_time=3
+            )
+            for index in range(count)
+        ])
+        OfferDetail.objects.bulk_create([
+            OfferDetail(
+                offer=offer, title=offer_type, revisions=1,
+                delivery_time_in_days=3, price=100, features=[],
+                offer_type=offer_type
+            )
+            for offer in offers
+            for offer_type in ('basic', 'standard', 'premium')
+        ])
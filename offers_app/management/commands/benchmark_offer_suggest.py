@@ -0,0 +1,92 @@
+import random
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from offers_app.models import Offer
+from offers_app.suggest import TitleSuggestIndex
+
+
+WORDS = [
+    'logo', 'design', 'designer', 'website', 'webdesign', 'shop',
+    'shopify', 'flyer', 'video', 'texte', 'seo', 'paket', 'branding',
+    'marketing', 'social', 'media', 'beratung', 'fotografie',
+    'übersetzung', 'animation', 'illustration', 'podcast', 'schnitt',
+    'wordpress', 'app', 'entwicklung', 'newsletter', 'visitenkarte',
+]
+
+
+class Command(BaseCommand):
+    """
+    Measure autocomplete lookups on seeded offer titles, split into
+    queries typed correctly and queries with a swapped letter. All
+    seeded rows are rolled back afterwards.
+    """
+    help = 'Measure the latency of the offer title autocomplete.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--offers', type=int, default=100000)
+        parser.add_argument('--queries', type=int, default=500)
+        parser.add_argument('--seed', type=int, default=1)
+
+    def handle(self, *args, **options):
+        rnd = random.Random(options['seed'])
+        with transaction.atomic():
+            self.seed(rnd, options['offers'])
+            index = TitleSuggestIndex()
+            start = time.perf_counter()
+            index.build()
+            self.stdout.write(
+                f'Index of {options["offers"]:,} offers built in '
+                f'{time.perf_counter() - start:.1f} s'
+            )
+            for name, typos in (('exact', False), ('typos', True)):
+                timings = [
+                    self.time_lookup(index, self.make_query(rnd, typos))
+                    for _ in range(options['queries'])
+                ]
+                quantiles = statistics.quantiles(timings, n=100)
+                self.stdout.write(
+                    f'{name}: median {statistics.median(timings):.2f} ms, '
+                    f'p90 {quantiles[89]:.2f} ms, '
+                    f'p99 {quantiles[98]:.2f} ms'
+                )
+            transaction.set_rollback(True)
+
+    # Milliseconds of one lookup
+    def time_lookup(self, index, query):
+        start = time.perf_counter()
+        index.suggest(query)
+        return (time.perf_counter() - start) * 1000
+
+    # One to three title words, the last one typed partly
+    def make_query(self, rnd, typos):
+        words = rnd.sample(WORDS, rnd.randint(1, 3))
+        if typos:
+            index = rnd.randrange(len(words))
+            word = words[index]
+            swap = rnd.randrange(len(word) - 1)
+            words[index] = (
+                word[:swap] + word[swap + 1] + word[swap] + word[swap + 2:]
+            )
+        words[-1] = words[-1][:rnd.randint(2, len(words[-1]))]
+        return ' '.join(words)
+
+    def seed(self, rnd, count):
+        user = get_user_model().objects.create_user(
+            username='benchmark-user', password=None, user_type='business'
+        )
+        Offer.objects.bulk_create(
+            [
+                Offer(
+                    user=user,
+                    title=' '.join(rnd.sample(WORDS, rnd.randint(1, 4))),
+                    description='Benchmark offer'
+                )
+                for _ in range(count)
+            ],
+            batch_size=1000
+        )
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from offers_app.cache import get_cache_stats, reset_cache_stats
+
+
+class Command(BaseCommand):
+    """
+    Report the hit rate of the offer list response cache.
+    """
+    help = 'Report the hit rate of the offer list response cache.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reset',
+            action='store_true',
+            help='Reset the counters after reporting them.'
+        )
+
+    def handle(self, *args, **options):
+        stats = get_cache_stats()
+        self.stdout.write(
+            f"hits: {stats['hits']}, misses: {stats['misses']}, "
+            f"hit rate: {stats['hit_rate']:.1%}"
+        )
+        if options['reset']:
+            reset_cache_stats()
@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand
+
+from core.renditions import update_renditions
+from offers_app.models import Offer
+from profiles_app.models import Profile
+
+
+class Command(BaseCommand):
+    """
+    Backfill the renditions of offer images and profile pictures that
+    were uploaded before renditions existed or whose renditions are out
+    of date. Runs in the foreground, one file after another.
+    """
+    help = 'Render missing image renditions of offers and profiles.'
+
+    # Models with the file field and the field keeping its renditions
+    targets = (
+        (Offer, 'image', 'image_renditions'),
+        (Profile, 'file', 'file_renditions'),
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Render all renditions again, e.g. after changing the widths.'
+        )
+
+    def handle(self, *args, **options):
+        for model, file_field, renditions_field in self.targets:
+            rows = model.objects.exclude(
+                **{file_field: ''}
+            ).exclude(
+                **{f'{file_field}__isnull': True}
+            ).values_list('pk', file_field, renditions_field)
+            rendered = 0
+            for pk, name, renditions in rows.iterator():
+                if not options['force'] and (
+                    (renditions or {}).get('source') == name
+                ):
+                    continue
+                rendered += update_renditions(
+                    model, pk, file_field, renditions_field,
+                    force=options['force']
+                )
+            self.stdout.write(
+                f'{model._meta.verbose_name_plural}: {rendered} rendered'
+            )
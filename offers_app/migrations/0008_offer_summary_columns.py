@@ -0,0 +1,51 @@
+# Generated by Django 5.2.7 on 2026-10-18 19:26
+
+from django.db import migrations, models
+from django.db.models import Max, Min, OuterRef, Subquery
+
+
+def backfill_offer_summary(apps, schema_editor):
+    Offer = apps.get_model('offers_app', 'Offer')
+    OfferDetail = apps.get_model('offers_app', 'OfferDetail')
+
+    def detail_aggregate(aggregate):
+        return Subquery(
+            OfferDetail.objects.filter(offer_id=OuterRef('pk'))
+            .values('offer_id')
+            .annotate(value=aggregate)
+            .values('value')[:1]
+        )
+
+    Offer.objects.update(
+        min_price=detail_aggregate(Min('price')),
+        max_price=detail_aggregate(Max('price')),
+        min_delivery_time=detail_aggregate(Min('delivery_time_in_days')),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers_app', '0007_alter_offer_options'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='offer',
+            name='max_price',
+            field=models.IntegerField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='offer',
+            name='min_delivery_time',
+            field=models.IntegerField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='offer',
+            name='min_price',
+            field=models.IntegerField(blank=True, db_index=True, editable=False, null=True),
+        ),
+        migrations.RunPython(
+            backfill_offer_summary, migrations.RunPython.noop
+        ),
+    ]
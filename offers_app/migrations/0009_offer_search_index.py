@@ -0,0 +1,68 @@
+from django.db import migrations
+
+
+SQLITE_FORWARD = [
+    "CREATE VIRTUAL TABLE offers_app_offer_fts "
+    "USING fts5(title, description)",
+    "INSERT INTO offers_app_offer_fts (rowid, title, description) "
+    "SELECT id, title, description FROM offers_app_offer",
+]
+
+SQLITE_BACKWARD = [
+    "DROP TABLE IF EXISTS offers_app_offer_fts",
+]
+
+POSTGRES_FORWARD = [
+    "ALTER TABLE offers_app_offer ADD COLUMN search_vector tsvector",
+    """
+    CREATE FUNCTION offers_app_offer_search_vector_update()
+    RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('simple', coalesce(NEW.title, '')), 'A') ||
+            setweight(to_tsvector('simple', coalesce(NEW.description, '')), 'B');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "CREATE TRIGGER offers_app_offer_search_vector_trigger "
+    "BEFORE INSERT OR UPDATE OF title, description ON offers_app_offer "
+    "FOR EACH ROW EXECUTE FUNCTION offers_app_offer_search_vector_update()",
+    "UPDATE offers_app_offer SET title = title",
+    "CREATE INDEX offers_app_offer_search_vector_idx "
+    "ON offers_app_offer USING GIN (search_vector)",
+]
+
+POSTGRES_BACKWARD = [
+    "DROP TRIGGER IF EXISTS offers_app_offer_search_vector_trigger "
+    "ON offers_app_offer",
+    "DROP FUNCTION IF EXISTS offers_app_offer_search_vector_update()",
+    "ALTER TABLE offers_app_offer DROP COLUMN IF EXISTS search_vector",
+]
+
+
+def run_vendor_sql(statements):
+    def run(apps, schema_editor):
+        for statement in statements.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers_app', '0008_offer_summary_columns'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run_vendor_sql({
+                'sqlite': SQLITE_FORWARD,
+                'postgresql': POSTGRES_FORWARD,
+            }),
+            run_vendor_sql({
+                'sqlite': SQLITE_BACKWARD,
+                'postgresql': POSTGRES_BACKWARD,
+            }),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.7 on 2026-10-18 21:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers_app', '0012_offer_image_renditions'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='offerdetail',
+            name='offer',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='details', to='offers_app.offer'),
+        ),
+    ]
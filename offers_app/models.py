@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models import Max, Min
+from django.utils import timezone
 
 from core import settings
 
@@ -10,9 +12,23 @@ class Offer(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     title = models.CharField(max_length=255)
     image = models.ImageField(null=True, blank=True)
+    # Rendered sizes of the image, see core.renditions
+    image_renditions = models.JSONField(
+        default=dict, blank=True, editable=False
+    )
     description = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Denormalized summary of the offer details, see refresh_summary()
+    min_price = models.IntegerField(
+        null=True, blank=True, editable=False, db_index=True
+    )
+    max_price = models.IntegerField(
+        null=True, blank=True, editable=False, db_index=True
+    )
+    min_delivery_time = models.IntegerField(
+        null=True, blank=True, editable=False, db_index=True
+    )
 
     class Meta:
         ordering = ['id']
@@ -20,12 +36,43 @@ class Offer(models.Model):
     def __str__(self):
         return self.title
 
+    def refresh_summary(self):
+        """
+        Recompute the price and delivery time summary from the details
+        and store it on the offer row. Marks the offer as updated, since
+        its details changed.
+        """
+        summary = OfferDetail.objects.filter(offer_id=self.pk).aggregate(
+            min_price=Min('price'),
+            max_price=Max('price'),
+            min_delivery_time=Min('delivery_time_in_days')
+        )
+        summary['updated_at'] = timezone.now()
+        Offer.objects.filter(pk=self.pk).update(**summary)
+        for field, value in summary.items():
+            setattr(self, field, value)
+
+    def apply_summary(self, details):
+        """
+        Set the summary from detail objects already in memory, for
+        writes that bypass the detail signals. Does not save the offer.
+        """
+        prices = [detail.price for detail in details]
+        delivery_times = [detail.delivery_time_in_days for detail in details]
+        self.min_price = min(prices, default=None)
+        self.max_price = max(prices, default=None)
+        self.min_delivery_time = min(delivery_times, default=None)
+
 
 class OfferDetail(models.Model):
     """
     Model representing detailed information about an offer.
     """
-    offer = models.ForeignKey(Offer, related_name='details', on_delete=models.CASCADE)
+    # Looked up through the composite indexes leading with the offer
+    offer = models.ForeignKey(
+        Offer, related_name='details', on_delete=models.CASCADE,
+        db_index=False
+    )
     title = models.CharField(max_length=255)
     revisions = models.IntegerField()
     delivery_time_in_days = models.IntegerField()
@@ -33,5 +80,23 @@ class OfferDetail(models.Model):
     features = models.JSONField(default=list)
     offer_type = models.CharField(max_length=20)
 
+    class Meta:
+        indexes = [
+            # Price and delivery time summaries per offer
+            models.Index(
+                fields=['offer', 'price'],
+                name='offerdetail_offer_price_idx'
+            ),
+            models.Index(
+                fields=['offer', 'delivery_time_in_days'],
+                name='offerdetail_offer_delivery_idx'
+            ),
+            # Offer type facets per offer
+            models.Index(
+                fields=['offer', 'offer_type'],
+                name='offerdetail_offer_type_idx'
+            ),
+        ]
+
     def __str__(self):
         return f"{self.offer.title} - {self.title}"
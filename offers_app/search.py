@@ -0,0 +1,146 @@
+import re
+from functools import reduce
+from operator import and_, or_
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import BooleanField, FloatField, Q
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+
+SEARCH_TABLE = 'offers_app_offer_fts'
+
+
+def split_search_terms(search):
+    """
+    Split a search string into word terms that are safe to embed
+    into full-text query syntax.
+    """
+    return re.findall(r'\w+', search or '')
+
+
+class LikeSearchBackend:
+    """
+    Fallback search backend using case-insensitive substring matching.
+    Every term has to appear in the title or the description.
+    """
+    search_fields = ('title', 'description')
+
+    def search(self, queryset, terms):
+        conditions = [
+            reduce(or_, [
+                Q(**{f'{field}__icontains': term})
+                for field in self.search_fields
+            ])
+            for term in terms
+        ]
+        return queryset.filter(reduce(and_, conditions))
+
+    # Substring matching needs no index maintenance
+    def index(self, offer):
+        pass
+
+    def remove(self, offer_id):
+        pass
+
+
+class SQLiteSearchBackend:
+    """
+    Search backend using an FTS5 table that mirrors offer titles and
+    descriptions. Results are ranked by bm25 relevance.
+    """
+    def build_query(self, terms):
+        return ' '.join(f'"{term}"*' for term in terms)
+
+    def search(self, queryset, terms):
+        query = self.build_query(terms)
+        table = queryset.model._meta.db_table
+        return queryset.filter(
+            pk__in=RawSQL(
+                f'SELECT rowid FROM {SEARCH_TABLE} '
+                f'WHERE {SEARCH_TABLE} MATCH %s',
+                [query]
+            )
+        ).annotate(
+            search_rank=RawSQL(
+                f'SELECT -rank FROM {SEARCH_TABLE} '
+                f'WHERE {SEARCH_TABLE} MATCH %s '
+                f'AND rowid = {table}.id',
+                [query],
+                output_field=FloatField()
+            )
+        ).order_by('-search_rank', 'id')
+
+    def index(self, offer):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {SEARCH_TABLE} WHERE rowid = %s', [offer.pk]
+            )
+            cursor.execute(
+                f'INSERT INTO {SEARCH_TABLE} (rowid, title, description) '
+                f'VALUES (%s, %s, %s)',
+                [offer.pk, offer.title, offer.description]
+            )
+
+    def remove(self, offer_id):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {SEARCH_TABLE} WHERE rowid = %s', [offer_id]
+            )
+
+
+class PostgresSearchBackend:
+    """
+    Search backend using the GIN indexed search_vector column, which a
+    database trigger keeps up to date. Results are ranked by ts_rank.
+    """
+    config = 'simple'
+
+    def build_query(self, terms):
+        return ' & '.join(f'{term}:*' for term in terms)
+
+    def search(self, queryset, terms):
+        query = self.build_query(terms)
+        table = queryset.model._meta.db_table
+        return queryset.alias(
+            search_match=RawSQL(
+                f'{table}.search_vector @@ to_tsquery(%s, %s)',
+                [self.config, query],
+                output_field=BooleanField()
+            )
+        ).filter(search_match=True).annotate(
+            search_rank=RawSQL(
+                f'ts_rank({table}.search_vector, to_tsquery(%s, %s))',
+                [self.config, query],
+                output_field=FloatField()
+            )
+        ).order_by('-search_rank', 'id')
+
+    # The database trigger maintains the search vector
+    def index(self, offer):
+        pass
+
+    def remove(self, offer_id):
+        pass
+
+
+VENDOR_BACKENDS = {
+    'sqlite': SQLiteSearchBackend,
+    'postgresql': PostgresSearchBackend,
+}
+
+
+def get_search_backend():
+    """
+    Return the configured search backend, or the one matching the
+    database vendor if OFFER_SEARCH_BACKEND is not set. Resolved on
+    every call, backends are stateless and cheap to create.
+    """
+    if settings.OFFER_SEARCH_BACKEND:
+        backend_class = import_string(settings.OFFER_SEARCH_BACKEND)
+    else:
+        backend_class = VENDOR_BACKENDS.get(
+            connection.vendor, LikeSearchBackend
+        )
+    return backend_class()
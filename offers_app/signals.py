@@ -0,0 +1,133 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from core.renditions import (
+    renditions_updated,
+    schedule_renditions,
+    schedule_renditions_cleanup
+)
+from offers_app.cache import bump_catalogue_version
+from offers_app.models import Offer, OfferDetail
+from profiles_app.models import Profile
+from offers_app.search import get_search_backend
+from offers_app.suggest import suggest_index
+
+
+# Get the offer of a detail without loading it from the database
+def get_detail_offer(detail):
+    if OfferDetail.offer.is_cached(detail):
+        return detail.offer
+    return Offer(pk=detail.offer_id)
+
+
+@receiver(post_save, sender=OfferDetail)
+def refresh_summary_on_save(sender, instance, **kwargs):
+    """
+    Keep the offer summary in sync when a detail is created or updated.
+    """
+    get_detail_offer(instance).refresh_summary()
+
+
+@receiver(post_delete, sender=OfferDetail)
+def refresh_summary_on_delete(sender, instance, origin=None, **kwargs):
+    """
+    Keep the offer summary in sync when a detail is deleted.
+    Details removed by deleting their offer need no refresh.
+    """
+    if isinstance(origin, OfferDetail) or (
+        getattr(origin, 'model', None) is OfferDetail
+    ):
+        get_detail_offer(instance).refresh_summary()
+
+
+@receiver(post_save, sender=Offer)
+def index_offer_on_save(sender, instance, update_fields=None, **kwargs):
+    """
+    Keep the search index in sync when an offer is saved.
+    """
+    if update_fields and not {'title', 'description'} & set(update_fields):
+        return
+    get_search_backend().index(instance)
+
+
+@receiver(post_delete, sender=Offer)
+def remove_offer_on_delete(sender, instance, **kwargs):
+    """
+    Remove deleted offers from the search index.
+    """
+    get_search_backend().remove(instance.pk)
+
+
+# Apply a change to a built autocomplete index once it is committed,
+# so rolled back writes never reach it
+def update_suggest_index_on_commit(change, *args):
+    def apply():
+        if suggest_index.built:
+            change(*args)
+    transaction.on_commit(apply)
+
+
+@receiver(post_save, sender=Offer)
+def update_suggest_index_on_save(sender, instance, **kwargs):
+    """
+    Keep a built autocomplete index in sync when an offer is saved.
+    """
+    update_suggest_index_on_commit(
+        suggest_index.update, instance.pk, instance.title
+    )
+
+
+@receiver(post_delete, sender=Offer)
+def update_suggest_index_on_delete(sender, instance, **kwargs):
+    """
+    Remove deleted offers from a built autocomplete index.
+    """
+    update_suggest_index_on_commit(suggest_index.remove, instance.pk)
+
+
+@receiver(post_save, sender=Offer)
+@receiver(post_delete, sender=Offer)
+@receiver(post_save, sender=OfferDetail)
+@receiver(post_delete, sender=OfferDetail)
+def invalidate_catalogue_on_write(sender, **kwargs):
+    """
+    Invalidate cached catalogue responses on every offer or detail write.
+    """
+    bump_catalogue_version()
+
+
+@receiver(post_save, sender=Profile)
+def invalidate_catalogue_on_profile_save(sender, **kwargs):
+    """
+    Invalidate cached catalogue responses, which include creator names.
+    """
+    bump_catalogue_version()
+
+
+@receiver(post_save, sender=Offer)
+def render_image_on_save(sender, instance, **kwargs):
+    """
+    Render the image renditions in the background after a new image
+    was saved.
+    """
+    schedule_renditions(instance, 'image', 'image_renditions')
+
+
+@receiver(post_delete, sender=Offer)
+def delete_image_renditions_on_delete(sender, instance, **kwargs):
+    """
+    Delete the image renditions of deleted offers.
+    """
+    schedule_renditions_cleanup(instance, 'image', 'image_renditions')
+
+
+@receiver(renditions_updated, sender=Offer)
+def touch_offer_on_renditions(sender, pk, **kwargs):
+    """
+    Mark the offer as updated and invalidate cached catalogue responses
+    once its renditions are stored.
+    """
+    Offer.objects.filter(pk=pk).update(updated_at=timezone.now())
+    bump_catalogue_version()
@@ -0,0 +1,403 @@
+import heapq
+import math
+import re
+import threading
+import time
+import unicodedata
+from bisect import bisect_left, insort
+from collections import Counter, defaultdict
+from operator import itemgetter
+
+from django.conf import settings
+from django.utils import timezone
+
+from offers_app.models import Offer
+
+
+def normalize_words(text):
+    """
+    Split text into lowercase words without diacritics.
+    """
+    text = unicodedata.normalize('NFKD', text or '').lower()
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return re.findall(r'\w+', text)
+
+
+def word_trigrams(word, pad_end=True):
+    """
+    Return the trigrams of a word, padded like pg_trgm so short words
+    and word starts produce trigrams too.
+    """
+    padded = f'  {word} ' if pad_end else f'  {word}'
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(first, second, limit, prefix=False):
+    """
+    Optimal string alignment distance between two words, giving up with
+    limit + 1 as soon as the distance exceeds the limit. With prefix set,
+    return the distance between first and the closest prefix of second.
+    """
+    if prefix:
+        second = second[:len(first) + limit]
+    elif abs(len(first) - len(second)) > limit:
+        return limit + 1
+    previous2 = None
+    previous = list(range(len(second) + 1))
+    for i, first_char in enumerate(first, 1):
+        current = [i] + [0] * len(second)
+        for j, second_char in enumerate(second, 1):
+            cost = first_char != second_char
+            current[j] = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + cost
+            )
+            if (
+                previous2 is not None and i > 1 and j > 1
+                and first_char == second[j - 2]
+                and first[i - 2] == second_char
+            ):
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    if prefix:
+        return min(previous[max(0, len(first) - limit):])
+    return previous[-1]
+
+
+class TitleSuggestIndex:
+    """
+    In-memory autocomplete index over offer titles.
+    Words are kept in a sorted array for prefix lookups and in trigram
+    postings for typo tolerant lookups. The offers of each word are
+    kept in ranking order, so lookups stop after the best matches. The
+    index is built on first use and refreshed incrementally from
+    signals and from changed rows.
+    """
+    max_candidates = 500
+    max_fuzzy_checks = 50
+    # Offers read in ranking order before intersecting all matches
+    max_streamed = 200
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.reset()
+
+    # Drop all data so the next lookup rebuilds the index
+    def reset(self):
+        with self.lock:
+            self.built = False
+            self.titles = {}
+            self.offer_words = {}
+            # Ranking keys of offers without typos
+            self.offer_keys = {}
+            self.words = []
+            # Offers of each word as a set and as sorted
+            # (title length, id) pairs
+            self.word_ids = defaultdict(set)
+            self.word_offers = defaultdict(list)
+            self.trigram_words = defaultdict(set)
+            self.synced_at = None
+            self.checked_at = 0
+
+    def build(self):
+        with self.lock:
+            self.reset()
+            self.synced_at = timezone.now()
+            for offer_id, title in Offer.objects.values_list('id', 'title'):
+                self.add(offer_id, title)
+            self.built = True
+            self.checked_at = time.monotonic()
+
+    # Pick up rows changed or deleted by other processes since the last
+    # sync. Only offers indexed before the ids are read can be missing,
+    # later ones were added after their commit.
+    def refresh(self):
+        with self.lock:
+            synced_at = timezone.now()
+            changed = Offer.objects.filter(
+                updated_at__gte=self.synced_at
+            ).values_list('id', 'title')
+            for offer_id, title in changed:
+                self.update(offer_id, title)
+            self.synced_at = synced_at
+            self.checked_at = time.monotonic()
+            indexed = set(self.titles)
+        ids = set(Offer.objects.values_list('id', flat=True))
+        with self.lock:
+            for offer_id in indexed - ids:
+                self.remove(offer_id)
+
+    def ensure_fresh(self):
+        if not self.built:
+            self.build()
+        elif (
+            time.monotonic() - self.checked_at
+            > settings.OFFER_SUGGEST_REFRESH_SECONDS
+        ):
+            self.refresh()
+
+    def add(self, offer_id, title):
+        with self.lock:
+            words = set(normalize_words(title))
+            self.titles[offer_id] = title
+            self.offer_words[offer_id] = words
+            self.offer_keys[offer_id] = key = (len(title), offer_id)
+            for word in words:
+                if word not in self.word_offers:
+                    insort(self.words, word)
+                    for trigram in word_trigrams(word):
+                        self.trigram_words[trigram].add(word)
+                self.word_ids[word].add(offer_id)
+                insort(self.word_offers[word], key)
+
+    def remove(self, offer_id):
+        with self.lock:
+            if self.titles.pop(offer_id, None) is None:
+                return
+            key = self.offer_keys.pop(offer_id)
+            for word in self.offer_words.pop(offer_id):
+                offers = self.word_offers[word]
+                del offers[bisect_left(offers, key)]
+                self.word_ids[word].discard(offer_id)
+                if offers:
+                    continue
+                del self.word_offers[word]
+                del self.word_ids[word]
+                del self.words[bisect_left(self.words, word)]
+                for trigram in word_trigrams(word):
+                    self.trigram_words[trigram].discard(word)
+
+    def update(self, offer_id, title):
+        with self.lock:
+            if self.titles.get(offer_id) == title:
+                return
+            self.remove(offer_id)
+            self.add(offer_id, title)
+
+    # Allowed typos grow with the length of the typed word
+    def max_typos(self, token):
+        if len(token) >= 7:
+            return 2
+        if len(token) >= 4:
+            return 1
+        return 0
+
+    def prefix_words(self, token):
+        index = bisect_left(self.words, token)
+        while index < len(self.words) and self.words[index].startswith(token):
+            yield self.words[index]
+            index += 1
+
+    # Map words matching a typed token to their typo count, with typos
+    # only when fuzzy is set
+    def match_token(self, token, is_prefix, fuzzy=True):
+        matches = {}
+        if is_prefix:
+            for word in self.prefix_words(token):
+                matches[word] = 0
+                if len(matches) >= self.max_candidates:
+                    return matches
+        elif token in self.word_offers:
+            matches[token] = 0
+        limit = self.max_typos(token)
+        if not fuzzy or not limit:
+            return matches
+        trigrams = sorted(
+            (self.trigram_words.get(trigram, set())
+             for trigram in word_trigrams(token, pad_end=not is_prefix)),
+            key=len
+        )
+        needed = max(1, len(trigrams) - 3 * limit)
+        # A word sharing needed trigrams is in one of the rarest
+        # len(trigrams) - needed + 1, counting stops early once words
+        # missing from the rarest ones cannot be among the most similar
+        counts = Counter()
+        for seen, words in enumerate(trigrams[:len(trigrams) - needed + 1]):
+            counts.update(words)
+            similar = self.most_similar(counts, trigrams[seen + 1:], needed)
+            if (
+                len(similar) == self.max_fuzzy_checks
+                and len(trigrams) - seen - 1 < -similar[-1][0]
+            ):
+                break
+        for shared, word in similar:
+            if word in matches:
+                continue
+            distance = edit_distance(token, word, limit, prefix=is_prefix)
+            if distance <= limit:
+                matches[word] = distance
+        return matches
+
+    def most_similar(self, counts, others, needed):
+        """
+        Return up to max_fuzzy_checks (-shared trigrams, word) pairs of
+        the counted words, most shared first. Words are looked up in the
+        other trigrams only while they can still be among them.
+        """
+        similar = []
+        for word, shared in counts.most_common():
+            most = shared + len(others)
+            if most < needed or (
+                len(similar) == self.max_fuzzy_checks
+                and most < -similar[-1][0]
+            ):
+                break
+            shared += sum(word in words for words in others)
+            if shared >= needed:
+                insort(similar, (-shared, word))
+                del similar[self.max_fuzzy_checks:]
+        return similar
+
+    def suggest(self, query, limit=10):
+        """
+        Return up to limit (id, title) pairs whose titles match every
+        query word, the last one as a prefix, with fewest typos first.
+        Typos are only looked for when exact matches fill fewer than
+        limit results, since they always rank after them.
+        """
+        tokens = normalize_words(query)
+        if not tokens:
+            return []
+        self.ensure_fresh()
+        with self.lock:
+            best = self.find_best(tokens, limit, fuzzy=False)
+            if len(best) < limit:
+                best = self.find_best(tokens, limit, fuzzy=True)
+            return [
+                (offer_id, self.titles[offer_id])
+                for typos, length, offer_id in best
+            ]
+
+    def find_best(self, tokens, limit, fuzzy):
+        """
+        Return the best (typos, title length, id) keys of offers matching
+        every token.
+        """
+        token_matches = [
+            self.match_token(token, index == len(tokens) - 1, fuzzy)
+            for index, token in enumerate(tokens)
+        ]
+        if not all(token_matches):
+            return []
+        sizes = sorted(
+            (
+                (sum(len(self.word_ids[word]) for word in matches), matches)
+                for matches in token_matches
+            ),
+            key=itemgetter(0)
+        )
+        token_matches = [matches for size, matches in sizes]
+        # Streaming finds about share of the offers read to match all
+        # tokens, assuming words are independent, and is skipped when
+        # it would likely give up before finding limit of them
+        share = math.prod(size / len(self.titles) for size, _ in sizes[1:])
+        best = None
+        if 2 * limit <= share * self.max_streamed:
+            best = self.stream_best(token_matches, limit)
+        if best is None:
+            best = self.rank_matching(token_matches, limit)
+        return best
+
+    def stream_best(self, token_matches, limit, matching=None):
+        """
+        Read the offers of the token with the fewest of them in key
+        order, stopping once no later offer can rank among the best.
+        Without the set of matching offers, returns None when the best
+        are not found within max_streamed offers.
+        """
+        lead, *others = token_matches
+        candidates = heapq.merge(*[
+            rank_offers(self.word_offers[word], typos)
+            for word, typos in lead.items()
+        ])
+        # Typos the other tokens add at least
+        floor = sum(min(matches.values()) for matches in others)
+        best = []
+        seen = set()
+        for count, (typos, length, offer_id) in enumerate(candidates):
+            # Keys only grow, so no later offer can rank better
+            if (
+                len(best) == limit
+                and (typos + floor, length, offer_id) >= best[-1]
+            ):
+                break
+            if matching is None:
+                if count == self.max_streamed:
+                    return None
+            elif offer_id not in matching:
+                continue
+            if offer_id in seen:
+                continue
+            seen.add(offer_id)
+            words = self.offer_words[offer_id]
+            for matches in others:
+                token_typos = get_typos(matches, words)
+                if token_typos is None:
+                    break
+                typos += token_typos
+            else:
+                insort(best, (typos, length, offer_id))
+                del best[limit:]
+        return best
+
+    # Intersect the offers of all tokens and rank every match
+    def rank_matching(self, token_matches, limit):
+        matching = None
+        for matches in token_matches:
+            postings = [self.word_ids[word] for word in matches]
+            if matching is None:
+                # The postings of a single word are used without copying
+                matching = (
+                    postings[0] if len(postings) == 1
+                    else set().union(*postings)
+                )
+                continue
+            # Intersecting reads the smaller set, checking an offer's
+            # words costs about as much as ten such reads
+            if len(matching) * 10 < sum(
+                min(len(matching), len(offers)) for offers in postings
+            ):
+                matching = {
+                    offer_id for offer_id in matching
+                    if not self.offer_words[offer_id].isdisjoint(matches)
+                }
+            else:
+                matching = set().union(
+                    *[matching & offers for offers in postings]
+                )
+        fuzzy = [matches for matches in token_matches if any(matches.values())]
+        if not fuzzy:
+            best = heapq.nsmallest(
+                limit, map(self.offer_keys.__getitem__, matching)
+            )
+            return [(0, length, offer_id) for length, offer_id in best]
+        # Many typo matches are ranked faster by reading them in key order
+        if len(matching) > self.max_streamed:
+            return self.stream_best(token_matches, limit, matching)
+        keys = []
+        for offer_id in matching:
+            words = self.offer_words[offer_id]
+            keys.append((
+                sum(get_typos(matches, words) for matches in fuzzy),
+                *self.offer_keys[offer_id]
+            ))
+        return heapq.nsmallest(limit, keys)
+
+
+# Ranking keys of the offers of a word matched with the given typos
+def rank_offers(offers, typos):
+    for length, offer_id in offers:
+        yield typos, length, offer_id
+
+
+# Fewest typos of a token among the words of an offer, None without match
+def get_typos(matches, words):
+    if words.isdisjoint(matches):
+        return None
+    return min(matches[word] for word in words if word in matches)
+
+
+suggest_index = TitleSuggestIndex()
@@ -1,8 +1,13 @@
+from unittest import mock
+
+from django.db import IntegrityError
 from django.test import TestCase
 from django.contrib.auth import get_user_model
 
 from rest_framework.test import APIClient
 
+from offers_app.models import Offer, OfferDetail
+
 
 class OfferCreateTests(TestCase):
     """
@@ -78,6 +83,67 @@ class OfferCreateTests(TestCase):
             self.assertIn('features', detail)
             self.assertIn('offer_type', detail)
 
+    def get_offer_data(self):
+        return {
+            "title": "Logo Paket",
+            "description": "Logos für Unternehmen.",
+            "details": [
+                {
+                    "title": title,
+                    "revisions": 1,
+                    "delivery_time_in_days": days,
+                    "price": price,
+                    "features": ["Logo Design"],
+                    "offer_type": offer_type
+                }
+                for title, days, price, offer_type in (
+                    ("Basic", 5, 100, "basic"),
+                    ("Standard", 7, 200, "standard"),
+                    ("Premium", 3, 500, "premium"),
+                )
+            ]
+        }
+
+    # Test cases inserting the details in bulk without re-reading them
+    def test_create_offer_queries_and_summary(self):
+        self.client.force_authenticate(user=self.user)
+        # Savepoint, offer, two search index writes, details, savepoint
+        # release and the creator profile for the response
+        with self.assertNumQueries(7):
+            response = self.client.post(
+                '/api/offers/', self.get_offer_data(), format='json'
+            )
+        self.assertEqual(response.status_code, 201)
+        data = response.json()
+        offer = Offer.objects.get(pk=data['id'])
+        self.assertEqual(
+            (offer.min_price, offer.max_price, offer.min_delivery_time),
+            (100, 500, 3)
+        )
+        self.assertEqual(data['min_price'], 100)
+        self.assertEqual(data['min_delivery_time'], 3)
+        self.assertEqual(
+            [detail['id'] for detail in data['details']],
+            list(offer.details.order_by('id').values_list('id', flat=True))
+        )
+        self.assertEqual(
+            [detail['offer_type'] for detail in data['details']],
+            ['basic', 'standard', 'premium']
+        )
+
+    # Test cases rolling back the offer when the details fail
+    def test_create_offer_is_atomic(self):
+        self.client = APIClient(raise_request_exception=False)
+        self.client.force_authenticate(user=self.user)
+        with mock.patch.object(
+            OfferDetail.objects, 'bulk_create', side_effect=IntegrityError
+        ):
+            response = self.client.post(
+                '/api/offers/', self.get_offer_data(), format='json'
+            )
+        self.assertEqual(response.status_code, 500)
+        self.assertFalse(Offer.objects.exists())
+
     # Test cases creating an offer with fewer than three details
     def test_create_offer_with_too_few_details(self):
         self.client.force_authenticate(user=self.user)
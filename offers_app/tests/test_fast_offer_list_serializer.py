@@ -0,0 +1,118 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+
+from rest_framework.test import APIRequestFactory, APITestCase
+
+from offers_app.api.serializers import (
+    FastOfferListSerializer,
+    OfferListSerializer
+)
+from offers_app.api.views import OfferListView
+from offers_app.models import Offer, OfferDetail
+from profiles_app.models import Profile
+
+
+@override_settings(OFFER_LIST_CACHE_TIMEOUT=0)
+class FastOfferListSerializerTest(APITestCase):
+    """
+    Test cases comparing FastOfferListSerializer with OfferListSerializer.
+    """
+    def setUp(self):
+        User = get_user_model()
+        self.with_profile = User.objects.create_user(
+            username='profiled', password='testpass',
+            first_name='User', last_name='Name', user_type='business'
+        )
+        Profile.objects.create(
+            user=self.with_profile, username='profiled',
+            first_name='Max', last_name='Mustermann',
+            email='max@example.com', type='business'
+        )
+        self.empty_profile = User.objects.create_user(
+            username='empty', password='testpass',
+            first_name='Erika', user_type='business'
+        )
+        Profile.objects.create(
+            user=self.empty_profile, username='empty',
+            email='empty@example.com', type='business'
+        )
+        self.without_profile = User.objects.create_user(
+            username='plain', password='testpass',
+            first_name='Plain', last_name='User', user_type='business'
+        )
+        for index, user in enumerate([
+            self.with_profile, self.empty_profile, self.without_profile
+        ] * 3):
+            offer = Offer.objects.create(
+                user=user,
+                title=f'Angebot {index}',
+                description=f'Beschreibung für Angebot {index}',
+                image=f'offers/image-{index}.png' if index % 2 else None
+            )
+            for offer_type, price in (
+                ('basic', 100 + index), ('standard', 200), ('premium', 50)
+            ):
+                OfferDetail.objects.create(
+                    offer=offer, title=offer_type, revisions=1,
+                    delivery_time_in_days=index + 1, price=price,
+                    features=['Feature'], offer_type=offer_type
+                )
+        Offer.objects.create(
+            user=self.with_profile, title='Ohne Details', description='Leer'
+        )
+
+    def get_with(self, serializer_class, url):
+        with mock.patch.object(
+            OfferListView, 'list_serializer_class', serializer_class
+        ):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    # Test cases for identical responses through the list endpoint
+    def test_endpoint_output_matches(self):
+        for url in (
+            '/api/offers/',
+            '/api/offers/?page=2&page_size=4',
+            '/api/offers/?ordering=-min_price',
+            '/api/offers/?search=angebot&page_size=20',
+            f'/api/offers/?creator_id={self.without_profile.id}',
+            '/api/offers/?min_price=60&max_delivery_time=5',
+            '/api/offers/?pagination=cursor&ordering=-updated_at',
+        ):
+            with self.subTest(url=url):
+                fast = self.get_with(FastOfferListSerializer, url)
+                full = self.get_with(OfferListSerializer, url)
+                self.assertEqual(fast, full)
+
+    # Test cases for identical output when following cursor links
+    def test_cursor_pages_match(self):
+        fast = self.get_with(
+            FastOfferListSerializer,
+            '/api/offers/?pagination=cursor&page_size=3'
+        )
+        full = self.get_with(
+            OfferListSerializer, '/api/offers/?pagination=cursor&page_size=3'
+        )
+        self.assertEqual(fast['next'], full['next'])
+        self.assertEqual(
+            self.get_with(FastOfferListSerializer, fast['next']),
+            self.get_with(OfferListSerializer, full['next'])
+        )
+
+    # Test cases for identical output with and without a request
+    def test_serializer_output_matches(self):
+        queryset = Offer.objects.order_by('id')
+        request = APIRequestFactory().get('/api/offers/')
+        for context in ({}, {'request': request}):
+            with self.subTest(request='request' in context):
+                fast = FastOfferListSerializer(
+                    FastOfferListSerializer.prepare_queryset(queryset),
+                    many=True, context=context
+                ).data
+                full = OfferListSerializer(
+                    queryset, many=True, context=context
+                ).data
+                self.assertEqual(fast, [dict(offer) for offer in full])
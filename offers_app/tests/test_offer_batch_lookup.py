@@ -0,0 +1,113 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from rest_framework.test import APITestCase
+
+from offers_app.api.serializers import (
+    FastOfferListSerializer,
+    OfferListSerializer
+)
+from offers_app.api.views import OfferListView
+from offers_app.models import Offer, OfferDetail
+
+
+@override_settings(OFFER_LIST_CACHE_TIMEOUT=0)
+class OfferBatchLookupTest(APITestCase):
+    """
+    Test cases for looking up offers and offer details with ?ids=.
+    """
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username='business',
+            password='testpass',
+            user_type='business'
+        )
+        self.offers = []
+        self.details = []
+        for index in range(3):
+            offer = Offer.objects.create(
+                user=self.user, title=f'Angebot {index}', description='Text'
+            )
+            self.offers.append(offer)
+            for offer_type in ('basic', 'premium'):
+                self.details.append(OfferDetail.objects.create(
+                    offer=offer, title=f'{offer_type} {index}', revisions=1,
+                    delivery_time_in_days=3, price=100 + index, features=[],
+                    offer_type=offer_type
+                ))
+        self.client.force_authenticate(user=self.user)
+
+    def get_ids(self, objects):
+        return ','.join(str(obj.id) for obj in objects)
+
+    # Test cases for the requested order and the missing ids
+    def test_offers_in_requested_order(self):
+        offers = [self.offers[2], self.offers[0], self.offers[1]]
+        ids = f'{self.get_ids(offers)},999999,{offers[0].id}'
+        for serializer in (FastOfferListSerializer, OfferListSerializer):
+            with mock.patch.object(
+                OfferListView, 'list_serializer_class', serializer
+            ):
+                response = self.client.get('/api/offers/', {'ids': ids})
+            self.assertEqual(response.status_code, 200)
+            data = response.json()
+            self.assertEqual(
+                [offer['id'] for offer in data['results']],
+                [offer.id for offer in offers]
+            )
+            self.assertEqual(data['missing'], [999999])
+
+    # Test cases for the list filters applying to the batch
+    def test_offers_filtered(self):
+        response = self.client.get('/api/offers/', {
+            'ids': self.get_ids(self.offers), 'min_price': 101
+        })
+        self.assertEqual(
+            [offer['id'] for offer in response.json()['results']],
+            [offer.id for offer in self.offers[1:]]
+        )
+        self.assertEqual(response.json()['missing'], [self.offers[0].id])
+
+    # Test cases for offer details with sparse fields in one query
+    def test_offer_details(self):
+        details = self.details[::-1]
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/api/offerdetails/', {
+                'ids': self.get_ids(details), 'fields': 'id,price'
+            })
+        self.assertEqual(len(context.captured_queries), 1)
+        self.assertIn(' IN (', context.captured_queries[0]['sql'])
+        self.assertEqual(response.json(), {
+            'results': [
+                {'id': detail.id, 'price': detail.price} for detail in details
+            ],
+            'missing': [],
+        })
+
+    # Test cases for rejecting missing, invalid and too many ids
+    @override_settings(BATCH_LOOKUP_MAX_IDS=2)
+    def test_invalid_ids(self):
+        cases = (
+            ('/api/offerdetails/', {}, 'This parameter is required.'),
+            ('/api/offers/', {'ids': '1,a'},
+             'Must be a comma separated list of integers.'),
+            ('/api/offers/', {'ids': ','}, 'At least one id is required.'),
+            ('/api/offerdetails/', {'ids': '1,2,3'},
+             'At most 2 ids are allowed.'),
+        )
+        for path, params, message in cases:
+            response = self.client.get(path, params)
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.json(), {'ids': message})
+
+    # Test cases for the authentication on offer details
+    def test_offer_details_unauthenticated(self):
+        self.client.force_authenticate(user=None)
+        response = self.client.get(
+            '/api/offerdetails/', {'ids': self.details[0].id}
+        )
+        self.assertEqual(response.status_code, 401)
@@ -0,0 +1,126 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import override_settings
+
+from rest_framework.test import APITestCase
+
+from offers_app.models import Offer, OfferDetail
+
+
+class OfferConditionalGetTest(APITestCase):
+    """
+    Test cases for ETag and Last-Modified handling of the offer endpoints.
+    """
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            username='business',
+            password='testpass',
+            user_type='business'
+        )
+        self.offer = Offer.objects.create(
+            user=self.user, title='Logo Design', description='Logo'
+        )
+        self.detail = OfferDetail.objects.create(
+            offer=self.offer, title='Basic', revisions=1,
+            delivery_time_in_days=3, price=100, features=[],
+            offer_type='basic'
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def tearDown(self):
+        cache.clear()
+
+    def assertRevalidates(self, url, queries=1):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        self.assertTrue(etag.startswith('"'))
+        self.assertIn('Last-Modified', response)
+        # validator only, no serialization queries
+        with self.assertNumQueries(queries):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        return etag
+
+    # Test cases for revalidating each endpoint
+    def test_not_modified(self):
+        # Cached list pages revalidate without a query
+        for url, queries in (
+            ('/api/offers/', 0),
+            (f'/api/offers/{self.offer.id}/', 1),
+            (f'/api/offerdetails/{self.detail.id}/', 1),
+        ):
+            with self.subTest(url=url):
+                self.assertRevalidates(url, queries)
+
+    # Test cases for detail writes changing all validators
+    def test_detail_change_modifies(self):
+        urls = (
+            '/api/offers/',
+            f'/api/offers/{self.offer.id}/',
+            f'/api/offerdetails/{self.detail.id}/',
+        )
+        etags = [
+            self.assertRevalidates(url, queries)
+            for url, queries in zip(urls, (0, 1, 1))
+        ]
+        self.detail.price = 120
+        self.detail.save()
+        for url, etag in zip(urls, etags):
+            with self.subTest(url=url):
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 200)
+                self.assertNotEqual(response['ETag'], etag)
+
+    # Test cases for list validators following filters and deletions
+    def test_list_validator(self):
+        etag = self.assertRevalidates('/api/offers/', queries=0)
+        response = self.client.get(
+            '/api/offers/?min_price=50', HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, 200)
+        other = Offer.objects.create(
+            user=self.user, title='Website', description='Web'
+        )
+        etag = self.client.get('/api/offers/')['ETag']
+        Offer.objects.filter(pk=other.pk).delete()
+        response = self.client.get('/api/offers/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        # Without the page cache the filtered set is checked
+        with override_settings(OFFER_LIST_CACHE_TIMEOUT=0):
+            self.assertRevalidates('/api/offers/', queries=1)
+
+    # Test cases for If-Modified-Since
+    def test_if_modified_since(self):
+        url = f'/api/offers/{self.offer.id}/'
+        last_modified = self.client.get(url)['Last-Modified']
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+        response = self.client.get(
+            url, HTTP_IF_MODIFIED_SINCE='Mon, 01 Jan 2001 00:00:00 GMT'
+        )
+        self.assertEqual(response.status_code, 200)
+        # The list only revalidates through its ETag
+        last_modified = self.client.get('/api/offers/')['Last-Modified']
+        response = self.client.get(
+            '/api/offers/', HTTP_IF_MODIFIED_SINCE=last_modified
+        )
+        self.assertEqual(response.status_code, 200)
+
+    # Test cases for permissions running before validation
+    def test_unauthenticated(self):
+        etag = self.client.get(f'/api/offers/{self.offer.id}/')['ETag']
+        self.client.force_authenticate(user=None)
+        response = self.client.get(
+            f'/api/offers/{self.offer.id}/', HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, 401)
+
+    # Test cases for missing objects
+    def test_missing(self):
+        self.assertEqual(self.client.get('/api/offers/9999/').status_code, 404)
+        self.assertEqual(
+            self.client.get('/api/offerdetails/9999/').status_code, 404
+        )
@@ -0,0 +1,174 @@
+import json
+from base64 import urlsafe_b64encode
+
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+
+from rest_framework.test import APITestCase
+
+from offers_app.models import Offer, OfferDetail
+
+
+class OfferCursorPaginationTest(APITestCase):
+    """
+    Test cases for the opt-in keyset pagination of the offer list.
+    """
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username='business',
+            password='testpass',
+            user_type='business'
+        )
+        # Few distinct prices so the id tiebreak matters
+        for index in range(13):
+            offer = Offer.objects.create(
+                user=self.user,
+                title=f'Offer {index}',
+                description=f'Description {index}'
+            )
+            OfferDetail.objects.create(
+                offer=offer,
+                title='Basic',
+                revisions=1,
+                delivery_time_in_days=index % 4 + 1,
+                price=(index % 3 + 1) * 100,
+                features=[],
+                offer_type='basic'
+            )
+        # An offer without details has no summary values
+        Offer.objects.create(
+            user=self.user, title='Empty', description='No details'
+        )
+
+    # Follow the next links and collect all offer ids
+    def walk_forward(self, url):
+        ids, pages = [], []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            data = response.json()
+            pages.append(data)
+            ids.extend(offer['id'] for offer in data['results'])
+            url = data['next']
+        return ids, pages
+
+    # Follow the previous links and collect all offer ids
+    def walk_backward(self, url):
+        ids = []
+        while url:
+            data = self.client.get(url).json()
+            ids = [offer['id'] for offer in data['results']] + ids
+            url = data['previous']
+        return ids
+
+    def expected_ids(self, ordering):
+        field = ordering.lstrip('-')
+        offers = list(Offer.objects.all())
+        # NULL values come last in either direction, ids break ties
+        present = [offer for offer in offers if getattr(offer, field) is not None]
+        present.sort(key=lambda offer: offer.id)
+        present.sort(
+            key=lambda offer: getattr(offer, field),
+            reverse=ordering.startswith('-')
+        )
+        missing = sorted(
+            (offer for offer in offers if getattr(offer, field) is None),
+            key=lambda offer: offer.id
+        )
+        return [offer.id for offer in present + missing]
+
+    # Test cases for walking all pages for each ordering
+    def test_pages_are_complete_and_stable(self):
+        for ordering in (
+            'id', '-id', 'min_price', '-min_price',
+            'created_at', '-updated_at'
+        ):
+            with self.subTest(ordering=ordering):
+                url = (
+                    f'/api/offers/?pagination=cursor&page_size=4'
+                    f'&ordering={ordering}'
+                )
+                ids, pages = self.walk_forward(url)
+                self.assertEqual(ids, self.expected_ids(ordering))
+                self.assertIsNone(pages[0]['previous'])
+                last_page_url = pages[-1]['previous']
+                previous_ids = self.walk_backward(last_page_url)
+                self.assertEqual(
+                    previous_ids + [o['id'] for o in pages[-1]['results']],
+                    ids
+                )
+
+    # Test cases for the default ordering
+    def test_default_ordering(self):
+        ids, pages = self.walk_forward('/api/offers/?pagination=cursor')
+        self.assertEqual(ids, sorted(ids))
+        self.assertEqual(len(pages), 3)
+
+    # Test cases for the response shape
+    def test_response_structure(self):
+        response = self.client.get('/api/offers/?pagination=cursor')
+        data = response.json()
+        self.assertEqual(set(data), {'next', 'previous', 'results'})
+        self.assertEqual(len(data['results']), 6)
+        self.assertIn('cursor=', data['next'])
+
+    # Test cases for combining filters with cursor pagination
+    def test_filters_apply(self):
+        ids, pages = self.walk_forward(
+            '/api/offers/?pagination=cursor&page_size=2&min_price=300'
+        )
+        self.assertEqual(
+            ids,
+            list(
+                Offer.objects.filter(min_price__gte=300)
+                .order_by('id').values_list('id', flat=True)
+            )
+        )
+
+    # Test cases for the maximum page size
+    @override_settings(CURSOR_PAGINATION_MAX_PAGE_SIZE=5)
+    def test_max_page_size(self):
+        response = self.client.get(
+            '/api/offers/?pagination=cursor&page_size=50'
+        )
+        self.assertEqual(len(response.json()['results']), 5)
+
+    # Test cases for invalid cursors
+    def test_invalid_cursor(self):
+        response = self.client.get('/api/offers/?cursor=not-a-cursor')
+        self.assertEqual(response.status_code, 404)
+
+    # Test cases for tampered cursors with values of the wrong type
+    def test_tampered_cursor(self):
+        def cursor(position):
+            payload = json.dumps({'p': position, 'r': False}).encode()
+            return urlsafe_b64encode(payload).decode()
+        valid = self.client.get(
+            '/api/offers/?pagination=cursor&ordering=-updated_at&page_size=2'
+        ).json()['next']
+        self.assertEqual(self.client.get(valid).status_code, 200)
+        for position in (
+            [[1], 5], [{'a': 1}, 5], ['not a date', 5], [5, 5],
+            ['2024-01-01T00:00:00+00:00', 'x'], [None, 5],
+            ['2024-01-01T00:00:00+00:00', True],
+        ):
+            with self.subTest(position=position):
+                response = self.client.get(
+                    '/api/offers/?ordering=-updated_at&cursor='
+                    + cursor(position)
+                )
+                self.assertEqual(response.status_code, 404)
+                self.assertEqual(
+                    response.json(), {'detail': 'Invalid cursor.'}
+                )
+        # NULL is a valid value of the nullable summary keys
+        response = self.client.get(
+            '/api/offers/?ordering=min_price&cursor=' + cursor([None, 1])
+        )
+        self.assertEqual(response.status_code, 200)
+
+    # Test cases for page number mode staying the default
+    def test_page_number_mode_unchanged(self):
+        data = self.client.get('/api/offers/?page=2').json()
+        self.assertEqual(data['count'], 14)
+        self.assertIn('previous', data)
@@ -0,0 +1,99 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.http import HttpRequest
+from django.test import override_settings
+from django.urls import reverse
+
+from rest_framework.test import APITestCase
+
+from offers_app.api.views import OfferListView
+from offers_app.api.serializers import (
+    FastOfferListSerializer,
+    OfferListSerializer
+)
+from offers_app.models import Offer, OfferDetail
+
+
+@override_settings(OFFER_LIST_CACHE_TIMEOUT=0)
+class OfferDetailUrlTest(APITestCase):
+    """
+    Test cases for the offer detail links in offer responses.
+    """
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username='business',
+            password='testpass',
+            user_type='business'
+        )
+        for index in range(3):
+            offer = Offer.objects.create(
+                user=self.user, title=f'Angebot {index}', description='Text'
+            )
+            for offer_type in ('basic', 'standard', 'premium'):
+                OfferDetail.objects.create(
+                    offer=offer, title=offer_type, revisions=1,
+                    delivery_time_in_days=3, price=100, features=[],
+                    offer_type=offer_type
+                )
+        self.offer = offer
+        self.client.force_authenticate(user=self.user)
+
+    def get_urls(self, path, params=None):
+        response = self.client.get(path, params)
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        offers = data['results'] if 'results' in data else [data]
+        return [detail['url'] for offer in offers for detail in offer['details']]
+
+    def expected_url(self, detail_id, absolute=True):
+        path = reverse('offer-detail-full', kwargs={'pk': detail_id})
+        return f'http://testserver{path}' if absolute else path
+
+    # Test cases for absolute URLs built from the route
+    def test_absolute_urls(self):
+        detail = self.offer.details.order_by('id').first()
+        for serializer in (FastOfferListSerializer, OfferListSerializer):
+            with mock.patch.object(
+                OfferListView, 'list_serializer_class', serializer
+            ):
+                urls = self.get_urls('/api/offers/')
+            self.assertEqual(len(urls), 9)
+            self.assertIn(self.expected_url(detail.id), urls)
+        urls = self.get_urls(f'/api/offers/{self.offer.id}/')
+        self.assertEqual(urls[0], self.expected_url(detail.id))
+
+    # Test cases for relative URLs by query option and setting
+    def test_relative_urls(self):
+        detail = self.offer.details.order_by('id').first()
+        expected = self.expected_url(detail.id, absolute=False)
+        for serializer in (FastOfferListSerializer, OfferListSerializer):
+            with mock.patch.object(
+                OfferListView, 'list_serializer_class', serializer
+            ):
+                urls = self.get_urls('/api/offers/', {'urls': 'relative'})
+            self.assertIn(expected, urls)
+        with override_settings(OFFER_DETAIL_ABSOLUTE_URLS=False):
+            urls = self.get_urls(f'/api/offers/{self.offer.id}/')
+            self.assertEqual(urls[0], expected)
+            urls = self.get_urls('/api/offers/', {'urls': 'absolute'})
+            self.assertIn(self.expected_url(detail.id), urls)
+
+    # Test cases for resolving the host once per request
+    def test_prefix_built_once(self):
+        with mock.patch.object(
+            OfferListView, 'list_serializer_class', OfferListSerializer
+        ), mock.patch.object(
+            HttpRequest, 'build_absolute_uri', autospec=True,
+            side_effect=HttpRequest.build_absolute_uri
+        ) as build_absolute_uri:
+            self.get_urls('/api/offers/', {'ordering': 'id'})
+        # Validator, ETag and the detail URL prefix, not one per detail
+        self.assertEqual(build_absolute_uri.call_count, 3)
+
+    # Test cases for separate ETags per URL style
+    def test_etag_depends_on_url_style(self):
+        path = f'/api/offers/{self.offer.id}/'
+        absolute = self.client.get(path)
+        relative = self.client.get(path, {'urls': 'relative'})
+        self.assertNotEqual(absolute['ETag'], relative['ETag'])
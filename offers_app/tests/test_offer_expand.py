@@ -0,0 +1,108 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+
+from rest_framework.test import APITestCase
+
+from offers_app.api.serializers import (
+    FastOfferListSerializer,
+    OfferDetailFullSerializer,
+    OfferListSerializer
+)
+from offers_app.api.views import OfferListView
+from offers_app.models import Offer, OfferDetail
+from profiles_app.models import Profile
+
+
+@override_settings(OFFER_LIST_CACHE_TIMEOUT=0)
+class OfferExpandTest(APITestCase):
+    """
+    Test cases for inlining the full offer details with ?expand=details.
+    """
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username='business',
+            password='testpass',
+            user_type='business'
+        )
+        Profile.objects.create(
+            user=self.user, username='business',
+            email='business@example.com', type='business'
+        )
+        for index in range(3):
+            self.offer = Offer.objects.create(
+                user=self.user, title=f'Angebot {index}', description='Text'
+            )
+            for offer_type, price in (
+                ('basic', 100), ('standard', 200), ('premium', 300)
+            ):
+                OfferDetail.objects.create(
+                    offer=self.offer, title=f'{offer_type} {index}',
+                    revisions=index, delivery_time_in_days=3,
+                    price=price + index, features=['Logo', offer_type],
+                    offer_type=offer_type
+                )
+        self.client.force_authenticate(user=self.user)
+
+    def expected_details(self, offer):
+        return OfferDetailFullSerializer(
+            offer.details.order_by('id'), many=True
+        ).data
+
+    # Test cases for the list with both list serializers
+    def test_list_expand(self):
+        for serializer in (FastOfferListSerializer, OfferListSerializer):
+            with mock.patch.object(
+                OfferListView, 'list_serializer_class', serializer
+            ):
+                response = self.client.get(
+                    '/api/offers/', {'ordering': '-id'}
+                )
+                # validator, count, offers and one details query
+                with self.assertNumQueries(4):
+                    expanded = self.client.get(
+                        '/api/offers/',
+                        {'ordering': '-id', 'expand': 'details'}
+                    )
+            results = expanded.json()['results']
+            self.assertEqual(
+                results[0]['details'], self.expected_details(self.offer)
+            )
+            for plain, full in zip(response.json()['results'], results):
+                self.assertEqual(
+                    [detail['id'] for detail in plain['details']],
+                    [detail['id'] for detail in full['details']]
+                )
+                plain.pop('details')
+                full.pop('details')
+                self.assertEqual(plain, full)
+
+    # Test cases for a single offer
+    def test_retrieve_expand(self):
+        path = f'/api/offers/{self.offer.id}/'
+        # validator, offer and one details query
+        with self.assertNumQueries(3):
+            response = self.client.get(path, {'expand': 'details'})
+        self.assertEqual(
+            response.json()['details'], self.expected_details(self.offer)
+        )
+        self.assertNotEqual(
+            response['ETag'], self.client.get(path)['ETag']
+        )
+
+    # Test cases for expanding together with sparse fieldsets
+    def test_expand_with_fields(self):
+        response = self.client.get(
+            '/api/offers/',
+            {'expand': 'details', 'fields': 'id,details', 'ordering': 'id'}
+        )
+        first = response.json()['results'][0]
+        self.assertEqual(list(first), ['id', 'details'])
+        self.assertEqual(first['details'][0]['title'], 'basic 0')
+
+    # Test cases for rejecting unknown expansions
+    def test_unknown_expand(self):
+        response = self.client.get('/api/offers/', {'expand': 'user'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'expand': 'Cannot expand: user.'})
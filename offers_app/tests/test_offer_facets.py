@@ -0,0 +1,110 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import override_settings
+
+from rest_framework.test import APITestCase
+
+from offers_app.models import Offer, OfferDetail
+
+
+class OfferFacetsTest(APITestCase):
+    """
+    Test cases for the offer facets endpoint.
+    """
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            username='business',
+            password='testpass',
+            user_type='business'
+        )
+        self.other = get_user_model().objects.create_user(
+            username='other',
+            password='testpass',
+            user_type='business'
+        )
+        self.create_offer(self.user, 'Logo Design', [
+            ('basic', 40, 1), ('standard', 120, 3), ('premium', 300, 5)
+        ])
+        self.create_offer(self.user, 'Website Entwicklung', [
+            ('basic', 600, 10), ('premium', 1500, 20)
+        ])
+        self.create_offer(self.other, 'Logo Animation', [
+            ('standard', 80, 4)
+        ])
+        Offer.objects.create(
+            user=self.other, title='Entwurf', description='Entwurf'
+        )
+
+    def tearDown(self):
+        cache.clear()
+
+    def create_offer(self, user, title, details):
+        offer = Offer.objects.create(user=user, title=title, description=title)
+        for offer_type, price, days in details:
+            OfferDetail.objects.create(
+                offer=offer, title=offer_type, revisions=1,
+                delivery_time_in_days=days, price=price, features=[],
+                offer_type=offer_type
+            )
+        return offer
+
+    def counts(self, buckets):
+        return [bucket['count'] for bucket in buckets]
+
+    # Test cases for counting all offers in a single query
+    def test_facets(self):
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/offers/facets/')
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['count'], 4)
+        self.assertEqual(self.counts(data['price']), [1, 1, 0, 0, 1, 0])
+        self.assertEqual(data['price'][0], {'min': 0, 'max': 49, 'count': 1})
+        self.assertIsNone(data['price'][-1]['max'])
+        self.assertEqual(self.counts(data['delivery_time']), [1, 0, 1, 1, 0])
+        self.assertEqual(
+            data['offer_type'], {'basic': 2, 'standard': 2, 'premium': 2}
+        )
+        self.assertEqual(data['creators'], [
+            {'creator_id': self.user.id, 'count': 2},
+            {'creator_id': self.other.id, 'count': 2},
+        ])
+
+    # Test cases for applying the list filters and search
+    def test_filters(self):
+        response = self.client.get(
+            '/api/offers/facets/', {'min_price': 50, 'search': 'logo'}
+        )
+        data = response.json()
+        self.assertEqual(data['count'], 1)
+        self.assertEqual(data['offer_type']['standard'], 1)
+        self.assertEqual(data['creators'], [
+            {'creator_id': self.other.id, 'count': 1}
+        ])
+        response = self.client.get(
+            '/api/offers/facets/', {'creator_id': 'abc'}
+        )
+        self.assertEqual(response.status_code, 400)
+
+    # Test cases for caching per filter set until the catalogue changes
+    def test_cached_until_catalogue_write(self):
+        self.client.get('/api/offers/facets/', {'creator_id': self.user.id})
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                '/api/offers/facets/',
+                {'creator_id': self.user.id, 'ordering': '-id'}
+            )
+        self.assertEqual(response.json()['count'], 2)
+        self.create_offer(self.user, 'Flyer', [('basic', 20, 2)])
+        response = self.client.get(
+            '/api/offers/facets/', {'creator_id': self.user.id}
+        )
+        self.assertEqual(response.json()['count'], 3)
+
+    # Test cases for disabling the facets cache
+    @override_settings(OFFER_FACETS_CACHE_TIMEOUT=0)
+    def test_cache_disabled(self):
+        self.client.get('/api/offers/facets/')
+        with self.assertNumQueries(1):
+            self.client.get('/api/offers/facets/')
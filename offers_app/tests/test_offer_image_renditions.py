@@ -0,0 +1,157 @@
+import shutil
+import tempfile
+from io import BytesIO, StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import override_settings
+
+from PIL import Image
+from rest_framework.test import APITestCase
+
+from core import renditions
+from offers_app.api.serializers import (
+    FastOfferListSerializer,
+    OfferListSerializer
+)
+from offers_app.api.views import OfferListView
+from offers_app.models import Offer
+
+
+def make_image(name, size=(1200, 800), image_format='JPEG'):
+    buffer = BytesIO()
+    Image.new('RGB', size, 'red').save(buffer, image_format)
+    return SimpleUploadedFile(name, buffer.getvalue())
+
+
+@override_settings(
+    OFFER_LIST_CACHE_TIMEOUT=0,
+    IMAGE_RENDITION_WORKERS=0,
+    IMAGE_RENDITION_WIDTHS=(160, 480, 1024)
+)
+class OfferImageRenditionsTest(APITestCase):
+    """
+    Test cases for rendering, serving and cleaning up offer image
+    renditions.
+    """
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.addCleanup(shutil.rmtree, self.media_root)
+        self.user = get_user_model().objects.create_user(
+            username='business',
+            password='testpass',
+            user_type='business'
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.offer = Offer.objects.create(
+                user=self.user, title='Logo', description='Text',
+                image=make_image('logo.jpg')
+            )
+        self.client.force_authenticate(user=self.user)
+
+    def rendition_exists(self, name, width, image_format):
+        return default_storage.exists(
+            renditions.get_rendition_name(name, width, image_format)
+        )
+
+    # Test cases for the stored renditions
+    def test_renditions_rendered(self):
+        self.offer.refresh_from_db()
+        name = self.offer.image.name
+        self.assertEqual(self.offer.image_renditions, {
+            'source': name,
+            'widths': [160, 480, 1024],
+            'formats': ['webp', 'jpeg'],
+        })
+        path = renditions.get_rendition_name(name, 480, 'webp')
+        with default_storage.open(path) as file, Image.open(file) as image:
+            self.assertEqual(image.format, 'WEBP')
+            self.assertEqual(image.size, (480, 320))
+
+    # Test cases for the srcset map on both list serializers and detail
+    def test_srcset(self):
+        name = Offer.objects.get(pk=self.offer.pk).image.name
+        expected = {
+            'image/webp': ', '.join(
+                f'http://testserver/media/renditions/{name}/{width}.webp '
+                f'{width}w' for width in (160, 480, 1024)
+            ),
+            'image/jpeg': ', '.join(
+                f'http://testserver/media/renditions/{name}/{width}.jpeg '
+                f'{width}w' for width in (160, 480, 1024)
+            ),
+        }
+        for serializer in (FastOfferListSerializer, OfferListSerializer):
+            with mock.patch.object(
+                OfferListView, 'list_serializer_class', serializer
+            ):
+                response = self.client.get(
+                    '/api/offers/', {'fields': 'id,image_srcset'}
+                )
+            self.assertEqual(
+                response.json()['results'][0]['image_srcset'], expected
+            )
+        response = self.client.get(f'/api/offers/{self.offer.pk}/')
+        self.assertEqual(response.json()['image_srcset'], expected)
+
+    # Test cases for images smaller than the renditions and non images
+    def test_small_and_invalid_images(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            small = Offer.objects.create(
+                user=self.user, title='Small', description='Text',
+                image=make_image('small.png', (300, 200), 'PNG')
+            )
+            broken = Offer.objects.create(
+                user=self.user, title='Broken', description='Text',
+                image=SimpleUploadedFile('broken.jpg', b'no image')
+            )
+        small.refresh_from_db()
+        self.assertEqual(small.image_renditions['widths'], [160])
+        self.assertEqual(small.image_renditions['formats'], ['webp', 'png'])
+        broken.refresh_from_db()
+        self.assertEqual(broken.image_renditions['widths'], [])
+        response = self.client.get(f'/api/offers/{broken.pk}/')
+        self.assertEqual(response.json()['image_srcset'], {})
+
+    # Test cases for cleaning up on image changes and deletes
+    def test_cleanup(self):
+        offer = Offer.objects.get(pk=self.offer.pk)
+        old_name = offer.image.name
+        offer.image = make_image('new.jpg')
+        with self.captureOnCommitCallbacks(execute=True):
+            offer.save()
+        offer.refresh_from_db()
+        self.assertFalse(self.rendition_exists(old_name, 160, 'webp'))
+        self.assertTrue(self.rendition_exists(offer.image.name, 160, 'webp'))
+        self.assertEqual(offer.image_renditions['source'], offer.image.name)
+        with self.captureOnCommitCallbacks(execute=True):
+            offer.delete()
+        self.assertFalse(self.rendition_exists(offer.image.name, 160, 'webp'))
+
+    # Test cases for rendering off the request thread
+    @override_settings(IMAGE_RENDITION_WORKERS=2)
+    def test_rendered_in_background(self):
+        with mock.patch.object(renditions, 'get_executor') as get_executor:
+            offer = Offer.objects.get(pk=self.offer.pk)
+            offer.image = make_image('other.jpg')
+            with self.captureOnCommitCallbacks(execute=True):
+                offer.save()
+        get_executor.return_value.submit.assert_called_once_with(
+            renditions.run_task, renditions.update_renditions,
+            Offer, offer.pk, 'image', 'image_renditions'
+        )
+
+    # Test cases for the backfill command
+    def test_backfill_command(self):
+        Offer.objects.filter(pk=self.offer.pk).update(image_renditions={})
+        output = StringIO()
+        call_command('render_image_renditions', stdout=output)
+        self.assertIn('offers: 1 rendered', output.getvalue())
+        offer = Offer.objects.get(pk=self.offer.pk)
+        self.assertEqual(offer.image_renditions['source'], offer.image.name)
@@ -0,0 +1,146 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import override_settings
+
+from rest_framework.test import APITestCase
+
+from offers_app.cache import get_cache_stats
+from offers_app.checks import check_catalogue_cache
+from offers_app.models import Offer, OfferDetail
+from profiles_app.models import Profile
+
+
+class OfferListCacheTest(APITestCase):
+    """
+    Test cases for the versioned offer list response cache.
+    """
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            username='business',
+            password='testpass',
+            user_type='business'
+        )
+        self.profile = Profile.objects.create(
+            user=self.user,
+            username='business',
+            email='business@example.com',
+            type='business'
+        )
+        self.offer = self.create_offer('Logo Design', price=100)
+
+    def tearDown(self):
+        cache.clear()
+
+    def create_offer(self, title, price):
+        offer = Offer.objects.create(
+            user=self.user, title=title, description=title
+        )
+        OfferDetail.objects.create(
+            offer=offer, title='Basic', revisions=1,
+            delivery_time_in_days=3, price=price, features=[],
+            offer_type='basic'
+        )
+        return offer
+
+    # Test cases for serving repeated requests from the cache
+    def test_hit_after_miss(self):
+        first = self.client.get('/api/offers/?min_price=50')
+        self.assertEqual(first['X-Cache'], 'MISS')
+        with self.assertNumQueries(0):
+            second = self.client.get('/api/offers/?min_price=50')
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(first.json(), second.json())
+        self.assertEqual(first['ETag'], second['ETag'])
+        self.assertEqual(first['Last-Modified'], second['Last-Modified'])
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                '/api/offers/?min_price=50', HTTP_IF_NONE_MATCH=first['ETag']
+            )
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(get_cache_stats()['hits'], 2)
+
+    # Test cases for normalizing the query parameters
+    def test_normalized_parameters(self):
+        self.client.get('/api/offers/?min_price=50&ordering=id&page=1')
+        response = self.client.get('/api/offers/?ordering=id&min_price=50')
+        self.assertEqual(response['X-Cache'], 'HIT')
+        response = self.client.get('/api/offers/?ordering=-id&min_price=50')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        response = self.client.get('/api/offers/?ordering=-id&min_price=50&x=1')
+        self.assertEqual(response['X-Cache'], 'HIT')
+
+    # Test cases for invalidating on offer and detail writes
+    def test_writes_invalidate(self):
+        self.client.get('/api/offers/')
+        self.create_offer('Website', price=200)
+        response = self.client.get('/api/offers/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json()['count'], 2)
+
+        detail = self.offer.details.get()
+        detail.price = 10
+        detail.save()
+        response = self.client.get('/api/offers/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json()['results'][0]['min_price'], 10)
+
+        self.offer.delete()
+        response = self.client.get('/api/offers/')
+        self.assertEqual(response.json()['count'], 1)
+
+    # Test cases for invalidating on creator profile changes
+    def test_profile_change_invalidates(self):
+        self.client.get('/api/offers/')
+        self.profile.first_name = 'Max'
+        self.profile.save()
+        response = self.client.get('/api/offers/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        user_details = response.json()['results'][0]['user_details']
+        self.assertEqual(user_details['first_name'], 'Max')
+
+    # Test cases for disabling the cache
+    @override_settings(OFFER_LIST_CACHE_TIMEOUT=0)
+    def test_disabled(self):
+        self.client.get('/api/offers/')
+        response = self.client.get('/api/offers/')
+        self.assertNotIn('X-Cache', response)
+
+    # Test cases for reporting the hit rate
+    def test_stats(self):
+        self.client.get('/api/offers/')
+        self.client.get('/api/offers/')
+        self.client.get('/api/offers/')
+        self.assertEqual(get_cache_stats(), {
+            'hits': 2, 'misses': 1, 'hit_rate': 2 / 3
+        })
+        out = StringIO()
+        call_command('offer_cache_stats', '--reset', stdout=out)
+        self.assertIn('hit rate: 66.7%', out.getvalue())
+        self.assertEqual(get_cache_stats()['hits'], 0)
+
+    # Test cases for refusing a process local cache with several workers
+    def test_shared_cache_check(self):
+        with override_settings(DEBUG=False, WEB_CONCURRENCY=2):
+            errors = check_catalogue_cache(None)
+        self.assertEqual([error.id for error in errors], ['offers_app.E001'])
+        for overrides in (
+            {'DEBUG': False, 'WEB_CONCURRENCY': 1},
+            {
+                'DEBUG': False, 'WEB_CONCURRENCY': 2,
+                'OFFER_LIST_CACHE_TIMEOUT': 0,
+                'OFFER_FACETS_CACHE_TIMEOUT': 0,
+            },
+            {
+                'DEBUG': False, 'WEB_CONCURRENCY': 2,
+                'CACHES': {'default': {
+                    'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+                    'LOCATION': 'redis://localhost:6379',
+                }},
+            },
+        ):
+            with override_settings(**overrides):
+                self.assertEqual(check_catalogue_cache(None), [])
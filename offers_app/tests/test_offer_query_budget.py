@@ -0,0 +1,108 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from rest_framework.test import APITestCase
+
+from offers_app.models import Offer, OfferDetail
+from profiles_app.models import Profile
+
+
+class OfferQueryBudgetTest(APITestCase):
+    """
+    Test cases ensuring the offer endpoints run a fixed number of queries,
+    independent of how many offers are returned.
+    """
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username='business',
+            password='testpass',
+            user_type='business'
+        )
+        Profile.objects.create(
+            user=self.user,
+            username='business',
+            email='business@example.com',
+            type='business'
+        )
+
+    # Seed the given number of offers with three details each
+    def seed_offers(self, count):
+        offers = Offer.objects.bulk_create([
+            Offer(
+                user=self.user,
+                title=f'Offer {index}',
+                description=f'Description {index}'
+            )
+            for index in range(count)
+        ])
+        OfferDetail.objects.bulk_create([
+            OfferDetail(
+                offer=offer,
+                title=f'{offer_type} {offer.title}',
+                revisions=1,
+                delivery_time_in_days=days,
+                price=price,
+                features=['Feature'],
+                offer_type=offer_type
+            )
+            for offer in offers
+            for offer_type, days, price in (
+                ('basic', 3, 100),
+                ('standard', 5, 200),
+                ('premium', 7, 300),
+            )
+        ])
+        # bulk_create skips the signals keeping the summary in sync
+        Offer.objects.update(min_price=100, max_price=300, min_delivery_time=3)
+        return offers
+
+    # Count the queries needed to list the given number of offers
+    def count_list_queries(self, count):
+        Offer.objects.all().delete()
+        self.seed_offers(count)
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(f'/api/offers/?page_size={count}')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['results']), count)
+        return len(context.captured_queries)
+
+    # Test cases for the list query count staying constant
+    def test_list_query_count_is_constant(self):
+        counts = [self.count_list_queries(count) for count in (6, 60, 600)]
+        self.assertEqual(counts[0], counts[1])
+        self.assertEqual(counts[0], counts[2])
+
+    # Test cases for the list query budget
+    def test_list_query_budget(self):
+        self.seed_offers(6)
+        # validator, count, offers with user and profile, details
+        with self.assertNumQueries(4):
+            response = self.client.get('/api/offers/')
+        self.assertEqual(response.status_code, 200)
+        offer = response.json()['results'][0]
+        self.assertEqual(offer['min_price'], 100)
+        self.assertEqual(offer['min_delivery_time'], 3)
+        self.assertEqual(offer['user_details']['username'], 'business')
+
+    # Test cases for the retrieve query budget
+    def test_retrieve_query_budget(self):
+        offer = self.seed_offers(6)[0]
+        self.client.force_authenticate(user=self.user)
+        # validator, offer with user, details
+        with self.assertNumQueries(3):
+            response = self.client.get(f'/api/offers/{offer.id}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['details']), 3)
+
+    # Test cases for the list reading the annotated summary values
+    def test_list_does_not_load_detail_prices(self):
+        self.seed_offers(6)
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/api/offers/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['results'][0]['min_price'], 100)
+        for query in context.captured_queries:
+            self.assertNotIn(
+                '"offers_app_offerdetail"."price" FROM', query['sql']
+            )
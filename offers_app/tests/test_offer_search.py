@@ -0,0 +1,126 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from rest_framework.test import APITestCase
+
+from offers_app.models import Offer
+from offers_app.search import (
+    LikeSearchBackend,
+    SQLiteSearchBackend,
+    get_search_backend,
+    split_search_terms
+)
+
+
+class OfferSearchTest(APITestCase):
+    """
+    Test cases for the full-text offer search.
+    """
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username='business',
+            password='testpass',
+            user_type='business'
+        )
+        self.logo = Offer.objects.create(
+            user=self.user,
+            title='Logo Design',
+            description='Ein Logo für Ihr Unternehmen, Logo Varianten inklusive'
+        )
+        self.website = Offer.objects.create(
+            user=self.user,
+            title='Website Entwicklung',
+            description='Moderne Website mit passendem Logo'
+        )
+        self.flyer = Offer.objects.create(
+            user=self.user,
+            title='Flyer Druck',
+            description='Flyer in hoher Auflage'
+        )
+
+    def search_titles(self, term):
+        response = self.client.get('/api/offers/', {'search': term})
+        self.assertEqual(response.status_code, 200)
+        return [offer['title'] for offer in response.json()['results']]
+
+    # Test cases for ranking title and repeated matches first
+    def test_results_ranked_by_relevance(self):
+        self.assertEqual(
+            self.search_titles('logo'),
+            ['Logo Design', 'Website Entwicklung']
+        )
+
+    # Test cases for prefix matching and combining terms
+    def test_prefix_and_all_terms(self):
+        self.assertEqual(self.search_titles('Entwick'), ['Website Entwicklung'])
+        self.assertEqual(self.search_titles('logo website'), [
+            'Website Entwicklung'
+        ])
+        self.assertEqual(self.search_titles('für'), ['Logo Design'])
+
+    # Test cases for explicit ordering overriding the rank
+    def test_ordering_overrides_rank(self):
+        response = self.client.get(
+            '/api/offers/', {'search': 'logo', 'ordering': '-id'}
+        )
+        titles = [offer['title'] for offer in response.json()['results']]
+        self.assertEqual(titles, ['Website Entwicklung', 'Logo Design'])
+
+    # Test cases for cursor pages, which cannot follow the rank
+    def test_cursor_pagination(self):
+        response = self.client.get(
+            '/api/offers/', {'search': 'logo', 'pagination': 'cursor'}
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('pagination', response.json())
+        response = self.client.get('/api/offers/', {
+            'search': 'logo', 'pagination': 'cursor', 'ordering': '-id'
+        })
+        titles = [offer['title'] for offer in response.json()['results']]
+        self.assertEqual(titles, ['Website Entwicklung', 'Logo Design'])
+
+    # Test cases for keeping the index in sync with offer changes
+    def test_index_follows_updates_and_deletes(self):
+        self.flyer.title = 'Plakat Druck'
+        self.flyer.save()
+        self.assertEqual(self.search_titles('plakat'), ['Plakat Druck'])
+        self.assertEqual(self.search_titles('flyer'), ['Plakat Druck'])
+        self.flyer.description = 'Plakate in hoher Auflage'
+        self.flyer.save()
+        self.assertEqual(self.search_titles('flyer'), [])
+        self.flyer.delete()
+        self.assertEqual(self.search_titles('plakat'), [])
+
+    # Test cases for search queries hitting the index
+    def test_search_uses_index(self):
+        with CaptureQueriesContext(connection) as context:
+            self.search_titles('logo')
+        sql = ' '.join(query['sql'] for query in context.captured_queries)
+        self.assertIn('offers_app_offer_fts', sql)
+        self.assertNotIn('LIKE', sql)
+
+    # Test cases for the substring fallback backend
+    def test_like_backend(self):
+        results = LikeSearchBackend().search(
+            Offer.objects.all(), ['design', 'logo']
+        )
+        self.assertEqual(list(results), [self.logo])
+
+    # Test cases for picking up a changed backend setting
+    def test_backend_setting(self):
+        self.assertIsInstance(get_search_backend(), SQLiteSearchBackend)
+        with override_settings(
+            OFFER_SEARCH_BACKEND='offers_app.search.LikeSearchBackend'
+        ):
+            self.assertIsInstance(get_search_backend(), LikeSearchBackend)
+        self.assertIsInstance(get_search_backend(), SQLiteSearchBackend)
+
+    # Test cases for splitting search terms
+    def test_split_search_terms(self):
+        self.assertEqual(
+            split_search_terms('"Logo" OR design*'),
+            ['Logo', 'OR', 'design']
+        )
+        self.assertEqual(split_search_terms(''), [])
@@ -0,0 +1,152 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from rest_framework.test import APITestCase
+
+from offers_app.api.serializers import (
+    FastOfferListSerializer,
+    OfferListSerializer
+)
+from offers_app.api.views import OfferListView
+from offers_app.models import Offer, OfferDetail
+from profiles_app.models import Profile
+
+
+@override_settings(OFFER_LIST_CACHE_TIMEOUT=0)
+class OfferSparseFieldsTest(APITestCase):
+    """
+    Test cases for ?fields= and ?omit= on the offer endpoints.
+    """
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username='business',
+            password='testpass',
+            user_type='business'
+        )
+        Profile.objects.create(
+            user=self.user, username='business', first_name='Max',
+            email='business@example.com', type='business'
+        )
+        for index in range(3):
+            self.offer = Offer.objects.create(
+                user=self.user, title=f'Angebot {index}', description='Text'
+            )
+            for offer_type, price in (('basic', 100), ('premium', 300)):
+                self.detail = OfferDetail.objects.create(
+                    offer=self.offer, title=offer_type, revisions=1,
+                    delivery_time_in_days=3, price=price + index,
+                    features=[], offer_type=offer_type
+                )
+        self.client.force_authenticate(user=self.user)
+
+    def get_with_queries(self, path, params):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(path, params)
+        self.assertEqual(response.status_code, 200)
+        return response.json(), [
+            query['sql'] for query in context.captured_queries
+        ]
+
+    # Test cases for selecting fields on both list serializers
+    def test_list_fields(self):
+        params = {'fields': 'id,title,image,min_price', 'ordering': '-id'}
+        for serializer in (FastOfferListSerializer, OfferListSerializer):
+            with mock.patch.object(
+                OfferListView, 'list_serializer_class', serializer
+            ):
+                data, queries = self.get_with_queries('/api/offers/', params)
+            self.assertEqual(data['results'][0], {
+                'id': self.offer.id,
+                'title': 'Angebot 2',
+                'image': None,
+                'min_price': 102,
+            })
+            page_query = queries[-1]
+            self.assertNotIn('offers_app_offerdetail', page_query)
+            self.assertNotIn('profiles_app_profile', page_query)
+            self.assertNotIn('"description"', page_query)
+
+    # Test cases for omitting fields
+    def test_list_omit(self):
+        params = {'omit': 'details,user_details,description'}
+        for serializer in (FastOfferListSerializer, OfferListSerializer):
+            with mock.patch.object(
+                OfferListView, 'list_serializer_class', serializer
+            ):
+                data, queries = self.get_with_queries('/api/offers/', params)
+            self.assertEqual(list(data['results'][0]), [
+                'id', 'user', 'title', 'image', 'image_srcset',
+                'created_at', 'updated_at',
+                'min_price', 'min_delivery_time'
+            ])
+            self.assertFalse(any(
+                'offers_app_offerdetail' in query for query in queries
+            ))
+
+    # Test cases for cursor pages ordered by an unselected field
+    def test_cursor_pagination(self):
+        params = {
+            'fields': 'id', 'ordering': '-min_price',
+            'pagination': 'cursor', 'page_size': 2
+        }
+        for serializer in (FastOfferListSerializer, OfferListSerializer):
+            with mock.patch.object(
+                OfferListView, 'list_serializer_class', serializer
+            ):
+                first = self.client.get('/api/offers/', params).json()
+                second = self.client.get(first['next']).json()
+            ids = [offer['id'] for offer in first['results'] + second['results']]
+            self.assertEqual(
+                ids, list(Offer.objects.order_by('-min_price').values_list(
+                    'id', flat=True
+                ))
+            )
+
+    # Test cases for the user details still reading the profile
+    def test_list_user_details(self):
+        data, _ = self.get_with_queries(
+            '/api/offers/', {'fields': 'id,user_details'}
+        )
+        self.assertEqual(data['results'][0]['user_details'], {
+            'first_name': 'Max', 'last_name': None, 'username': 'business'
+        })
+
+    # Test cases for the offer and offer detail endpoints
+    def test_retrieve_fields(self):
+        data, queries = self.get_with_queries(
+            f'/api/offers/{self.offer.id}/', {'fields': 'id,min_price'}
+        )
+        self.assertEqual(data, {'id': self.offer.id, 'min_price': 102})
+        self.assertFalse(any(
+            'offers_app_offerdetail' in query for query in queries
+        ))
+        data, _ = self.get_with_queries(
+            f'/api/offerdetails/{self.detail.id}/', {'omit': 'features'}
+        )
+        self.assertNotIn('features', data)
+        self.assertEqual(data['price'], 302)
+
+    # Test cases for caching and validating each fieldset separately
+    @override_settings(OFFER_LIST_CACHE_TIMEOUT=300)
+    def test_cache_and_etag_per_fieldset(self):
+        full = self.client.get('/api/offers/')
+        sparse = self.client.get('/api/offers/', {'fields': 'id'})
+        self.assertEqual(list(sparse.json()['results'][0]), ['id'])
+        self.assertNotEqual(full['ETag'], sparse['ETag'])
+        path = f'/api/offers/{self.offer.id}/'
+        self.assertNotEqual(
+            self.client.get(path)['ETag'],
+            self.client.get(path, {'fields': 'id'})['ETag']
+        )
+
+    # Test cases for rejecting unknown fields
+    def test_unknown_field(self):
+        response = self.client.get('/api/offers/', {'fields': 'id,price'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json(), {'fields': 'Unknown field(s): price.'}
+        )
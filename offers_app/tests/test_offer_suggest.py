@@ -0,0 +1,209 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.test import TestCase, override_settings
+
+from rest_framework.test import APITestCase
+
+from offers_app.models import Offer
+from offers_app.suggest import (
+    TitleSuggestIndex,
+    edit_distance,
+    normalize_words,
+    suggest_index
+)
+
+
+class TitleSuggestIndexTest(TestCase):
+    """
+    Test cases for the in-memory title index.
+    """
+    def setUp(self):
+        self.index = TitleSuggestIndex()
+        self.index.build()
+        for offer_id, title in enumerate([
+            'Logo Design',
+            'Website Entwicklung',
+            'Webshop Einrichtung',
+            'Grafikdesign-Paket',
+            'Übersetzung Deutsch Englisch',
+        ], 1):
+            self.index.add(offer_id, title)
+
+    def suggest_titles(self, query):
+        return [title for _, title in self.index.suggest(query)]
+
+    # Test cases for prefix matches
+    def test_prefix(self):
+        self.assertEqual(
+            self.suggest_titles('web'),
+            ['Website Entwicklung', 'Webshop Einrichtung']
+        )
+        self.assertEqual(self.suggest_titles('website ent'), [
+            'Website Entwicklung'
+        ])
+        self.assertEqual(self.suggest_titles('uber'), [
+            'Übersetzung Deutsch Englisch'
+        ])
+
+    # Test cases for tolerating typos
+    def test_typos(self):
+        self.assertEqual(self.suggest_titles('wbesite'), [
+            'Website Entwicklung'
+        ])
+        self.assertEqual(self.suggest_titles('grafikdsein'), [
+            'Grafikdesign-Paket'
+        ])
+        self.assertEqual(self.suggest_titles('logo desgin'), ['Logo Design'])
+        self.assertEqual(self.suggest_titles('xyz'), [])
+
+    # Test cases for exact matches ranking above typo matches
+    def test_exact_before_typos(self):
+        self.index.add(6, 'Webseite Pflege')
+        self.assertEqual(self.suggest_titles('webseite')[0], 'Webseite Pflege')
+
+    # Test cases for incremental updates
+    def test_update_and_remove(self):
+        self.index.update(1, 'Logo Animation')
+        self.assertEqual(self.suggest_titles('anim'), ['Logo Animation'])
+        self.assertEqual(self.suggest_titles('design'), [])
+        self.index.remove(1)
+        self.assertEqual(self.suggest_titles('logo'), [])
+        self.assertNotIn('logo', self.index.words)
+
+    # Test cases for the limit
+    def test_limit(self):
+        for offer_id in range(10, 40):
+            self.index.add(offer_id, f'Logo Paket {offer_id}')
+        self.assertEqual(len(self.index.suggest('logo', limit=5)), 5)
+
+    # Test cases for the bounded edit distance
+    def test_edit_distance(self):
+        self.assertEqual(edit_distance('design', 'desgin', 2), 1)
+        self.assertEqual(edit_distance('logo', 'lago', 2), 1)
+        self.assertEqual(edit_distance('abc', 'xyzuvw', 2), 3)
+
+    # Test cases for ranking on a larger index, where lookups stop
+    # early or intersect all matches
+    def test_ranking_matches_full_scan(self):
+        words = ['logo', 'design', 'website', 'shop', 'flyer', 'video',
+                 'texte', 'seo', 'paket', 'branding']
+        titles = dict(self.index.titles)
+        for offer_id in range(100, 3100):
+            titles[offer_id] = (
+                f'{words[offer_id % 10]} {words[offer_id // 10 % 10]}'
+            )
+            if offer_id % 7 == 0:
+                titles[offer_id] += f' {words[offer_id // 100 % 10]}'
+            self.index.add(offer_id, titles[offer_id])
+        for query in ('logo', 'we', 'logo des', 'design logo', 'seo pak',
+                      'texte video sh', 'flyer seo branding'):
+            *tokens, last = query.split()
+            expected = sorted(
+                (len(title), offer_id)
+                for offer_id, title in titles.items()
+                if set(tokens) <= set(normalize_words(title))
+                and any(
+                    word.startswith(last) for word in normalize_words(title)
+                )
+            )[:10]
+            suggested = self.index.suggest(query)[:len(expected)]
+            self.assertEqual(
+                [offer_id for offer_id, _ in suggested],
+                [offer_id for _, offer_id in expected]
+            )
+
+
+class OfferSuggestAPITest(APITestCase):
+    """
+    Test cases for the offer suggest endpoint.
+    """
+    def setUp(self):
+        suggest_index.reset()
+        self.user = get_user_model().objects.create_user(
+            username='business',
+            password='testpass',
+            user_type='business'
+        )
+        self.logo = Offer.objects.create(
+            user=self.user, title='Logo Design', description='Logo'
+        )
+        self.website = Offer.objects.create(
+            user=self.user, title='Website Entwicklung', description='Web'
+        )
+
+    def tearDown(self):
+        suggest_index.reset()
+
+    # Test cases for the response
+    def test_suggest(self):
+        response = self.client.get('/api/offers/suggest/?q=logo')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(), [{'id': self.logo.id, 'title': 'Logo Design'}]
+        )
+        response = self.client.get('/api/offers/suggest/?q=')
+        self.assertEqual(response.json(), [])
+
+    # Test cases for signals keeping the index in sync
+    def test_index_follows_changes(self):
+        self.client.get('/api/offers/suggest/?q=logo')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.logo.title = 'Logo Animation'
+            self.logo.save()
+            Offer.objects.create(
+                user=self.user, title='Animation Video', description='Video'
+            )
+            self.website.delete()
+        response = self.client.get('/api/offers/suggest/?q=anim')
+        titles = [offer['title'] for offer in response.json()]
+        self.assertEqual(titles, ['Logo Animation', 'Animation Video'])
+        response = self.client.get('/api/offers/suggest/?q=website')
+        self.assertEqual(response.json(), [])
+
+    # Test cases for rolled back writes leaving the index unchanged
+    def test_rollback_keeps_index(self):
+        self.client.get('/api/offers/suggest/?q=logo')
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with transaction.atomic():
+                self.logo.title = 'Logo Animation'
+                self.logo.save()
+                transaction.set_rollback(True)
+        self.assertEqual(callbacks, [])
+        response = self.client.get('/api/offers/suggest/?q=logo')
+        self.assertEqual(
+            response.json(), [{'id': self.logo.id, 'title': 'Logo Design'}]
+        )
+
+    # Test cases for picking up rows written without signals
+    @override_settings(OFFER_SUGGEST_REFRESH_SECONDS=-1)
+    def test_refresh_from_database(self):
+        self.client.get('/api/offers/suggest/?q=logo')
+        Offer.objects.filter(pk=self.logo.pk).delete()
+        Offer.objects.bulk_create([
+            Offer(user=self.user, title='Flyer Druck', description='Flyer')
+        ])
+        response = self.client.get('/api/offers/suggest/?q=flyer')
+        self.assertEqual(len(response.json()), 1)
+        response = self.client.get('/api/offers/suggest/?q=logo')
+        self.assertEqual(response.json(), [])
+
+    # Test cases for dropping rows deleted elsewhere without a rebuild
+    @override_settings(OFFER_SUGGEST_REFRESH_SECONDS=-1)
+    def test_refresh_drops_missing_rows(self):
+        self.client.get('/api/offers/suggest/?q=logo')
+        suggest_index.add(self.logo.id + 1000, 'Logo Animation')
+        with mock.patch.object(
+            suggest_index, 'build', side_effect=AssertionError
+        ):
+            response = self.client.get('/api/offers/suggest/?q=logo')
+        self.assertEqual(
+            response.json(), [{'id': self.logo.id, 'title': 'Logo Design'}]
+        )
+        self.assertNotIn(self.logo.id + 1000, suggest_index.titles)
+
+    # Test cases for invalid limits
+    def test_invalid_limit(self):
+        response = self.client.get('/api/offers/suggest/?q=logo&limit=x')
+        self.assertEqual(response.status_code, 400)
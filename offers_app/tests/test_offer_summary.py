@@ -0,0 +1,92 @@
+from django.contrib.auth import get_user_model
+
+from rest_framework.test import APITestCase
+
+from offers_app.models import Offer, OfferDetail
+
+
+class OfferSummaryTest(APITestCase):
+    """
+    Test cases for keeping the denormalized offer summary in sync.
+    """
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username='business',
+            password='testpass',
+            user_type='business'
+        )
+        self.offer = Offer.objects.create(
+            user=self.user,
+            title='Grafikdesign-Paket',
+            description='Ein umfassendes Grafikdesign-Paket.'
+        )
+        self.basic = self.create_detail('basic', price=100, days=5)
+        self.premium = self.create_detail('premium', price=300, days=10)
+
+    def create_detail(self, offer_type, price, days):
+        return OfferDetail.objects.create(
+            offer=self.offer,
+            title=offer_type.title(),
+            revisions=1,
+            delivery_time_in_days=days,
+            price=price,
+            features=[],
+            offer_type=offer_type
+        )
+
+    def assertSummary(self, min_price, max_price, min_delivery_time):
+        offer = Offer.objects.get(pk=self.offer.pk)
+        self.assertEqual(offer.min_price, min_price)
+        self.assertEqual(offer.max_price, max_price)
+        self.assertEqual(offer.min_delivery_time, min_delivery_time)
+
+    # Test cases for the summary after creating details
+    def test_summary_after_create(self):
+        self.assertSummary(100, 300, 5)
+        self.assertEqual(self.offer.min_price, 100)
+
+    # Test cases for the summary after updating a detail
+    def test_summary_after_update(self):
+        self.basic.price = 50
+        self.basic.delivery_time_in_days = 2
+        self.basic.save()
+        self.assertSummary(50, 300, 2)
+
+    # Test cases for the summary after deleting a detail
+    def test_summary_after_delete(self):
+        self.basic.delete()
+        self.assertSummary(300, 300, 10)
+        OfferDetail.objects.filter(offer=self.offer).delete()
+        self.assertSummary(None, None, None)
+
+    # Test cases for deleting an offer along with its details
+    def test_offer_delete_cascades(self):
+        self.offer.delete()
+        self.assertFalse(OfferDetail.objects.exists())
+
+    # Test cases for the summary after patching details through the API
+    def test_summary_after_patch(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.patch(
+            f'/api/offers/{self.offer.id}/',
+            {'details': [{'offer_type': 'premium', 'price': 80}]},
+            format='json'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertSummary(80, 100, 5)
+
+    # Test cases for filtering and ordering on the stored columns
+    def test_list_uses_summary_columns(self):
+        cheap = Offer.objects.create(
+            user=self.user, title='Cheap', description='Cheap offer'
+        )
+        OfferDetail.objects.create(
+            offer=cheap, title='Basic', revisions=1,
+            delivery_time_in_days=1, price=10, features=[],
+            offer_type='basic'
+        )
+        response = self.client.get('/api/offers/?ordering=min_price')
+        titles = [offer['title'] for offer in response.json()['results']]
+        self.assertEqual(titles, ['Cheap', 'Grafikdesign-Paket'])
+        response = self.client.get('/api/offers/?min_price=50')
+        self.assertEqual(response.json()['count'], 1)
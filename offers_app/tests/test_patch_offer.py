@@ -143,3 +143,49 @@ class OfferPatchAPITest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['description'], "Nur die Beschreibung wurde geändert.")
         self.assertEqual(response.data['title'], "Grafikdesign-Paket")
+
+    # Test cases for writing changed details in one batch
+    def test_patch_offer_details_in_one_batch(self):
+        self.client.force_authenticate(user=self.user)
+        patch_data = {
+            "details": [
+                {"offer_type": "basic", "price": 80, "title": "Basic Design"},
+                {"offer_type": "premium", "delivery_time_in_days": 2},
+            ]
+        }
+        # Two offer lookups by the view, the details, savepoint, one
+        # detail update, the offer update, two search index writes and
+        # the savepoint release
+        with self.assertNumQueries(9):
+            response = self.client.patch(self.url, patch_data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(detail['offer_type'], detail['price'],
+              detail['delivery_time_in_days'])
+             for detail in response.data['details']],
+            [('basic', 80, 7), ('standard', 120, 10), ('premium', 150, 2)]
+        )
+        self.offer.refresh_from_db()
+        self.assertEqual(self.offer.min_price, 80)
+        self.assertEqual(self.offer.max_price, 150)
+        self.assertEqual(self.offer.min_delivery_time, 2)
+        self.detail_premium.refresh_from_db()
+        self.assertEqual(self.detail_premium.delivery_time_in_days, 2)
+        self.assertEqual(self.detail_premium.title, "Premium Design")
+
+    # Test cases for rejecting the whole update on an unknown offer_type
+    def test_patch_offer_unknown_offer_type_writes_nothing(self):
+        self.client.force_authenticate(user=self.user)
+        patch_data = {
+            "title": "Neuer Titel",
+            "details": [
+                {"offer_type": "basic", "price": 80},
+                {"offer_type": "deluxe", "price": 900},
+            ]
+        }
+        response = self.client.patch(self.url, patch_data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.offer.refresh_from_db()
+        self.detail_basic.refresh_from_db()
+        self.assertEqual(self.offer.title, "Grafikdesign-Paket")
+        self.assertEqual(self.detail_basic.price, 100)
@@ -1,9 +1,10 @@
 from rest_framework import serializers
 
+from core.serializers import SparseFieldsetMixin
 from orders_app.models import Order
 
 
-class OrderSerializer(serializers.ModelSerializer):
+class OrderSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Serializer for the Order model.
     """
@@ -14,3 +15,14 @@ class OrderSerializer(serializers.ModelSerializer):
             'revisions', 'delivery_time_in_days', 'price', 'features',
             'offer_type', 'status', 'created_at', 'updated_at',
         ]
+
+
+class BusinessOrderStatsSerializer(serializers.Serializer):
+    """
+    Serializer for the order counts of one business user, read from
+    .values() rows of users annotated with their counters.
+    """
+    business_user_id = serializers.IntegerField(source='id')
+    in_progress = serializers.IntegerField()
+    completed = serializers.IntegerField()
+    cancelled = serializers.IntegerField()
@@ -5,6 +5,7 @@ from orders_app.api.views import (
     OrderDetailView,
     OrderCountView,
     CompletedOrderCountView,
+    OrderStatsView,
 )
 
 
@@ -13,4 +14,5 @@ urlpatterns = [
     path('orders/<int:pk>/', OrderDetailView.as_view(), name='order-detail'),
     path('order-count/<int:pk>/', OrderCountView.as_view(), name='order-count'),
     path('completed-order-count/<int:pk>/', CompletedOrderCountView.as_view(), name='completed-order-count'),
+    path('order-stats/', OrderStatsView.as_view(), name='order-stats'),
 ]
@@ -1,33 +1,150 @@
+from operator import attrgetter
+
+from django.db import transaction
 from django.db.models import Q
+from django.db.models.functions import Coalesce
 from django.contrib.auth import get_user_model
 
 from rest_framework import generics, status
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 
+from core.serializers import (
+    get_concrete_fields,
+    get_ordering_fields,
+    get_sparse_fields
+)
+
+from orders_app.api.paginations import (
+    OrderCursorPagination,
+    merge_branches
+)
 from orders_app.api.permissions import (
     IsAdminUser,
     IsBusinessUserOfOrder,
     IsCustomerUser
 )
-from orders_app.models import Order
-from orders_app.api.serializers import OrderSerializer
+from orders_app.idempotency import (
+    IDEMPOTENCY_HEADER,
+    MAX_KEY_LENGTH,
+    PENDING,
+    claim_key,
+    complete_key,
+    get_store_key,
+    release_key
+)
+from orders_app.models import ORDER_STATUSES, Order
+from orders_app.api.serializers import (
+    BusinessOrderStatsSerializer,
+    OrderSerializer
+)
+from offers_app.api.mixins import BatchLookupMixin
 from offers_app.models import OfferDetail
 
 
+# Offer detail columns copied into a new order
+ORDER_DETAIL_FIELDS = (
+    'title', 'revisions', 'delivery_time_in_days', 'price', 'features',
+    'offer_type',
+)
+# Roles a user can take in an order, by the field holding them
+ORDER_ROLES = {
+    'customer': 'customer_user',
+    'business': 'business_user',
+}
+
+
+def get_business_counts(pk):
+    """
+    Read the profile type and the order counters of a user with one
+    primary key lookup. Returns None for unknown users, the counters
+    are None when the user has no orders yet.
+    """
+    return get_user_model().objects.filter(pk=pk).values(
+        'profile__type',
+        *[f'order_stats__{order_status}' for order_status in ORDER_STATUSES]
+    ).first()
+
+
+def select_order_fields(request, queryset):
+    """
+    Narrow an order queryset to the columns of the selected fields,
+    keeping the columns it is ordered by.
+    """
+    fields = get_sparse_fields(
+        request, OrderSerializer.get_sparse_field_names()
+    )
+    if fields is None:
+        return queryset
+    return queryset.only(*get_concrete_fields(
+        Order, [*fields, *get_ordering_fields(queryset)]
+    ))
+
+
 class OrderListCreateView(generics.ListCreateAPIView):
     """
     View to list all orders for a user and create new orders.
+    Lists are newest first, cursor paginated with ?pagination=cursor,
+    and can be narrowed with ?status= and ?role=customer|business.
     """
     permission_classes = [IsAuthenticated]
     serializer_class = OrderSerializer
-    pagination_class = None
+    pagination_class = OrderCursorPagination
 
     def get_queryset(self):
         user = self.request.user
-        return Order.objects.filter(
-            Q(customer_user=user) | Q(business_user=user)
-        ).order_by('-created_at')
+        role = self.request.query_params.get('role')
+        if role is None:
+            queryset = Order.objects.filter(
+                Q(customer_user=user) | Q(business_user=user)
+            )
+        elif role in ORDER_ROLES:
+            queryset = Order.objects.filter(**{ORDER_ROLES[role]: user})
+        else:
+            raise ValidationError(
+                {'role': f"Must be one of: {', '.join(ORDER_ROLES)}."}
+            )
+        return self.filter_orders(queryset)
+
+    def get_branches(self):
+        """
+        Return the orders of the user per role, for the paginator to
+        read with one index range scan each and merge, or None when a
+        single role was asked for.
+        """
+        if self.request.query_params.get('role') is not None:
+            return None
+        user = self.request.user
+        return [
+            self.filter_orders(Order.objects.filter(**{field: user}))
+            for field in ORDER_ROLES.values()
+        ]
+
+    # The bare list merges the role branches like the paginator, each
+    # read in index order, instead of sorting an OR of both
+    def list(self, request, *args, **kwargs):
+        branches = self.get_branches()
+        if branches is None or self.paginator.is_requested(request):
+            return super().list(request, *args, **kwargs)
+        orders = merge_branches(
+            branches, key=attrgetter('created_at', 'id'), reverse=True
+        )
+        return Response(self.get_serializer(orders, many=True).data)
+
+    # Apply the status filter, the ordering and the selected fields
+    def filter_orders(self, queryset):
+        order_status = self.request.query_params.get('status')
+        if order_status is not None:
+            if order_status not in ORDER_STATUSES:
+                raise ValidationError(
+                    {'status': f"Must be one of: {', '.join(ORDER_STATUSES)}."}
+                )
+            queryset = queryset.filter(status=order_status)
+        # Both keys descend, the paginator merges branches in one direction
+        return select_order_fields(
+            self.request, queryset.order_by('-created_at', '-id')
+        )
 
     def get_permissions(self):
         if self.request.method == 'POST':
@@ -35,6 +152,70 @@ class OrderListCreateView(generics.ListCreateAPIView):
         return [IsAuthenticated()]
 
     def create(self, request, *args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if key is None:
+            return self.create_order(request)
+        if not key or len(key) > MAX_KEY_LENGTH:
+            return Response(
+                {
+                    'detail': f'{IDEMPOTENCY_HEADER} must be 1 to '
+                    f'{MAX_KEY_LENGTH} characters.'
+                },
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        store_key = get_store_key(request.user.pk, key)
+        fingerprint = str(request.data.get('offer_detail_id'))
+        entry = claim_key(store_key)
+        if entry is not None:
+            response = self.replay_order(request, entry, fingerprint)
+            if response is not None:
+                return response
+        try:
+            response = self.create_order(request)
+        except Exception:
+            release_key(store_key)
+            raise
+        if response.status_code == status.HTTP_201_CREATED:
+            complete_key(store_key, fingerprint, response.data['id'])
+        else:
+            release_key(store_key)
+        return response
+
+    def replay_order(self, request, entry, fingerprint):
+        """
+        Answer a retry with the order created for its key. Returns None
+        when that order is gone, the request then creates a new one.
+        """
+        if entry == PENDING:
+            return Response(
+                {
+                    'detail': 'A request with this '
+                    f'{IDEMPOTENCY_HEADER} is still in progress.'
+                },
+                status=status.HTTP_409_CONFLICT
+            )
+        stored_fingerprint, order_id = entry
+        if stored_fingerprint != fingerprint:
+            return Response(
+                {
+                    'detail': f'This {IDEMPOTENCY_HEADER} was used '
+                    'for a different request.'
+                },
+                status=status.HTTP_422_UNPROCESSABLE_ENTITY
+            )
+        order = Order.objects.filter(
+            pk=order_id, customer_user=request.user
+        ).first()
+        if order is None:
+            return None
+        serializer = self.get_serializer(order)
+        return Response(
+            serializer.data,
+            status=status.HTTP_201_CREATED,
+            headers={'Idempotent-Replayed': 'true'}
+        )
+
+    def create_order(self, request):
         offer_detail_id = request.data.get('offer_detail_id')
         if not offer_detail_id:
             return Response(
@@ -50,17 +231,18 @@ class OrderListCreateView(generics.ListCreateAPIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        try:
-            offer_detail = OfferDetail.objects.get(id=offer_detail_id)
-        except OfferDetail.DoesNotExist:
+        # The detail and the id of its business user in one joined query
+        offer_detail = OfferDetail.objects.filter(
+            id=offer_detail_id
+        ).values(*ORDER_DETAIL_FIELDS, 'offer__user_id').first()
+        if offer_detail is None:
             return Response(
                 {'detail': 'OfferDetail not found.'},
                 status=status.HTTP_404_NOT_FOUND
             )
 
-        business_user = offer_detail.offer.user
-
-        if request.user == business_user:
+        business_user_id = offer_detail.pop('offer__user_id')
+        if request.user.pk == business_user_id:
             return Response(
                 {
                     'detail': 'Customers cannot create orders for '
@@ -69,17 +251,14 @@ class OrderListCreateView(generics.ListCreateAPIView):
                 status=status.HTTP_403_FORBIDDEN
             )
 
-        order = Order.objects.create(
-            customer_user=request.user,
-            business_user=business_user,
-            title=offer_detail.title,
-            revisions=offer_detail.revisions,
-            delivery_time_in_days=offer_detail.delivery_time_in_days,
-            price=offer_detail.price,
-            features=offer_detail.features,
-            offer_type=offer_detail.offer_type,
-            status='in_progress'
-        )
+        # The counters of the business user move in the same transaction
+        with transaction.atomic():
+            order = Order.objects.create(
+                customer_user=request.user,
+                business_user_id=business_user_id,
+                status='in_progress',
+                **offer_detail
+            )
         serializer = self.get_serializer(order)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
@@ -91,6 +270,9 @@ class OrderDetailView(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = OrderSerializer
     queryset = Order.objects.all()
 
+    def get_queryset(self):
+        return select_order_fields(self.request, super().get_queryset())
+
     def get_permissions(self):
         if self.request.method == 'PATCH':
             return [IsAuthenticated(), IsBusinessUserOfOrder()]
@@ -101,19 +283,23 @@ class OrderDetailView(generics.RetrieveUpdateDestroyAPIView):
     def patch(self, request, *args, **kwargs):
         order = self.get_object()
         status_value = request.data.get('status')
-        if status_value not in ['in_progress', 'completed', 'cancelled']:
+        if status_value not in ORDER_STATUSES:
             return Response(
                 {'detail': 'Invalid status.'},
                 status=status.HTTP_400_BAD_REQUEST
             )
         order.status = status_value
-        order.save()
+        # The counters of the business user move in the same transaction
+        with transaction.atomic():
+            order.save()
         serializer = self.get_serializer(order)
         return Response(serializer.data)
 
     def delete(self, request, *args, **kwargs):
         order = self.get_object()
-        order.delete()
+        # The counters of the business user move in the same transaction
+        with transaction.atomic():
+            order.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
@@ -124,26 +310,14 @@ class OrderCountView(generics.RetrieveAPIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request, pk, *args, **kwargs):
-        User = get_user_model()
-        try:
-            business_user = User.objects.get(pk=pk)
-        except User.DoesNotExist:
+        counts = get_business_counts(pk)
+        if counts is None or counts['profile__type'] != 'business':
             return Response(
                 {'detail': 'No business user found with the given ID.'},
                 status=status.HTTP_404_NOT_FOUND
             )
-        profile = getattr(business_user, 'profile', None)
-        if not profile or getattr(profile, 'type', None) != 'business':
-            return Response(
-                {'detail': 'No business user found with the given ID.'},
-                status=status.HTTP_404_NOT_FOUND
-            )
-        order_count = Order.objects.filter(
-            business_user=business_user,
-            status='in_progress'
-        ).count()
         return Response(
-            {'order_count': order_count},
+            {'order_count': counts['order_stats__in_progress'] or 0},
             status=status.HTTP_200_OK
         )
 
@@ -155,25 +329,44 @@ class CompletedOrderCountView(generics.RetrieveAPIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request, pk, *args, **kwargs):
-        User = get_user_model()
-        try:
-            business_user = User.objects.get(pk=pk)
-        except User.DoesNotExist:
+        counts = get_business_counts(pk)
+        if counts is None:
             return Response(
                 {'detail': 'No business user found with the given ID.'},
                 status=status.HTTP_404_NOT_FOUND
             )
-        profile = getattr(business_user, 'profile', None)
-        if not profile or getattr(profile, 'type', None) != 'business':
-            return Response(
-                {'completed_order_count': 0},
-                status=status.HTTP_200_OK
-            )
-        completed_order_count = Order.objects.filter(
-            business_user=business_user,
-            status='completed'
-        ).count()
+        completed_order_count = 0
+        if counts['profile__type'] == 'business':
+            completed_order_count = counts['order_stats__completed'] or 0
         return Response(
             {'completed_order_count': completed_order_count},
             status=status.HTTP_200_OK
         )
+
+
+class OrderStatsView(BatchLookupMixin, generics.GenericAPIView):
+    """
+    View to get the order counts of several business users at once with
+    ?business_ids=1,2,3, read from their counters in one query. Ids
+    without a business user are listed under missing, as the order
+    count endpoint answers them with 404.
+    """
+    permission_classes = [IsAuthenticated]
+    serializer_class = BusinessOrderStatsSerializer
+    ids_param = 'business_ids'
+
+    def get_queryset(self):
+        return get_user_model().objects.filter(
+            profile__type='business'
+        ).values('id').annotate(**{
+            order_status: Coalesce(f'order_stats__{order_status}', 0)
+            for order_status in ORDER_STATUSES
+        })
+
+    def get(self, request):
+        ids = self.get_batch_ids(request)
+        if ids is None:
+            raise ValidationError(
+                {self.ids_param: 'This parameter is required.'}
+            )
+        return self.get_batch_response(self.get_queryset(), ids)
@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+from core.checks import needs_shared_cache
+
+
+@register(Tags.caches)
+def check_idempotency_cache(app_configs, **kwargs):
+    """
+    Refuse a process local idempotency store with several workers, a
+    retry reaching another worker would create a second order.
+    """
+    alias = settings.ORDER_IDEMPOTENCY_CACHE_ALIAS
+    if not needs_shared_cache(alias):
+        return []
+    return [Error(
+        f"The '{alias}' cache holding the Idempotency-Key store is local "
+        'to each worker process.',
+        hint='Set CACHE_BACKEND to a shared backend (Redis, Memcached or '
+        'file based) or run a single worker (WEB_CONCURRENCY=1).',
+        id='orders_app.E001',
+    )]
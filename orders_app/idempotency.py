@@ -0,0 +1,49 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+# Stored while the first request with a key is still running
+PENDING = 'pending'
+
+
+def get_store():
+    return caches[settings.ORDER_IDEMPOTENCY_CACHE_ALIAS]
+
+
+def get_store_key(user_id, key):
+    """
+    Return the store key of a client key, scoped to the user so two
+    clients picking the same key never see each other's orders.
+    """
+    digest = hashlib.sha1(key.encode()).hexdigest()
+    return f'orders:idempotency:{user_id}:{digest}'
+
+
+def claim_key(store_key):
+    """
+    Reserve a key for a new request, for ORDER_IDEMPOTENCY_LOCK_TTL
+    seconds until complete_key() stores the order. Returns None when
+    the key was free, otherwise the stored entry: PENDING or a
+    (request, order id) pair.
+    """
+    store = get_store()
+    if store.add(store_key, PENDING, settings.ORDER_IDEMPOTENCY_LOCK_TTL):
+        return None
+    # An entry expiring in between is treated as still running
+    return store.get(store_key, PENDING)
+
+
+# Remember the order created for the key
+def complete_key(store_key, fingerprint, order_id):
+    get_store().set(
+        store_key, (fingerprint, order_id), settings.ORDER_IDEMPOTENCY_TTL
+    )
+
+
+# Free the key of a request that created nothing, so it can be retried
+def release_key(store_key):
+    get_store().delete(store_key)
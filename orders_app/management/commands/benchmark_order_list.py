@@ -0,0 +1,147 @@
+import random
+import time
+from operator import attrgetter
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Q
+
+from orders_app.api.paginations import (
+    OrderCursorPagination,
+    merge_branches
+)
+from orders_app.models import Order
+
+
+class Command(BaseCommand):
+    """
+    Compare reading a user's orders with the OR across both foreign keys
+    against the merged range scans, for one page of OrderCursorPagination
+    and for the bare list, on seeded orders. All seeded rows are rolled
+    back afterwards.
+    """
+    help = 'Compare the OR and the merged plan of the order list.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--orders', type=int, default=1000000)
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--page-size', type=int, default=20)
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            user = self.seed(options['orders'], options['users'])
+            self.analyze()
+            merged_queryset = Order.objects.filter(
+                Q(customer_user=user) | Q(business_user=user)
+            ).order_by('-created_at', '-id')
+            branches = [
+                Order.objects.filter(customer_user=user).order_by(
+                    '-created_at', '-id'
+                ),
+                Order.objects.filter(business_user=user).order_by(
+                    '-created_at', '-id'
+                ),
+            ]
+            total = merged_queryset.count()
+            self.stdout.write(
+                f"{options['orders']:,} orders, "
+                f'{total:,} of the benchmarked user'
+            )
+            middle = merged_queryset.values_list(
+                'created_at', 'id'
+            )[total // 2]
+            for name, position in (
+                ('first page', None), ('middle page', list(middle))
+            ):
+                timings = [
+                    self.time_page(
+                        merged_queryset, plan_branches, position,
+                        options['page_size'], options['repeat']
+                    )
+                    for plan_branches in (None, branches)
+                ]
+                self.stdout.write(
+                    f'{name}: OR {timings[0]:.2f} ms, '
+                    f'merged {timings[1]:.2f} ms, '
+                    f'{timings[0] / timings[1]:.1f}x'
+                )
+            timings = [
+                self.time_list(read, options['repeat'])
+                for read in (
+                    # Clones, so no run reads the result cache of another
+                    lambda: list(merged_queryset.all()),
+                    lambda: merge_branches(
+                        [branch.all() for branch in branches],
+                        key=attrgetter('created_at', 'id'), reverse=True
+                    ),
+                )
+            ]
+            self.stdout.write(
+                f'bare list: OR {timings[0]:.2f} ms, '
+                f'merged {timings[1]:.2f} ms, '
+                f'{timings[0] / timings[1]:.1f}x'
+            )
+            transaction.set_rollback(True)
+
+    # Average milliseconds to read the whole list
+    def time_list(self, read, repeat):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            read()
+        return (time.perf_counter() - start) / repeat * 1000
+
+    # Average milliseconds to read one page with the given branches
+    def time_page(self, queryset, branches, position, page_size, repeat):
+        paginator = OrderCursorPagination()
+        paginator.branches = branches
+        keys = paginator.keys = paginator.get_keys(queryset)
+        start = time.perf_counter()
+        for _ in range(repeat):
+            rows = paginator.get_rows(
+                queryset, keys, position, False, page_size + 1
+            )
+        elapsed = time.perf_counter() - start
+        assert len(rows) == page_size + 1
+        return elapsed / repeat * 1000
+
+    def analyze(self):
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    # One user takes part in about 2% of the orders in each role
+    # bulk_create skips the signals keeping BusinessOrderStats, which is
+    # fine for rows that are rolled back
+    def seed(self, count, users):
+        User = get_user_model()
+        people = User.objects.bulk_create([
+            User(
+                username=f'benchmark-user-{index}', password='!',
+                user_type='business' if index % 2 else 'customer'
+            )
+            for index in range(users)
+        ])
+        user = people[0]
+        randomizer = random.Random(0)
+        batch_size = 10000
+        for offset in range(0, count, batch_size):
+            orders = []
+            for _ in range(min(batch_size, count - offset)):
+                customer, business = randomizer.sample(people, 2)
+                draw = randomizer.random()
+                if draw < 0.02:
+                    customer = user if business != user else customer
+                elif draw < 0.04:
+                    business = user if customer != user else business
+                orders.append(Order(
+                    customer_user=customer, business_user=business,
+                    title='Logo Design', revisions=1,
+                    delivery_time_in_days=3, price=100, features=[],
+                    offer_type='basic',
+                    status=randomizer.choice(
+                        ('in_progress', 'completed', 'cancelled')
+                    )
+                ))
+            Order.objects.bulk_create(orders)
+        return user
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from orders_app.stats import find_drift, recount
+
+
+class Command(BaseCommand):
+    """
+    Rebuild the per business order counters from the orders, or with
+    --check only report the business users whose counters drifted.
+    """
+    help = 'Rebuild or check the per business order counters.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Report drifted counters and exit non-zero, write nothing.'
+        )
+        parser.add_argument(
+            '--business-id',
+            type=int,
+            action='append',
+            dest='business_ids',
+            help='Only this business user, may be repeated.'
+        )
+
+    def handle(self, *args, **options):
+        business_ids = options['business_ids']
+        if not options['check']:
+            written = recount(business_ids)
+            self.stdout.write(f'Recounted {written} business users.')
+            return
+        drift = find_drift(business_ids)
+        for business_id, (stored, actual) in sorted(drift.items()):
+            self.stdout.write(
+                f'business user {business_id}: stored {stored}, '
+                f'actual {actual}'
+            )
+        if drift:
+            raise CommandError(
+                f'{len(drift)} business users have drifted order counters, '
+                'run recount_order_stats to rebuild them.'
+            )
+        self.stdout.write('Order counters are consistent.')
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.7 on 2026-10-18 20:57
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_order_stats(apps, schema_editor):
+    Order = apps.get_model('orders_app', 'Order')
+    BusinessOrderStats = apps.get_model('orders_app', 'BusinessOrderStats')
+    stats = {}
+    for row in Order.objects.filter(
+        status__in=('in_progress', 'completed', 'cancelled')
+    ).values('business_user_id', 'status').annotate(
+        total=Count('id')
+    ).order_by():
+        business_stats = stats.setdefault(
+            row['business_user_id'],
+            BusinessOrderStats(business_user_id=row['business_user_id'])
+        )
+        setattr(business_stats, row['status'], row['total'])
+    BusinessOrderStats.objects.bulk_create(stats.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_app', '0002_customuser_user_type_index'),
+        ('orders_app', '0005_order_cursor_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BusinessOrderStats',
+            fields=[
+                ('business_user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='order_stats', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('in_progress', models.IntegerField(default=0)),
+                ('completed', models.IntegerField(default=0)),
+                ('cancelled', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(
+            backfill_order_stats, migrations.RunPython.noop
+        ),
+    ]
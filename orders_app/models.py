@@ -2,12 +2,26 @@ from django.db import models
 from django.conf import settings
 
 
+ORDER_STATUSES = ('in_progress', 'completed', 'cancelled')
+
+
 class Order(models.Model):
     """
     Model representing an order in the system.
+    Orders are counted per status in BusinessOrderStats from the model
+    signals. QuerySet.update() and bulk_create() send none, so they
+    leave the counters behind until recount_order_stats runs.
     """
-    customer_user = models.ForeignKey(settings.AUTH_USER_MODEL, related_name='customer_orders', on_delete=models.CASCADE)
-    business_user = models.ForeignKey(settings.AUTH_USER_MODEL, related_name='business_orders', on_delete=models.CASCADE)
+    # The composite indexes below lead with the user columns and serve
+    # their lookups, so the foreign keys get no index of their own
+    customer_user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, related_name='customer_orders',
+        on_delete=models.CASCADE, db_index=False
+    )
+    business_user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, related_name='business_orders',
+        on_delete=models.CASCADE, db_index=False
+    )
     title = models.CharField(max_length=255)
     revisions = models.IntegerField()
     delivery_time_in_days = models.IntegerField()
@@ -18,5 +32,59 @@ class Order(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Order lists of a user, newest first, in cursor order
+            models.Index(
+                fields=['customer_user', '-created_at', '-id'],
+                name='order_customer_created_idx'
+            ),
+            models.Index(
+                fields=['business_user', '-created_at', '-id'],
+                name='order_business_created_idx'
+            ),
+            # Order lists filtered by status, the business one also
+            # serves the order counts per business user and status
+            models.Index(
+                fields=['customer_user', 'status', '-created_at', '-id'],
+                name='order_customer_status_idx'
+            ),
+            models.Index(
+                fields=['business_user', 'status', '-created_at', '-id'],
+                name='order_business_status_idx'
+            ),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored counter bucket, so saves can move it
+        instance._loaded_bucket = (
+            instance.__dict__.get('business_user_id'),
+            instance.__dict__.get('status')
+        )
+        return instance
+
     def __str__(self):
         return self.title
+
+
+class BusinessOrderStats(models.Model):
+    """
+    Order counts of a business user per status, kept in step with the
+    orders by orders_app.signals and rebuilt by recount_order_stats.
+    Views write orders in a transaction, so an order and its counters
+    are committed together.
+    """
+    business_user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='order_stats',
+        primary_key=True
+    )
+    in_progress = models.IntegerField(default=0)
+    completed = models.IntegerField(default=0)
+    cancelled = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f'Order stats of user {self.business_user_id}'
@@ -0,0 +1,40 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from orders_app.models import Order
+from orders_app.stats import add_to_counts, recount
+
+
+@receiver(post_save, sender=Order)
+def count_order_on_save(sender, instance, created, update_fields=None,
+                        **kwargs):
+    """
+    Move the order between the counters of its business user when it
+    is created or its status or business user changes.
+    """
+    bucket = (instance.business_user_id, instance.status)
+    if created:
+        add_to_counts(*bucket, 1)
+    elif update_fields is None or (
+        {'status', 'business_user', 'business_user_id'} & set(update_fields)
+    ):
+        loaded = getattr(instance, '_loaded_bucket', (None, None))
+        if None in loaded:
+            # The stored bucket is unknown, count the business user again
+            recount([instance.business_user_id])
+        elif loaded != bucket:
+            add_to_counts(*loaded, -1)
+            add_to_counts(*bucket, 1)
+    instance._loaded_bucket = bucket
+
+
+@receiver(post_delete, sender=Order)
+def count_order_on_delete(sender, instance, **kwargs):
+    """
+    Take deleted orders off the counters of their business user.
+    """
+    loaded = getattr(instance, '_loaded_bucket', (None, None))
+    if None in loaded:
+        recount([instance.business_user_id])
+    else:
+        add_to_counts(*loaded, -1)
@@ -0,0 +1,101 @@
+from django.db import transaction
+from django.db.models import Count, F
+
+from orders_app.models import ORDER_STATUSES, BusinessOrderStats, Order
+
+
+def add_to_counts(business_user_id, status, delta):
+    """
+    Add delta to the counter of a business user and status, creating
+    the counter row on the first order. Statuses outside
+    ORDER_STATUSES are not counted. A missing row is left missing when
+    counting down, it was deleted with its business user.
+    """
+    if business_user_id is None or status not in ORDER_STATUSES:
+        return
+    rows = BusinessOrderStats.objects.filter(pk=business_user_id)
+    if not rows.update(**{status: F(status) + delta}) and delta > 0:
+        BusinessOrderStats.objects.get_or_create(pk=business_user_id)
+        rows.update(**{status: F(status) + delta})
+
+
+def count_orders(business_user_ids=None):
+    """
+    Count the orders per business user and status with one GROUP BY.
+    Returns {business user id: {status: count}}.
+    """
+    orders = Order.objects.filter(status__in=ORDER_STATUSES)
+    if business_user_ids is not None:
+        orders = orders.filter(business_user_id__in=business_user_ids)
+    counts = {}
+    for row in orders.values('business_user_id', 'status').annotate(
+        total=Count('id')
+    ).order_by():
+        business_counts = counts.setdefault(
+            row['business_user_id'], dict.fromkeys(ORDER_STATUSES, 0)
+        )
+        business_counts[row['status']] = row['total']
+    return counts
+
+
+def get_stored_counts(business_user_ids=None):
+    """
+    Read the counters, as {business user id: {status: count}}.
+    """
+    stats = BusinessOrderStats.objects.all()
+    if business_user_ids is not None:
+        stats = stats.filter(pk__in=business_user_ids)
+    return {
+        row.pop('business_user_id'): row
+        for row in stats.values('business_user_id', *ORDER_STATUSES)
+    }
+
+
+def find_drift(business_user_ids=None):
+    """
+    Compare the counters with the orders. Returns {business user id:
+    (stored counts, actual counts)} for every business user that
+    drifted, a missing counter row counts as all zero.
+    """
+    zero = dict.fromkeys(ORDER_STATUSES, 0)
+    actual = count_orders(business_user_ids)
+    stored = get_stored_counts(business_user_ids)
+    return {
+        business_user_id: (
+            stored.get(business_user_id, zero),
+            actual.get(business_user_id, zero)
+        )
+        for business_user_id in actual.keys() | stored.keys()
+        if stored.get(business_user_id, zero)
+        != actual.get(business_user_id, zero)
+    }
+
+
+def recount(business_user_ids=None):
+    """
+    Rebuild the counters from the orders. The counter rows are locked
+    first, so orders written meanwhile wait and add to the new counts.
+    Returns the number of counter rows written.
+    """
+    with transaction.atomic():
+        stats = BusinessOrderStats.objects.select_for_update()
+        if business_user_ids is not None:
+            stats = stats.filter(pk__in=business_user_ids)
+        existing = list(stats.values_list('pk', flat=True))
+        counts = count_orders(business_user_ids)
+        zero = dict.fromkeys(ORDER_STATUSES, 0)
+        rows = [
+            BusinessOrderStats(
+                pk=business_user_id,
+                **counts.get(business_user_id, zero)
+            )
+            for business_user_id in set(existing) | counts.keys()
+        ]
+        BusinessOrderStats.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=['business_user'],
+            update_fields=list(ORDER_STATUSES),
+            batch_size=1000
+        )
+    return len(rows)
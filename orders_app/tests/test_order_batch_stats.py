@@ -0,0 +1,99 @@
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+
+from rest_framework.test import APITestCase
+
+from orders_app.models import Order
+from profiles_app.models import Profile
+
+
+class OrderStatsBatchTest(APITestCase):
+    """
+    Test cases for the order counts of several business users at once.
+    """
+    def setUp(self):
+        User = get_user_model()
+        self.businesses = []
+        for index in range(3):
+            business = User.objects.create_user(
+                username=f'business{index}', password='testpass'
+            )
+            Profile.objects.create(
+                user=business, username=f'business{index}', type='business',
+                email=f'business{index}@example.com'
+            )
+            self.businesses.append(business)
+        self.customer = User.objects.create_user(
+            username='customer', password='testpass'
+        )
+        Profile.objects.create(
+            user=self.customer, username='customer', type='customer',
+            email='customer@example.com'
+        )
+        statuses = ('in_progress', 'in_progress', 'completed', 'cancelled')
+        for business, count in zip(self.businesses, (4, 1)):
+            for order_status in statuses[:count]:
+                Order.objects.create(
+                    customer_user=self.customer, business_user=business,
+                    title='Logo Design', revisions=1,
+                    delivery_time_in_days=3, price=100, features=[],
+                    offer_type='basic', status=order_status
+                )
+        self.client.force_authenticate(user=self.customer)
+
+    def get_stats(self, business_ids):
+        return self.client.get(
+            '/api/order-stats/', {'business_ids': business_ids}
+        )
+
+    # Test cases for the counts of several businesses in one query
+    def test_stats(self):
+        first, second, third = [business.pk for business in self.businesses]
+        with self.assertNumQueries(1):
+            response = self.get_stats(f'{third},{first},{second},{first}')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {
+            'results': [
+                {
+                    'business_user_id': third, 'in_progress': 0,
+                    'completed': 0, 'cancelled': 0
+                },
+                {
+                    'business_user_id': first, 'in_progress': 2,
+                    'completed': 1, 'cancelled': 1
+                },
+                {
+                    'business_user_id': second, 'in_progress': 1,
+                    'completed': 0, 'cancelled': 0
+                },
+            ],
+            'missing': [],
+        })
+
+    # Test cases for unknown and non business ids, missing like the
+    # order count endpoint answers them with 404
+    def test_missing(self):
+        first = self.businesses[0].pk
+        response = self.get_stats(f'{first},{self.customer.pk},9999')
+        self.assertEqual(
+            [row['business_user_id'] for row in response.json()['results']],
+            [first]
+        )
+        self.assertEqual(
+            response.json()['missing'], [self.customer.pk, 9999]
+        )
+        response = self.client.get(f'/api/order-count/{self.customer.pk}/')
+        self.assertEqual(response.status_code, 404)
+
+    # Test cases for invalid id lists
+    @override_settings(BATCH_LOOKUP_MAX_IDS=2)
+    def test_invalid_ids(self):
+        response = self.client.get('/api/order-stats/')
+        self.assertEqual(
+            response.json(), {'business_ids': 'This parameter is required.'}
+        )
+        self.assertEqual(self.get_stats('1,x').status_code, 400)
+        response = self.get_stats('1,2,3')
+        self.assertEqual(
+            response.json(), {'business_ids': 'At most 2 ids are allowed.'}
+        )
@@ -0,0 +1,143 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.models import Q
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from rest_framework.test import APITestCase
+
+from orders_app.models import Order
+
+
+class OrderCursorPaginationTest(APITestCase):
+    """
+    Test cases for the cursor paginated order list and its filters.
+    """
+    def setUp(self):
+        User = get_user_model()
+        self.user = User.objects.create_user(
+            username='business', password='testpass', user_type='business'
+        )
+        self.other = User.objects.create_user(
+            username='customer', password='testpass', user_type='customer'
+        )
+        now = timezone.now()
+        statuses = ('in_progress', 'completed', 'cancelled')
+        for index in range(9):
+            customer, business = (
+                (self.other, self.user) if index % 3 else
+                (self.user, self.other)
+            )
+            order = Order.objects.create(
+                customer_user=customer, business_user=business,
+                title=f'Order {index}', revisions=1,
+                delivery_time_in_days=3, price=100, features=[],
+                offer_type='basic', status=statuses[index % 3]
+            )
+            # Two orders share each timestamp to exercise the id tiebreak
+            Order.objects.filter(pk=order.pk).update(
+                created_at=now - timedelta(minutes=index // 2)
+            )
+        self.client.force_authenticate(user=self.user)
+
+    def expected_ids(self, **filters):
+        return list(Order.objects.filter(**filters).order_by(
+            '-created_at', '-id'
+        ).values_list('id', flat=True))
+
+    # Walk all pages forward and back
+    def collect(self, params):
+        response = self.client.get(
+            '/api/orders/', {**params, 'pagination': 'cursor'}
+        )
+        self.assertEqual(response.status_code, 200)
+        pages = [response.json()]
+        while pages[-1]['next']:
+            pages.append(self.client.get(pages[-1]['next']).json())
+        backwards = [pages[-1]]
+        while backwards[-1]['previous']:
+            backwards.append(self.client.get(backwards[-1]['previous']).json())
+        ids = [order['id'] for page in pages for order in page['results']]
+        back_ids = [
+            order['id'] for page in reversed(backwards)
+            for order in page['results']
+        ]
+        self.assertEqual(ids, back_ids)
+        return ids
+
+    # Test cases for pages newest first with ties on created_at
+    def test_pages(self):
+        ids = self.collect({'page_size': 2})
+        self.assertEqual(ids, self.expected_ids())
+
+    # Test cases for the role and status filters
+    def test_filters(self):
+        self.assertEqual(
+            self.collect({'role': 'business', 'page_size': 2}),
+            self.expected_ids(business_user=self.user)
+        )
+        self.assertEqual(
+            self.collect({'role': 'customer', 'status': 'in_progress'}),
+            self.expected_ids(customer_user=self.user, status='in_progress')
+        )
+        self.assertEqual(
+            self.collect({'status': 'completed', 'page_size': 1}),
+            self.expected_ids(business_user=self.user, status='completed')
+        )
+
+    # Test cases for reading both roles with one range scan each
+    def test_branches_merged(self):
+        # An order the user placed with themselves is in both branches
+        Order.objects.create(
+            customer_user=self.user, business_user=self.user,
+            title='Own order', revisions=1, delivery_time_in_days=3,
+            price=100, features=[], offer_type='basic'
+        )
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(
+                '/api/orders/', {'pagination': 'cursor', 'page_size': 3}
+            )
+        queries = [query['sql'] for query in context.captured_queries]
+        self.assertEqual(len(queries), 2)
+        for sql in queries:
+            self.assertNotIn(' OR ', sql)
+            self.assertIn('LIMIT 4', sql)
+        ids = self.collect({'page_size': 3})
+        self.assertEqual(len(ids), len(set(ids)))
+        self.assertEqual(ids, list(Order.objects.filter(
+            Q(customer_user=self.user) | Q(business_user=self.user)
+        ).order_by('-created_at', '-id').values_list('id', flat=True)))
+
+    # Test cases for rejecting unknown filter values
+    def test_invalid_filters(self):
+        response = self.client.get('/api/orders/', {'role': 'admin'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json(), {'role': 'Must be one of: customer, business.'}
+        )
+        response = self.client.get('/api/orders/', {'status': 'shipped'})
+        self.assertEqual(response.status_code, 400)
+
+    # Test cases for the bare list of requests without ?pagination=cursor
+    def test_bare_list(self):
+        response = self.client.get('/api/orders/', {'role': 'business'})
+        self.assertEqual(
+            [order['id'] for order in response.json()],
+            self.expected_ids(business_user=self.user)
+        )
+        Order.objects.create(
+            customer_user=self.user, business_user=self.user,
+            title='Own order', revisions=1, delivery_time_in_days=3,
+            price=100, features=[], offer_type='basic'
+        )
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/api/orders/')
+        self.assertEqual(len(context.captured_queries), 2)
+        for query in context.captured_queries:
+            self.assertNotIn(' OR ', query['sql'])
+        self.assertEqual(
+            [order['id'] for order in response.json()],
+            self.expected_ids(pk__in=Order.objects.values('pk'))
+        )
@@ -0,0 +1,167 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from offers_app.models import Offer, OfferDetail
+from orders_app import idempotency
+from orders_app.checks import check_idempotency_cache
+from orders_app.models import Order
+from profiles_app.models import Profile
+
+
+class OrderCreateIdempotencyTest(APITestCase):
+    """
+    Test cases for creating orders in one query and for retries with
+    an Idempotency-Key header.
+    """
+    def setUp(self):
+        cache.clear()
+        User = get_user_model()
+        self.customer = User.objects.create_user(
+            username='customer_user', password='customerpass'
+        )
+        self.business = User.objects.create_user(
+            username='business_user', password='businesspass'
+        )
+        Profile.objects.create(
+            user=self.customer, username='customer', type='customer',
+            email='customer@example.com'
+        )
+        Profile.objects.create(
+            user=self.business, username='business', type='business',
+            email='business@example.com'
+        )
+        token = Token.objects.create(user=self.customer)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+        offer = Offer.objects.create(
+            user=self.business, title='Logo Design', description='Text'
+        )
+        self.offer_detail = OfferDetail.objects.create(
+            offer=offer, title='Logo Design', revisions=3,
+            delivery_time_in_days=5, price=150, features=['Logo Design'],
+            offer_type='basic'
+        )
+
+    def post_order(self, key=None, offer_detail_id=None):
+        headers = {'Idempotency-Key': key} if key is not None else {}
+        return self.client.post('/api/orders/', {
+            'offer_detail_id': offer_detail_id or self.offer_detail.id
+        }, format='json', headers=headers)
+
+    # Test cases for one query reading the token, user, profile and one
+    # reading the offer detail with its business user
+    def test_create_queries(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.post_order()
+        self.assertEqual(response.status_code, 201)
+        # Reads of the order counters are covered by their own tests
+        selects = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('SELECT')
+            and 'orders_app_businessorderstats' not in query['sql']
+        ]
+        self.assertEqual(len(selects), 2)
+        self.assertIn('profiles_app_profile', selects[0])
+        self.assertIn('offers_app_offer', selects[1])
+        order = Order.objects.get()
+        self.assertEqual(order.business_user, self.business)
+        self.assertEqual(order.features, ['Logo Design'])
+
+    # Test cases for retries returning the original order
+    def test_retry_returns_original_order(self):
+        first = self.post_order('checkout-1')
+        self.assertEqual(first.status_code, 201)
+        with CaptureQueriesContext(connection) as context:
+            retry = self.post_order('checkout-1')
+        self.assertEqual(retry.status_code, 201)
+        self.assertEqual(retry.json(), first.json())
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertFalse(any(
+            'INSERT' in query['sql'] for query in context.captured_queries
+        ))
+        self.assertEqual(Order.objects.count(), 1)
+        self.assertEqual(self.post_order('checkout-2').status_code, 201)
+        self.assertEqual(Order.objects.count(), 2)
+
+    # Test cases for keys scoped to the user
+    def test_keys_per_user(self):
+        self.post_order('checkout-1')
+        other = get_user_model().objects.create_user(
+            username='other', password='otherpass'
+        )
+        Profile.objects.create(
+            user=other, username='other', type='customer',
+            email='other@example.com'
+        )
+        self.client.credentials()
+        self.client.force_authenticate(user=other)
+        response = self.post_order('checkout-1')
+        self.assertNotIn('Idempotent-Replayed', response)
+        self.assertEqual(Order.objects.count(), 2)
+
+    # Test cases for reusing a key for another request, or while the
+    # first request still runs
+    def test_key_conflicts(self):
+        other_detail = OfferDetail.objects.create(
+            offer=self.offer_detail.offer, title='Logo Premium',
+            revisions=5, delivery_time_in_days=7, price=300, features=[],
+            offer_type='premium'
+        )
+        self.post_order('checkout-1')
+        response = self.post_order('checkout-1', other_detail.id)
+        self.assertEqual(response.status_code, 422)
+        with mock.patch(
+            'orders_app.api.views.claim_key', return_value='pending'
+        ):
+            response = self.post_order('checkout-2')
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(Order.objects.count(), 1)
+
+    # Test cases for failed requests leaving the key free for a retry
+    def test_failure_releases_key(self):
+        response = self.post_order('checkout-1', 9999)
+        self.assertEqual(response.status_code, 404)
+        with mock.patch.object(
+            Order.objects, 'create', side_effect=RuntimeError
+        ):
+            with self.assertRaises(RuntimeError):
+                self.post_order('checkout-2')
+        self.assertEqual(self.post_order('checkout-2').status_code, 201)
+        self.assertEqual(self.post_order('x' * 256).status_code, 400)
+
+    # Test cases for the short lock of a running request and the long
+    # lifetime of the stored order
+    @override_settings(
+        ORDER_IDEMPOTENCY_LOCK_TTL=90, ORDER_IDEMPOTENCY_TTL=86400
+    )
+    def test_key_lifetimes(self):
+        store = idempotency.get_store()
+        with mock.patch.object(store, 'add', wraps=store.add) as add, \
+                mock.patch.object(store, 'set', wraps=store.set) as store_set:
+            self.post_order('checkout-1')
+        self.assertEqual(add.call_args.args[1:], (idempotency.PENDING, 90))
+        self.assertEqual(store_set.call_args.args[2], 86400)
+
+    # Test cases for refusing a process local store with several workers
+    def test_shared_cache_check(self):
+        with override_settings(DEBUG=False, WEB_CONCURRENCY=2):
+            errors = check_idempotency_cache(None)
+        self.assertEqual([error.id for error in errors], ['orders_app.E001'])
+        shared = {'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': '/tmp/coderr-cache',
+        }}
+        for overrides in (
+            {'DEBUG': False, 'WEB_CONCURRENCY': 1},
+            {'DEBUG': True, 'WEB_CONCURRENCY': 2},
+            {'DEBUG': False, 'WEB_CONCURRENCY': 2, 'CACHES': shared},
+        ):
+            with override_settings(**overrides):
+                self.assertEqual(check_idempotency_cache(None), [])
@@ -0,0 +1,68 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from rest_framework.test import APITestCase
+
+from orders_app.models import Order
+
+
+class OrderSparseFieldsTest(APITestCase):
+    """
+    Test cases for ?fields= and ?omit= on the order endpoints.
+    """
+    def setUp(self):
+        self.customer = get_user_model().objects.create_user(
+            username='customer',
+            password='testpass',
+            user_type='customer'
+        )
+        self.business = get_user_model().objects.create_user(
+            username='business',
+            password='testpass',
+            user_type='business'
+        )
+        self.order = Order.objects.create(
+            customer_user=self.customer,
+            business_user=self.business,
+            title='Logo Design',
+            revisions=2,
+            delivery_time_in_days=5,
+            price=150,
+            features=['Logo Design', 'Visitenkarte'],
+            offer_type='basic'
+        )
+        self.client.force_authenticate(user=self.customer)
+
+    # Test cases for listing only id and status
+    def test_list_fields(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/api/orders/', {'fields': 'id,status'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(), [{'id': self.order.id, 'status': 'in_progress'}]
+        )
+        sql = context.captured_queries[-1]['sql']
+        self.assertNotIn('"features"', sql)
+        self.assertNotIn('"title"', sql)
+
+    # Test cases for omitting fields of a single order
+    def test_retrieve_omit(self):
+        response = self.client.get(
+            f'/api/orders/{self.order.id}/', {'omit': 'features,title'}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('features', response.json())
+        self.assertEqual(response.json()['price'], 150)
+
+    # Test cases for writes returning all fields
+    def test_patch_ignores_fieldset(self):
+        self.client.force_authenticate(user=self.business)
+        response = self.client.patch(
+            f'/api/orders/{self.order.id}/?fields=id',
+            {'status': 'completed'},
+            format='json'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['status'], 'completed')
+        self.assertIn('title', response.json())
@@ -0,0 +1,175 @@
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.db import DatabaseError
+
+from rest_framework.test import APITestCase
+
+from offers_app.models import Offer, OfferDetail
+from orders_app.models import BusinessOrderStats, Order
+from orders_app.stats import find_drift
+from profiles_app.models import Profile
+
+
+class BusinessOrderStatsTest(APITestCase):
+    """
+    Test cases for the per business order counters, the count endpoints
+    reading them and the recount command.
+    """
+    def setUp(self):
+        User = get_user_model()
+        self.business = User.objects.create_user(
+            username='business', password='testpass'
+        )
+        self.customer = User.objects.create_user(
+            username='customer', password='testpass'
+        )
+        self.admin = User.objects.create_user(
+            username='admin', password='testpass', is_staff=True
+        )
+        Profile.objects.create(
+            user=self.business, username='business', type='business',
+            email='business@example.com'
+        )
+        Profile.objects.create(
+            user=self.customer, username='customer', type='customer',
+            email='customer@example.com'
+        )
+
+    def make_order(self, **kwargs):
+        return Order(
+            customer_user=self.customer, business_user=self.business,
+            title='Logo Design', revisions=1, delivery_time_in_days=3,
+            price=100, features=[], offer_type='basic', **kwargs
+        )
+
+    def get_counts(self):
+        return BusinessOrderStats.objects.filter(
+            pk=self.business.pk
+        ).values('in_progress', 'completed', 'cancelled').first()
+
+    # Test cases for counters following creates, status changes and deletes
+    def test_counters_follow_orders(self):
+        orders = [self.make_order() for _ in range(3)]
+        for order in orders:
+            order.save()
+        self.assertEqual(
+            self.get_counts(),
+            {'in_progress': 3, 'completed': 0, 'cancelled': 0}
+        )
+        self.client.force_authenticate(user=self.business)
+        self.client.patch(
+            f'/api/orders/{orders[0].pk}/', {'status': 'completed'},
+            format='json'
+        )
+        self.client.patch(
+            f'/api/orders/{orders[1].pk}/?fields=id', {'status': 'cancelled'},
+            format='json'
+        )
+        self.client.force_authenticate(user=self.admin)
+        self.client.delete(f'/api/orders/{orders[2].pk}/')
+        self.assertEqual(
+            self.get_counts(),
+            {'in_progress': 0, 'completed': 1, 'cancelled': 1}
+        )
+        # Orders deleted with their customer leave the counters too
+        self.customer.delete()
+        self.assertEqual(
+            self.get_counts(),
+            {'in_progress': 0, 'completed': 0, 'cancelled': 0}
+        )
+        self.assertEqual(find_drift(), {})
+
+    # Test cases for order writes rolling back with a failed counter
+    # update
+    def test_writes_roll_back_with_counters(self):
+        order = self.make_order()
+        order.save()
+        offer = Offer.objects.create(
+            user=self.business, title='Logo', description='Logo'
+        )
+        detail = OfferDetail.objects.create(
+            offer=offer, title='Basic', revisions=1,
+            delivery_time_in_days=3, price=100, features=[],
+            offer_type='basic'
+        )
+        failure = DatabaseError('counter update failed')
+        with patch('orders_app.signals.add_to_counts', side_effect=failure):
+            self.client.force_authenticate(user=self.customer)
+            with self.assertRaises(DatabaseError):
+                self.client.post(
+                    '/api/orders/', {'offer_detail_id': detail.pk},
+                    format='json'
+                )
+            self.client.force_authenticate(user=self.business)
+            with self.assertRaises(DatabaseError):
+                self.client.patch(
+                    f'/api/orders/{order.pk}/', {'status': 'completed'},
+                    format='json'
+                )
+            self.client.force_authenticate(user=self.admin)
+            with self.assertRaises(DatabaseError):
+                self.client.delete(f'/api/orders/{order.pk}/')
+        self.assertEqual(
+            list(Order.objects.values_list('pk', 'status')),
+            [(order.pk, 'in_progress')]
+        )
+        self.assertEqual(find_drift(), {})
+
+    # Test cases for deleting a business user together with its orders
+    # and counters
+    def test_delete_business_user(self):
+        for _ in range(2):
+            self.make_order().save()
+        self.business.delete()
+        self.assertFalse(Order.objects.exists())
+        self.assertFalse(BusinessOrderStats.objects.exists())
+        self.assertEqual(find_drift(), {})
+
+    # Test cases for the count endpoints reading one row
+    def test_count_endpoints(self):
+        self.make_order().save()
+        self.make_order(status='completed').save()
+        self.client.force_authenticate(user=self.customer)
+        with self.assertNumQueries(1):
+            response = self.client.get(f'/api/order-count/{self.business.pk}/')
+        self.assertEqual(response.json(), {'order_count': 1})
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                f'/api/completed-order-count/{self.business.pk}/'
+            )
+        self.assertEqual(response.json(), {'completed_order_count': 1})
+        # Business users without orders have no counter row yet
+        BusinessOrderStats.objects.all().delete()
+        response = self.client.get(f'/api/order-count/{self.business.pk}/')
+        self.assertEqual(response.json(), {'order_count': 0})
+        response = self.client.get(f'/api/order-count/{self.customer.pk}/')
+        self.assertEqual(response.status_code, 404)
+        response = self.client.get(
+            f'/api/completed-order-count/{self.customer.pk}/'
+        )
+        self.assertEqual(response.json(), {'completed_order_count': 0})
+        response = self.client.get('/api/completed-order-count/9999/')
+        self.assertEqual(response.status_code, 404)
+
+    # Test cases for checking and rebuilding drifted counters
+    def test_recount_command(self):
+        # Bulk writes bypass the signals keeping the counters
+        Order.objects.bulk_create([self.make_order() for _ in range(2)])
+        Order.objects.filter(pk=Order.objects.first().pk).update(
+            status='completed'
+        )
+        out = StringIO()
+        with self.assertRaises(CommandError):
+            call_command('recount_order_stats', '--check', stdout=out)
+        self.assertIn(f'business user {self.business.pk}', out.getvalue())
+        call_command('recount_order_stats', stdout=StringIO())
+        self.assertEqual(
+            self.get_counts(),
+            {'in_progress': 1, 'completed': 1, 'cancelled': 0}
+        )
+        out = StringIO()
+        call_command('recount_order_stats', '--check', stdout=out)
+        self.assertIn('consistent', out.getvalue())
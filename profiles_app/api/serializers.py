@@ -1,21 +1,30 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 
+from core.renditions import get_srcset
+from core.serializers import (
+    CheckedFileField,
+    SparseFieldsetMixin,
+    SrcsetField,
+    get_sparse_fields
+)
 from profiles_app.models import Profile
 
 
-class ProfileSerializer(serializers.ModelSerializer):
+class ProfileSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Serializer for the Profile model.
     Ensures that certain fields are never null in the response,
     but are set to an empty string ('') if no value is present.
     """
+    file = CheckedFileField(max_length=100, required=False, allow_null=True)
+    file_srcset = SrcsetField('file', 'file_renditions')
 
     class Meta:
         model = Profile
         fields = [
             'user', 'username', 'first_name', 'last_name', 'file',
-            'location', 'tel', 'description', 'working_hours',
+            'file_srcset', 'location', 'tel', 'description', 'working_hours',
             'type', 'email', 'created_at'
         ]
 
@@ -26,7 +35,7 @@ class ProfileSerializer(serializers.ModelSerializer):
             'first_name', 'last_name', 'location',
             'tel', 'description', 'working_hours'
         ]:
-            if data.get(field) is None:
+            if field in data and data[field] is None:
                 data[field] = ''
         return data
 
@@ -47,39 +56,64 @@ class UserProfileSerializer(serializers.ModelSerializer):
     Serializer for User with Profile data.
     Returns all users (with or without profile).
     """
+    # Read each key from the profile, only selected keys are read
+    profile_values = {
+        'user': lambda profile: profile.user_id,
+        'username': lambda profile: profile.username,
+        'first_name': lambda profile: profile.first_name or '',
+        'last_name': lambda profile: profile.last_name or '',
+        'file': lambda profile: profile.file.url if profile.file else None,
+        'file_srcset': lambda profile: get_srcset(
+            profile.file.name, profile.file_renditions, profile.file.storage.url
+        ),
+        'location': lambda profile: profile.location or '',
+        'tel': lambda profile: profile.tel or '',
+        'description': lambda profile: profile.description or '',
+        'working_hours': lambda profile: profile.working_hours or '',
+        'type': lambda profile: profile.type,
+    }
+    # Default values for users without a profile
+    user_values = {
+        'user': lambda user: user.id,
+        'username': lambda user: user.username,
+        'first_name': lambda user: '',
+        'last_name': lambda user: '',
+        'file': lambda user: None,
+        'file_srcset': lambda user: {},
+        'location': lambda user: '',
+        'tel': lambda user: '',
+        'description': lambda user: '',
+        'working_hours': lambda user: '',
+        'type': lambda user: user.user_type,
+    }
 
     class Meta:
         model = get_user_model()
         fields = ['id']
 
+    @classmethod
+    def get_sparse_field_names(cls):
+        return list(cls.profile_values)
+
+    # Selected keys, parsed once for all users of the response
+    def get_selected_fields(self):
+        if not hasattr(self, 'selected_fields'):
+            fields = get_sparse_fields(
+                self.context.get('request'), self.get_sparse_field_names()
+            )
+            if fields is None:
+                fields = self.get_sparse_field_names()
+            self.selected_fields = fields
+        return self.selected_fields
+
     def to_representation(self, obj):
         """
         Return profile data if it exists, otherwise return default values.
         """
         try:
-            profile = obj.profile
-            return {
-                'user': profile.user.id,
-                'username': profile.username,
-                'first_name': profile.first_name or '',
-                'last_name': profile.last_name or '',
-                'file': profile.file.url if profile.file else None,
-                'location': profile.location or '',
-                'tel': profile.tel or '',
-                'description': profile.description or '',
-                'working_hours': profile.working_hours or '',
-                'type': profile.type
-            }
+            source, values = obj.profile, self.profile_values
         except Profile.DoesNotExist:
-            return {
-                'user': obj.id,
-                'username': obj.username,
-                'first_name': '',
-                'last_name': '',
-                'file': None,
-                'location': '',
-                'tel': '',
-                'description': '',
-                'working_hours': '',
-                'type': obj.user_type
-            }
+            source, values = obj, self.user_values
+        return {
+            name: values[name](source) for name in self.get_selected_fields()
+        }
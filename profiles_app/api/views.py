@@ -3,10 +3,19 @@ from django.contrib.auth import get_user_model
 from rest_framework.generics import RetrieveUpdateAPIView, ListAPIView
 from rest_framework.permissions import IsAuthenticated
 
+from core.serializers import get_concrete_fields, get_sparse_fields
 from profiles_app.models import Profile
 from .serializers import ProfileSerializer, UserProfileSerializer
 
 
+# Profile columns of the selected fields
+def get_profile_columns(fields):
+    columns = get_concrete_fields(Profile, fields)
+    if 'file_srcset' in fields:
+        columns.extend(('file', 'file_renditions'))
+    return columns
+
+
 class ProfileDetailView(RetrieveUpdateAPIView):
     """
     View to retrieve and update a user profile.
@@ -16,6 +25,16 @@ class ProfileDetailView(RetrieveUpdateAPIView):
     serializer_class = ProfileSerializer
     permission_classes = [IsAuthenticated]
 
+    # Load only the columns of the selected fields
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        fields = get_sparse_fields(
+            self.request, ProfileSerializer.get_sparse_field_names()
+        )
+        if fields is not None:
+            queryset = queryset.only(*get_profile_columns(fields))
+        return queryset
+
     def get_object(self):
         """
         Ensure that only the owner can update their profile.
@@ -30,6 +49,27 @@ class ProfileDetailView(RetrieveUpdateAPIView):
         return obj
 
 
+def get_user_profiles(request, user_type):
+    """
+    Return the users of a type with their profiles, loading only the
+    profile columns of the selected fields.
+    """
+    User = get_user_model()
+    queryset = User.objects.filter(
+        user_type=user_type
+    ).select_related('profile').order_by('id')
+    fields = get_sparse_fields(
+        request, UserProfileSerializer.get_sparse_field_names()
+    )
+    if fields is None:
+        return queryset
+    columns = get_profile_columns(fields)
+    return queryset.only(
+        'username', 'user_type',
+        *[f'profile__{column}' for column in columns]
+    )
+
+
 class BusinessProfileListView(ListAPIView):
     """
     View to retrieve business profiles.
@@ -40,8 +80,7 @@ class BusinessProfileListView(ListAPIView):
     pagination_class = None
 
     def get_queryset(self):
-        User = get_user_model()
-        return User.objects.filter(user_type='business').order_by('id')
+        return get_user_profiles(self.request, 'business')
 
 
 class CustomerProfileListView(ListAPIView):
@@ -54,5 +93,4 @@ class CustomerProfileListView(ListAPIView):
     pagination_class = None
 
     def get_queryset(self):
-        User = get_user_model()
-        return User.objects.filter(user_type='customer').order_by('id')
+        return get_user_profiles(self.request, 'customer')
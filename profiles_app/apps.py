@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ProfilesAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'profiles_app'
+
+    def ready(self):
+        from profiles_app import signals  # noqa: F401
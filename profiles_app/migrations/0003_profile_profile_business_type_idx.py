@@ -0,0 +1,19 @@
+# Generated by Django 5.2.7 on 2026-10-18 19:59
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles_app', '0002_remove_profile_id_alter_profile_user'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='profile',
+            index=models.Index(condition=models.Q(('type', 'business')), fields=['type'], name='profile_business_type_idx'),
+        ),
+    ]
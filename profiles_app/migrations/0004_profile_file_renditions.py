@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 20:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles_app', '0003_profile_profile_business_type_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='file_renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
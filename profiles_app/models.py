@@ -16,6 +16,10 @@ class Profile(models.Model):
     first_name = models.CharField(max_length=30, blank=True, null=True)
     last_name = models.CharField(max_length=30, blank=True, null=True)
     file = models.FileField(upload_to='profiles/', blank=True, null=True)
+    # Rendered sizes of the file, see core.renditions
+    file_renditions = models.JSONField(
+        default=dict, blank=True, editable=False
+    )
     location = models.CharField(max_length=100, blank=True, null=True)
     tel = models.CharField(max_length=20, blank=True, null=True)
     description = models.TextField(blank=True, null=True)
@@ -24,6 +28,16 @@ class Profile(models.Model):
     email = models.EmailField()
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Only business profiles are counted by type
+            models.Index(
+                fields=['type'],
+                condition=models.Q(type='business'),
+                name='profile_business_type_idx'
+            ),
+        ]
+
     def __str__(self):
         """
         String representation of the Profile.
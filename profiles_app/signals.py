@@ -0,0 +1,21 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.renditions import schedule_renditions, schedule_renditions_cleanup
+from profiles_app.models import Profile
+
+
+@receiver(post_save, sender=Profile)
+def render_file_on_save(sender, instance, **kwargs):
+    """
+    Render the renditions of a new profile picture in the background.
+    """
+    schedule_renditions(instance, 'file', 'file_renditions')
+
+
+@receiver(post_delete, sender=Profile)
+def delete_file_renditions_on_delete(sender, instance, **kwargs):
+    """
+    Delete the renditions of deleted profiles.
+    """
+    schedule_renditions_cleanup(instance, 'file', 'file_renditions')
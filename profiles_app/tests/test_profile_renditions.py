@@ -0,0 +1,83 @@
+import shutil
+import tempfile
+from io import BytesIO
+
+from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from django.urls import reverse
+
+from PIL import Image
+from rest_framework.test import APITestCase
+
+from core.renditions import get_rendition_name
+from profiles_app.models import Profile
+
+
+@override_settings(
+    IMAGE_RENDITION_WORKERS=0, IMAGE_RENDITION_WIDTHS=(160, 480)
+)
+class ProfileRenditionsTest(APITestCase):
+    """
+    Test cases for the renditions of uploaded profile pictures.
+    """
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.addCleanup(shutil.rmtree, self.media_root)
+        self.user = get_user_model().objects.create_user(
+            username='business',
+            password='testpass',
+            user_type='business'
+        )
+        self.profile = Profile.objects.create(
+            user=self.user, username='business',
+            email='business@example.com', type='business'
+        )
+        self.url = reverse('profile-detail', kwargs={'pk': self.profile.pk})
+        self.client.force_authenticate(user=self.user)
+
+    def upload(self, name):
+        buffer = BytesIO()
+        Image.new('RGB', (600, 600), 'blue').save(buffer, 'PNG')
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(
+                self.url, {'file': SimpleUploadedFile(name, buffer.getvalue())},
+                format='multipart'
+            )
+        self.assertEqual(response.status_code, 200)
+        # Renditions are rendered after the response
+        self.assertEqual(response.json()['file_srcset'], {})
+        return Profile.objects.get(pk=self.profile.pk).file.name
+
+    # Test cases for the srcset on the profile and profile list
+    def test_srcset(self):
+        name = self.upload('avatar.png')
+        webp = f'/media/{get_rendition_name(name, 160, "webp")} 160w'
+        response = self.client.get(self.url)
+        self.assertTrue(
+            response.json()['file_srcset']['image/webp'].startswith(
+                f'http://testserver{webp}'
+            )
+        )
+        self.assertIn('image/png', response.json()['file_srcset'])
+        response = self.client.get(
+            '/api/profiles/business/', {'fields': 'user,file_srcset'}
+        )
+        self.assertTrue(
+            response.json()[0]['file_srcset']['image/webp'].startswith(webp)
+        )
+
+    # Test cases for cleaning up when the picture changes
+    def test_cleanup(self):
+        old_name = self.upload('old.png')
+        new_name = self.upload('new.png')
+        self.assertFalse(default_storage.exists(
+            get_rendition_name(old_name, 160, 'webp')
+        ))
+        self.assertTrue(default_storage.exists(
+            get_rendition_name(new_name, 160, 'webp')
+        ))
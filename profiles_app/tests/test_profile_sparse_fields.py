@@ -0,0 +1,59 @@
+from django.contrib.auth import get_user_model
+
+from rest_framework.test import APITestCase
+
+from profiles_app.models import Profile
+
+
+class ProfileSparseFieldsTest(APITestCase):
+    """
+    Test cases for ?fields= and ?omit= on the profile endpoints.
+    """
+    def setUp(self):
+        User = get_user_model()
+        self.business = User.objects.create_user(
+            username='business',
+            password='testpass',
+            user_type='business'
+        )
+        Profile.objects.create(
+            user=self.business,
+            username='business',
+            first_name='Max',
+            email='business@example.com',
+            type='business'
+        )
+        self.without_profile = User.objects.create_user(
+            username='plain',
+            password='testpass',
+            user_type='business'
+        )
+        self.client.force_authenticate(user=self.business)
+
+    # Test cases for a single profile
+    def test_profile_fields(self):
+        response = self.client.get(
+            f'/api/profile/{self.business.id}/',
+            {'fields': 'user,first_name,location'}
+        )
+        self.assertEqual(response.json(), {
+            'user': self.business.id, 'first_name': 'Max', 'location': ''
+        })
+
+    # Test cases for the profile lists in one query
+    def test_list_fields(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                '/api/profiles/business/', {'fields': 'user,username,type'}
+            )
+        self.assertEqual(response.json(), [
+            {'user': self.business.id, 'username': 'business',
+             'type': 'business'},
+            {'user': self.without_profile.id, 'username': 'plain',
+             'type': 'business'},
+        ])
+        response = self.client.get(
+            '/api/profiles/business/', {'omit': 'file,tel'}
+        )
+        self.assertNotIn('file', response.json()[0])
+        self.assertEqual(response.json()[1]['first_name'], '')
@@ -1,8 +1,10 @@
 from rest_framework import serializers
+
+from core.serializers import SparseFieldsetMixin
 from reviews_app.models import Review
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Serializer for the Review model.
     """
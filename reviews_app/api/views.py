@@ -4,6 +4,8 @@ from rest_framework import filters
 from rest_framework import viewsets
 from rest_framework.permissions import IsAuthenticated
 
+from core.serializers import get_concrete_fields, get_sparse_fields
+
 from reviews_app.api.permissions import IsCustomerUser, IsReviewOwner
 from reviews_app.models import Review
 from reviews_app.api.serializers import ReviewSerializer
@@ -27,3 +29,13 @@ class ReviewListCreateAPIView(viewsets.ModelViewSet):
         if self.action == "create":
             return [IsCustomerUser()]
         return [IsAuthenticated()]
+
+    # Load only the columns of the selected fields
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        fields = get_sparse_fields(
+            self.request, ReviewSerializer.get_sparse_field_names()
+        )
+        if fields is not None:
+            queryset = queryset.only(*get_concrete_fields(Review, fields))
+        return queryset
@@ -7,8 +7,10 @@ class Review(models.Model):
     """
     Model representing a review given by a customer to a business user.
     """
+    # Looked up through review_business_updated_idx
     business_user = models.ForeignKey(
-        settings.AUTH_USER_MODEL, related_name='business_reviews', on_delete=models.CASCADE
+        settings.AUTH_USER_MODEL, related_name='business_reviews',
+        on_delete=models.CASCADE, db_index=False
     )
     reviewer = models.ForeignKey(
         settings.AUTH_USER_MODEL, related_name='given_reviews', on_delete=models.CASCADE
@@ -20,6 +22,13 @@ class Review(models.Model):
 
     class Meta:
         ordering = ['-updated_at']
+        indexes = [
+            # Reviews of a business user, most recently updated first
+            models.Index(
+                fields=['business_user', '-updated_at'],
+                name='review_business_updated_idx'
+            ),
+        ]
 
     def __str__(self):
         return f'Review by {self.reviewer} for {self.business_user} - Rating: {self.rating}'
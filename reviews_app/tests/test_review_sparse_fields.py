@@ -0,0 +1,49 @@
+from django.contrib.auth import get_user_model
+
+from rest_framework.test import APITestCase
+
+from reviews_app.models import Review
+
+
+class ReviewSparseFieldsTest(APITestCase):
+    """
+    Test cases for ?fields= and ?omit= on the review endpoints.
+    """
+    def setUp(self):
+        self.customer = get_user_model().objects.create_user(
+            username='customer',
+            password='testpass',
+            user_type='customer'
+        )
+        self.business = get_user_model().objects.create_user(
+            username='business',
+            password='testpass',
+            user_type='business'
+        )
+        self.review = Review.objects.create(
+            business_user=self.business,
+            reviewer=self.customer,
+            rating=4,
+            description='Gute Arbeit'
+        )
+        self.client.force_authenticate(user=self.customer)
+
+    # Test cases for selecting and omitting review fields
+    def test_fields_and_omit(self):
+        response = self.client.get(
+            '/api/reviews/',
+            {'fields': 'id,rating', 'business_user': self.business.id}
+        )
+        self.assertEqual(
+            response.json(), [{'id': self.review.id, 'rating': 4}]
+        )
+        response = self.client.get(
+            f'/api/reviews/{self.review.id}/', {'omit': 'description'}
+        )
+        self.assertNotIn('description', response.json())
+        self.assertEqual(response.json()['reviewer'], self.customer.id)
+
+    # Test cases for rejecting unknown fields
+    def test_unknown_field(self):
+        response = self.client.get('/api/reviews/', {'omit': 'comment'})
+        self.assertEqual(response.status_code, 400)